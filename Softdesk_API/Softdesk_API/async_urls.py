@@ -0,0 +1,49 @@
+from django.urls import path
+
+from comment.views import CommentAsyncView
+from issue.views import IssueAsyncView
+from project.views import ProjectAsyncView
+
+# mêmes chemins que les routes des ViewSets, lectures seulement
+urlpatterns = [
+    path(
+        "project/",
+        ProjectAsyncView.as_view(action="list"),
+        name="async-project-list",
+    ),
+    path(
+        "project/<str:pk>/",
+        ProjectAsyncView.as_view(action="retrieve"),
+        name="async-project-detail",
+    ),
+    path(
+        "issue/",
+        IssueAsyncView.as_view(action="list"),
+        name="async-issue-list",
+    ),
+    path(
+        "issue/project-issues/",
+        IssueAsyncView.as_view(action="project_issues"),
+        name="async-issue-project-issues",
+    ),
+    path(
+        "issue/<str:pk>/",
+        IssueAsyncView.as_view(action="retrieve"),
+        name="async-issue-detail",
+    ),
+    path(
+        "comment/",
+        CommentAsyncView.as_view(action="list"),
+        name="async-comment-list",
+    ),
+    path(
+        "comment/issue-comments/",
+        CommentAsyncView.as_view(action="issue_comments"),
+        name="async-comment-issue-comments",
+    ),
+    path(
+        "comment/<str:pk>/",
+        CommentAsyncView.as_view(action="retrieve"),
+        name="async-comment-detail",
+    ),
+]
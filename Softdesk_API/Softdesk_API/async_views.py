@@ -0,0 +1,115 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.views import View
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class AsyncReadView(View):
+    """
+    Vue asynchrone (ASGI) des lectures d'un ViewSet : list, retrieve et
+    actions de liste.
+
+    La vue s'appuie sur le ViewSet viewset_class pour tout ce qui ne lit pas
+    la base : queryset visible, filtres, sparse fieldsets, lecteur de lignes
+    values(), pagination, négociation et rendu de la réponse. Les étapes qui
+    lisent la base ou le cache ne bloquent pas la boucle d'événements :
+        - authentification, permissions (ViewSet.initial) et contrôles
+          d'appartenance : sync_to_async ;
+        - lignes de la page, comptage et relations ManyToMany : ORM
+          asynchrone (acount, afirst, async for).
+    Les réponses sont celles du ViewSet, sans ETag, cache des réponses ni
+    flux (?stream=true), propres aux vues synchrones.
+
+    Attributes:
+        viewset_class (class): Le ViewSet dont les lectures sont servies
+            (doit utiliser ValuesListMixin).
+        action (str): L'action servie : "list", "retrieve", ou une action de
+            liste implémentée par une méthode async du même nom.
+    """
+
+    viewset_class = None
+    action = None
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, *args, **kwargs):
+        viewset = self.viewset_class(
+            action=self.action,
+            args=args,
+            kwargs=kwargs,
+            format_kwarg=None,
+            headers={},
+        )
+        request = Request(
+            request,
+            parsers=viewset.get_parsers(),
+            authenticators=viewset.get_authenticators(),
+            negotiator=viewset.get_content_negotiator(),
+            parser_context=viewset.get_parser_context(request),
+        )
+        viewset.request = request
+        viewset.headers = viewset.default_response_headers
+
+        try:
+            await sync_to_async(viewset.initial)(request, *args, **kwargs)
+            response = await getattr(self, self.action)(
+                viewset, request, *args, **kwargs
+            )
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+
+        response = viewset.finalize_response(request, response, *args, **kwargs)
+        return response.render()
+
+    async def list(self, viewset, request, *args, **kwargs):
+        return await self.get_page_response(
+            viewset, viewset.filter_queryset(viewset.get_queryset())
+        )
+
+    async def retrieve(self, viewset, request, *args, **kwargs):
+        reader = viewset.get_values_reader()
+        if reader is None:
+            # champ non pris en charge par ValuesRowReader : sérialisation habituelle
+            return await sync_to_async(
+                lambda: Response(viewset.get_serializer(viewset.get_object()).data)
+            )()
+
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        # mêmes erreurs 404 que get_object
+        try:
+            row = await queryset.values(*reader.columns).aget(
+                **{viewset.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+        return Response((await reader.arepresent([row]))[0])
+
+    async def get_page_response(self, viewset, queryset):
+        """
+        Construit la réponse contenant la page de résultats demandée
+        (voir ValuesListMixin.get_page_response).
+
+        Args:
+            viewset (ViewSet): Le ViewSet de la requête.
+            queryset (QuerySet): Les objets de la liste.
+
+        Returns:
+            Response: La réponse HTTP.
+        """
+        reader = viewset.get_values_reader()
+        if reader is None:
+            return await sync_to_async(viewset.get_page_response)(queryset)
+
+        rows = viewset.get_values_queryset(queryset, reader)
+        page = await viewset.paginator.apaginate_queryset(
+            rows, viewset.request, viewset
+        )
+        if page is not None:
+            return viewset.get_paginated_response(await reader.arepresent(page))
+        return Response(await reader.arepresent([row async for row in rows]))
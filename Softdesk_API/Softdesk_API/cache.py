@@ -0,0 +1,138 @@
+from functools import partial
+from hashlib import md5
+from threading import Lock
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+RESPONSE_CACHE_ALIAS = "responses"
+VERSION_KEY = "response:version:{}"
+
+
+class CacheStats:
+    """
+    Compteurs de succès (hits) et d'échecs (misses) d'un cache.
+
+    Les compteurs sont propres au processus.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def as_dict(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+response_cache_stats = CacheStats()
+
+
+def get_versions(*names):
+    """
+    Retourne la version courante des données de chaque groupe (project, issue, comment).
+
+    Args:
+        *names (str): Les noms des groupes.
+
+    Returns:
+        list: Les versions, dans l'ordre des noms.
+    """
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    keys = [VERSION_KEY.format(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # version inconnue (jamais créée ou évincée) : nouvelle valeur unique
+            cache.add(key, time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*names):
+    """
+    Change la version des groupes donnés : toutes les réponses en cache qui en
+    dépendent deviennent inaccessibles et expirent d'elles-mêmes.
+
+    Args:
+        *names (str): Les noms des groupes.
+    """
+    caches[RESPONSE_CACHE_ALIAS].set_many(
+        {VERSION_KEY.format(name): time_ns() for name in names}, None
+    )
+
+
+class CachedResponseMixin:
+    """
+    Mixin de ViewSet mettant en cache les réponses des actions list et retrieve.
+
+    Une réponse est mise en cache par utilisateur et par URL complète
+    (pagination, filtres), pour la durée RESPONSE_CACHE_TIMEOUT. La clé contient
+    la version des groupes de données listés dans cache_dependencies : ces
+    versions sont changées par les signaux post_save, post_delete et
+    m2m_changed des modèles, ce qui invalide les réponses concernées.
+
+    La taille du cache est bornée par la configuration du cache "responses"
+    (MAX_ENTRIES en mémoire locale, politique maxmemory pour Redis).
+
+    Attributes:
+        cache_dependencies (tuple): Groupes de données dont dépendent les réponses.
+    """
+
+    cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            partial(super().retrieve, request, *args, **kwargs)
+        )
+
+    def get_response_cache_key(self):
+        request = self.request
+        signature = md5(
+            f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        versions = ".".join(str(v) for v in get_versions(*self.cache_dependencies))
+        return (
+            f"response:{self.basename}:{self.action}:{request.user.pk}:"
+            f"{signature}:{versions}"
+        )
+
+    def get_cached_response(self, render):
+        """
+        Renvoie la réponse en cache si elle existe, sinon la réponse de render,
+        mise en cache si son statut est 200.
+
+        Args:
+            render (callable): Fonction construisant la réponse complète.
+
+        Returns:
+            Response: La réponse HTTP.
+        """
+        cache = caches[RESPONSE_CACHE_ALIAS]
+        key = self.get_response_cache_key()
+        data = cache.get(key)
+        response_cache_stats.record(hits=data is not None, misses=data is None)
+        if data is not None:
+            return Response(data)
+
+        response = render()
+        if isinstance(response, Response) and response.status_code == 200:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,151 @@
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+ENGINES = {
+    "sqlite": "django.db.backends.sqlite3",
+    "postgres": "django.db.backends.postgresql",
+    "postgresql": "django.db.backends.postgresql",
+    "mysql": "django.db.backends.mysql",
+}
+
+POSTGRESQL = ENGINES["postgresql"]
+MYSQL = ENGINES["mysql"]
+
+
+def parse_database_url(url, base_dir):
+    """
+    Convertit une URL de base de données en réglage DATABASES.
+
+    Formats acceptés :
+        - sqlite:///db.sqlite3 (chemin relatif à base_dir), sqlite:////chemin/absolu,
+          sqlite:///:memory: ;
+        - postgres://utilisateur:mot_de_passe@hôte:port/nom?sslmode=require ;
+        - mysql://utilisateur:mot_de_passe@hôte:port/nom?charset=utf8mb4.
+    Les paramètres de la requête de l'URL sont passés dans OPTIONS.
+
+    Args:
+        url (str): L'URL de la base de données.
+        base_dir (Path): Le répertoire des chemins SQLite relatifs.
+
+    Returns:
+        dict: Le réglage de la base (ENGINE, NAME, USER, ..., OPTIONS).
+
+    Raises:
+        ImproperlyConfigured: Le schéma de l'URL n'est pas pris en charge.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ENGINES:
+        raise ImproperlyConfigured(
+            f"DATABASE_URL : schéma {parts.scheme!r} non pris en charge "
+            f"({', '.join(ENGINES)})."
+        )
+
+    engine = ENGINES[parts.scheme]
+    options = dict(parse_qsl(parts.query))
+    if engine == ENGINES["sqlite"]:
+        name = unquote(parts.path[1:])
+        if name != ":memory:":
+            name = Path(base_dir) / name
+        return {"ENGINE": engine, "NAME": name, "OPTIONS": options}
+
+    return {
+        "ENGINE": engine,
+        "NAME": unquote(parts.path[1:]),
+        "USER": unquote(parts.username or ""),
+        "PASSWORD": unquote(parts.password or ""),
+        "HOST": parts.hostname or "",
+        "PORT": str(parts.port or ""),
+        "OPTIONS": options,
+    }
+
+
+def get_int(environ, name, default):
+    value = environ.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} doit être un entier (reçu {value!r}).")
+
+
+def get_bool(environ, name, default):
+    value = environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def database_from_env(environ, base_dir):
+    """
+    Construit le réglage de la base "default" à partir des variables d'environnement.
+
+    Variables :
+        - DATABASE_URL : URL de la base (voir parse_database_url) ; par défaut
+          le fichier SQLite db.sqlite3 du projet.
+        - DATABASE_CONN_MAX_AGE : durée de vie (secondes) des connexions
+          persistantes, 0 pour une connexion par requête (défaut : 60).
+          Sous ASGI, utiliser 0 ou le pool : les connexions persistantes sont
+          propres à chaque thread.
+        - DATABASE_CONN_HEALTH_CHECKS : vérifie une connexion persistante
+          avant de la réutiliser (défaut : true).
+        - DATABASE_POOL_SIZE : taille maximale du pool de connexions
+          (PostgreSQL, Django 5.1 ou plus) ; remplace les connexions persistantes.
+        - DATABASE_STATEMENT_TIMEOUT : durée maximale (millisecondes) d'une
+          requête, sur PostgreSQL (statement_timeout) et MySQL
+          (max_execution_time, SELECT seulement) ; ignorée sur SQLite.
+
+    Args:
+        environ (Mapping): Les variables d'environnement.
+        base_dir (Path): Le répertoire du projet.
+
+    Returns:
+        dict: Le réglage DATABASES["default"].
+
+    Raises:
+        ImproperlyConfigured: Une variable est invalide ou non prise en charge.
+    """
+    database = parse_database_url(
+        environ.get("DATABASE_URL") or "sqlite:///db.sqlite3", base_dir
+    )
+    engine = database["ENGINE"]
+    options = database["OPTIONS"]
+
+    database["CONN_MAX_AGE"] = get_int(environ, "DATABASE_CONN_MAX_AGE", 60)
+    database["CONN_HEALTH_CHECKS"] = get_bool(
+        environ, "DATABASE_CONN_HEALTH_CHECKS", True
+    )
+
+    pool_size = get_int(environ, "DATABASE_POOL_SIZE", 0)
+    if pool_size > 0:
+        if engine != POSTGRESQL or django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                "DATABASE_POOL_SIZE nécessite PostgreSQL et Django 5.1 ou plus."
+            )
+        # le pool remplace les connexions persistantes
+        options["pool"] = {"min_size": 1, "max_size": pool_size}
+        database["CONN_MAX_AGE"] = 0
+
+    timeout = get_int(environ, "DATABASE_STATEMENT_TIMEOUT", 0)
+    if timeout > 0:
+        if engine == POSTGRESQL:
+            options["options"] = " ".join(
+                filter(
+                    None, [options.get("options"), f"-c statement_timeout={timeout}"]
+                )
+            )
+        elif engine == MYSQL:
+            options["init_command"] = "; ".join(
+                filter(
+                    None,
+                    [
+                        options.get("init_command"),
+                        f"SET SESSION max_execution_time={timeout}",
+                    ],
+                )
+            )
+
+    return database
@@ -0,0 +1,369 @@
+import math
+from datetime import datetime, timezone
+from functools import partial
+from hashlib import md5
+
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .cache import get_versions
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer
+from .serializers import ValuesRowReader
+
+
+class StreamingListMixin:
+    """
+    Mixin de ViewSet permettant de renvoyer une liste en flux continu.
+
+    Lorsque la requête contient `stream=true`, le queryset est parcouru par
+    blocs avec `.iterator(chunk_size=...)` et le JSON est envoyé au fur et à
+    mesure : la mémoire utilisée ne dépend pas du nombre d'objets.
+    """
+
+    stream_query_param = "stream"
+    stream_chunk_size = 500
+
+    def wants_stream(self, request):
+        """
+        Indique si le client a demandé une réponse en flux continu.
+        """
+        return request.query_params.get(self.stream_query_param) == "true"
+
+    def get_list_response(self, queryset):
+        """
+        Construit la réponse d'une action de liste : flux continu si demandé,
+        sinon page de résultats.
+
+        Args:
+            queryset (QuerySet): Les objets de la liste.
+
+        Returns:
+            Response: La réponse HTTP.
+        """
+        if self.wants_stream(self.request):
+            return self.get_streaming_response(queryset)
+        return self.get_page_response(queryset)
+
+    def get_page_response(self, queryset):
+        """
+        Construit la réponse contenant la page de résultats demandée.
+
+        Args:
+            queryset (QuerySet): Les objets de la liste.
+
+        Returns:
+            Response: La réponse HTTP.
+        """
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def iter_representations(self, queryset):
+        """
+        Parcourt le queryset par blocs de stream_chunk_size et renvoie la
+        représentation de chaque objet.
+
+        Args:
+            queryset (QuerySet): Les objets à sérialiser.
+
+        Yields:
+            dict: La représentation d'un objet.
+        """
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            yield serializer_class(instance, context=context).data
+
+    def get_streaming_response(self, queryset):
+        """
+        Construit une réponse JSON (tableau) en flux continu à partir du queryset.
+
+        Args:
+            queryset (QuerySet): Les objets à sérialiser.
+
+        Returns:
+            StreamingHttpResponse: Réponse HTTP envoyée bloc par bloc.
+        """
+        renderer = FastJSONRenderer()
+        chunk_size = self.stream_chunk_size
+
+        def render_rows():
+            yield b"["
+            separator = b""
+            chunk = []
+            for count, data in enumerate(self.iter_representations(queryset), start=1):
+                chunk.append(separator + renderer.render(data))
+                separator = b","
+                if count % chunk_size == 0:
+                    yield b"".join(chunk)
+                    chunk = []
+            yield b"".join(chunk) + b"]"
+
+        return StreamingHttpResponse(render_rows(), content_type="application/json")
+
+
+class ConditionalGetMixin:
+    """
+    Mixin de ViewSet ajoutant les requêtes conditionnelles (ETag / Last-Modified).
+
+    Les validateurs sont calculés avant toute sérialisation :
+        - liste : version des groupes de données cache_dependencies (voir
+          Softdesk_API.cache.get_versions), changée à chaque écriture, sans
+          requête sur la liste ; Last-Modified est la date de la dernière
+          version ;
+        - détail : date de dernière modification de l'objet (updated_at).
+
+    Si le client envoie un validateur toujours valable, une réponse 304 vide
+    est renvoyée. Pour les listes, seul l'ETag (If-None-Match) est pris en
+    compte.
+
+    Last-Modified est à la seconde près : If-Modified-Since est ignoré si la
+    requête contient If-None-Match, et updated_at est arrondi à la seconde
+    supérieure avant la comparaison.
+    """
+
+    cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_list_response(
+            partial(super().list, request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        render = partial(super().retrieve, request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            last_modified = (
+                self.filter_queryset(self.get_queryset())
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            last_modified = None
+
+        if last_modified is None:
+            # objet inexistant ou non visible : réponse 404 habituelle
+            return render()
+        return self.conditional_response(render, last_modified, last_modified, True)
+
+    def get_conditional_list_response(self, render):
+        """
+        Renvoie une réponse 304 si la liste n'a pas changé, sinon la réponse de render.
+
+        Sans version (cache_dependencies vide, ou cache des réponses qui ne
+        conserve rien, comme DummyCache), la réponse est renvoyée sans
+        validateur.
+
+        Args:
+            render (callable): Fonction construisant la réponse complète.
+
+        Returns:
+            HttpResponse: Réponse 304 ou réponse complète avec ETag et Last-Modified.
+        """
+        versions = get_versions(*self.cache_dependencies)
+        if not versions or None in versions:
+            return render()
+        last_modified = datetime.fromtimestamp(max(versions) / 1e9, timezone.utc)
+        return self.conditional_response(render, versions, last_modified, False)
+
+    def conditional_response(self, render, version, last_modified, use_last_modified):
+        """
+        Évalue les en-têtes conditionnels de la requête.
+
+        L'ETag dépend de l'utilisateur, de l'URL complète (pagination, filtres),
+        du type de contenu demandé et de la version des données.
+
+        Args:
+            render (callable): Fonction construisant la réponse complète.
+            version: Valeur identifiant l'état des données.
+            last_modified (datetime): Date de dernière modification, ou None.
+            use_last_modified (bool): Prise en compte de If-Modified-Since.
+
+        Returns:
+            HttpResponse: Réponse 304 ou réponse complète avec ETag et Last-Modified.
+        """
+        request = self.request
+        etag = quote_etag(
+            md5(
+                "|".join(
+                    [
+                        str(request.user.pk),
+                        request.get_full_path(),
+                        request.META.get("HTTP_ACCEPT", ""),
+                        str(version),
+                    ]
+                ).encode(),
+                usedforsecurity=False,
+            ).hexdigest()
+        )
+        # arrondi à la seconde supérieure : une modification faite pendant la
+        # seconde de If-Modified-Since n'est pas considérée comme antérieure
+        timestamp = math.ceil(last_modified.timestamp()) if last_modified else None
+        if "HTTP_IF_NONE_MATCH" in request.META:
+            # l'ETag, exact, prime sur la date à la seconde près
+            use_last_modified = False
+
+        response = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=timestamp if use_last_modified else None,
+        )
+        if response is not None:
+            return response
+
+        response = render()
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class SparseFieldsetsMixin:
+    """
+    Mixin de ViewSet ajoutant les sparse fieldsets (`?fields=id,title,...`).
+
+    Pour les lectures (GET) des actions sparse_actions :
+        - `fields` limite la réponse aux champs demandés (400 si un champ
+          est inconnu) ;
+        - sans `fields`, les actions de liste (list_actions) renvoient une
+          représentation compacte, sans les champs compact_exclude_fields.
+    La requête SQL est réduite aux mêmes colonnes avec .only(). Le serializer
+    doit utiliser SparseFieldsetSerializerMixin.
+
+    Attributes:
+        sparse_actions (tuple): Actions acceptant le paramètre fields.
+        list_actions (tuple): Actions de liste, en représentation compacte par défaut.
+        compact_exclude_fields (tuple): Champs omis de la représentation compacte.
+    """
+
+    fields_query_param = "fields"
+    sparse_actions = ("list", "retrieve")
+    list_actions = ("list",)
+    compact_exclude_fields = ("description",)
+
+    def get_sparse_fields(self):
+        """
+        Retourne les champs à sérialiser pour la requête en cours.
+
+        Returns:
+            set: Les noms des champs, ou None pour tous les champs.
+        """
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self.compute_sparse_fields()
+        return self._sparse_fields
+
+    def compute_sparse_fields(self):
+        if self.request.method != "GET" or self.action not in self.sparse_actions:
+            return None
+
+        available = set(self.get_serializer_class()().fields)
+        requested = self.request.query_params.get(self.fields_query_param)
+        if requested is None:
+            if self.action in self.list_actions:
+                return available - set(self.compact_exclude_fields)
+            return None
+
+        fields = {name.strip() for name in requested.split(",") if name.strip()}
+        unknown = fields - available
+        if unknown:
+            raise serializers.ValidationError(
+                {
+                    self.fields_query_param: [
+                        f"Champs inconnus : {', '.join(sorted(unknown))}. "
+                        f"Champs disponibles : {', '.join(sorted(available))}."
+                    ]
+                }
+            )
+        return fields
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        # colonnes des champs demandés, et celles du tri de la pagination keyset
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        return queryset.only(*(fields | set(KeysetPagination.ordering)) & columns)
+
+
+class ValuesListMixin:
+    """
+    Mixin de ViewSet sérialisant les listes à partir de lignes values().
+
+    Les actions de liste (list, et les pages et flux de StreamingListMixin)
+    lisent les seules colonnes des champs du serializer avec values() et les
+    convertissent avec ValuesRowReader, sans instancier de modèle : la
+    réponse est identique à celle du serializer. Si un champ du serializer
+    n'est pas pris en charge, la sérialisation habituelle est utilisée.
+    """
+
+    def get_values_reader(self):
+        """
+        Retourne le lecteur de lignes des champs du serializer de la requête.
+
+        Returns:
+            ValuesRowReader: Le lecteur, ou None si la sérialisation habituelle
+            doit être utilisée.
+        """
+        if not hasattr(self, "_values_reader"):
+            self._values_reader = ValuesRowReader.for_serializer(self.get_serializer())
+        return self._values_reader
+
+    def get_values_queryset(self, queryset, reader):
+        # colonnes des champs, et celles du tri de la pagination keyset
+        columns = dict.fromkeys([*reader.columns, *KeysetPagination.ordering])
+        return queryset.values(*columns)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_page_response(self.filter_queryset(self.get_queryset()))
+
+    def get_page_response(self, queryset):
+        """
+        Construit la réponse contenant la page de résultats demandée.
+
+        Args:
+            queryset (QuerySet): Les objets de la liste.
+
+        Returns:
+            Response: La réponse HTTP.
+        """
+        reader = self.get_values_reader()
+        if reader is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        rows = self.get_values_queryset(queryset, reader)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.represent(page))
+        return Response(reader.represent(rows))
+
+    def iter_representations(self, queryset):
+        reader = self.get_values_reader()
+        if reader is None:
+            yield from super().iter_representations(queryset)
+            return
+
+        chunk = []
+        rows = self.get_values_queryset(queryset, reader)
+        for row in rows.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(row)
+            if len(chunk) >= self.stream_chunk_size:
+                yield from reader.represent(chunk)
+                chunk = []
+        yield from reader.represent(chunk)
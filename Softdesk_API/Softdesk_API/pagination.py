@@ -0,0 +1,212 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur (keyset) sur le couple (time_created, id).
+
+    Chaque page est obtenue avec une condition "après le dernier élément vu"
+    au lieu d'un OFFSET : le coût d'une page ne dépend pas de sa profondeur.
+    Le comptage total (COUNT) n'est effectué que si `count=true` est demandé.
+
+    La navigation se fait uniquement vers l'avant, via le lien `next`.
+    """
+
+    ordering = ("time_created", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    count_query_param = "count"
+    max_page_size = 100
+    invalid_cursor_message = "Curseur invalide."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if self.count_requested:
+            self.count = queryset.count()
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Version asynchrone de paginate_queryset (ORM asynchrone).
+        """
+        page_queryset = self.get_page_queryset(queryset, request)
+        if self.count_requested:
+            self.count = await queryset.acount()
+        return self.set_page([row async for row in page_queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Prépare la requête de la page demandée (sans l'exécuter).
+
+        Args:
+            queryset (QuerySet): Les objets de la liste.
+            request (Request): La requête en cours.
+
+        Returns:
+            QuerySet: La page, avec un élément de plus pour savoir s'il existe
+            une page suivante.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = None
+        self.count_requested = (
+            request.query_params.get(self.count_query_param) == "true"
+        )
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            time_created, pk = position
+            queryset = queryset.filter(
+                Q(time_created__gt=time_created)
+                | Q(time_created=time_created, id__gt=pk)
+            )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        response = {"next": self.get_next_link(), "results": data}
+        if self.count is not None:
+            response = {"count": self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        if page_size <= 0:
+            return api_settings.PAGE_SIZE
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        if isinstance(last, dict):
+            # page de lignes values()
+            time_created, pk = last["time_created"], last["id"]
+        else:
+            time_created, pk = last.time_created, last.id
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(time_created, pk)
+        )
+
+    def encode_cursor(self, time_created, pk):
+        position = f"{time_created.isoformat()}|{pk}"
+        return urlsafe_b64encode(position.encode("ascii")).decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            time_created, pk = (
+                urlsafe_b64decode(encoded.encode("ascii")).decode("ascii").split("|")
+            )
+            return datetime.fromisoformat(time_created), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class SoftdeskPagination(LimitOffsetPagination):
+    """
+    Pagination par défaut de l'API.
+
+    Pagination limit/offset, ou pagination keyset (voir KeysetPagination)
+    lorsque la requête contient `pagination=keyset` ou un paramètre `cursor`.
+    """
+
+    mode_query_param = "pagination"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.get_keyset(request)
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Version asynchrone de paginate_queryset (ORM asynchrone).
+        """
+        self.keyset = self.get_keyset(request)
+        if self.keyset is not None:
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [row async for row in queryset[self.offset : self.offset + self.limit]]
+
+    def get_keyset(self, request):
+        if (
+            request.query_params.get(self.mode_query_param) == "keyset"
+            or KeysetPagination.cursor_query_param in request.query_params
+        ):
+            return KeysetPagination()
+        return None
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator de l'interface d'administration pour les grandes tables.
+
+    Sur PostgreSQL, lorsque la liste n'est pas filtrée, le nombre de lignes
+    est lu dans les statistiques de la table (pg_class.reltuples) au lieu
+    d'un COUNT(*) complet. Dans les autres cas, le comptage exact est utilisé.
+    """
+
+    # en dessous de ce nombre de lignes estimé, le comptage exact est conservé
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return int(row[0])
+        return super().count
@@ -0,0 +1,36 @@
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parser JSON utilisant orjson lorsqu'il est installé.
+
+    orjson ne lit que l'UTF-8 et refuse, comme STRICT_JSON, les constantes
+    NaN et Infinity. Si orjson refuse le document, il est relu par
+    JSONParser : les messages d'erreur sont donc ceux de DRF. Seule
+    différence : un entier de plus de 64 bits est lu comme un float.
+    Sans orjson, ou pour un autre encodage, JSONParser est utilisé.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            orjson is None
+            or not self.strict
+            or encoding.lower() not in ("utf-8", "utf8")
+        ):
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read() if stream is not None else b""
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(content), media_type, parser_context)
@@ -0,0 +1,55 @@
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import BasePermission
+
+
+class IsAuthenticatedAndIsAuthorBase(BasePermission):
+    """
+    Permission commune aux Projects, Issues et Comments :
+
+    1. L'utilisateur doit être authentifié.
+    2. Pour les actions de modification et suppression, l'utilisateur doit être l'auteur de la ressource
+    concernée.
+
+    L'auteur est vérifié au niveau de l'objet (has_object_permission) : l'objet n'est chargé qu'une fois,
+    par le get_object() de la vue, et l'auteur est comparé via author_id sans charger l'utilisateur.
+
+    Attributes:
+        allowed_actions (list): Actions autorisées à tout utilisateur authentifié.
+        author_actions (list): Actions réservées à l'auteur de la ressource.
+        message (str): Message d'erreur lorsque l'utilisateur n'est pas l'auteur.
+    """
+
+    allowed_actions = ["list", "create", "retrieve"]
+    author_actions = ["update", "partial_update", "destroy"]
+    message = "Vous n'êtes pas autorisé à modifier ou à supprimer cette ressource."
+
+    def has_permission(self, request, view):
+        """
+        Méthode pour vérifier si l'utilisateur a la permission d'accéder à la vue.
+
+        Args:
+            request (Request): L'objet de requête entrant.
+            view (APIView): La vue sur laquelle la permission est vérifiée.
+
+        Returns:
+            bool: True si l'utilisateur a la permission, False sinon.
+        """
+        if request.user.is_authenticated:
+            return view.action in self.allowed_actions + self.author_actions
+        return False
+
+    def has_object_permission(self, request, view, obj):
+        """
+        Méthode pour vérifier si l'utilisateur a la permission d'agir sur l'objet.
+
+        Args:
+            request (Request): L'objet de requête entrant.
+            view (APIView): La vue sur laquelle la permission est vérifiée.
+            obj (Model): L'objet concerné, chargé par get_object().
+
+        Returns:
+            bool: True si l'utilisateur a la permission.
+        """
+        if view.action in self.author_actions and obj.author_id != request.user.id:
+            raise PermissionDenied(self.message)
+        return True
@@ -0,0 +1,47 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renderer JSON utilisant orjson lorsqu'il est installé.
+
+    La sortie est celle de JSONRenderer pour les réglages de l'API (UNICODE_JSON,
+    COMPACT_JSON, STRICT_JSON) :
+        - types non natifs (dates, Decimal, lazy strings...) : convertis par
+          l'encodeur de DRF (orjson ne traite nativement que les UUID, écrits
+          de la même façon) ;
+        - clés non textuelles : converties en texte ;
+        - \\u2028 et \\u2029 : échappés.
+    Différences : NaN et Infinity sont écrits null (JSONRenderer lève une
+    erreur) et l'exposant des floats n'a ni signe + ni zéro initial (1e16 et
+    1e-6, et non 1e+16 et 1e-06) ; les modèles de l'API n'ont pas de champ float.
+    Sans orjson, ou si la requête demande une indentation
+    (`Accept: application/json; indent=4`), JSONRenderer est utilisé.
+    """
+
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+        ret = orjson.dumps(data, default=self.default, option=self.options)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
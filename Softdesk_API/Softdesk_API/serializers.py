@@ -0,0 +1,201 @@
+from rest_framework import serializers
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Mixin de ModelSerializer limitant les champs sérialisés à ceux demandés.
+
+    Les champs sont donnés par la méthode get_sparse_fields de la vue du
+    contexte (voir Softdesk_API.mixins.SparseFieldsetsMixin) ; sans vue, ou
+    si la vue renvoie None, tous les champs sont conservés.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        get_sparse_fields = getattr(self.context.get("view"), "get_sparse_fields", None)
+        fields = get_sparse_fields() if get_sparse_fields else None
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class ValuesRowReader:
+    """
+    Représentation rapide, à partir de lignes values(), des objets d'un
+    ModelSerializer en lecture seule.
+
+    Les accesseurs sont préparés une fois à partir des champs du serializer :
+    chaque ligne est ensuite convertie en dict sans instancier de modèle ni
+    appeler get_attribute champ par champ. Le résultat est identique à
+    serializer.data :
+        - champs texte, choix et entiers : valeur de la colonne ;
+        - clés étrangères (PrimaryKeyRelatedField) : colonne <champ>_id ;
+        - relations ManyToMany (clés primaires) : une requête sur la table
+          intermédiaire pour toutes les lignes ;
+        - autres champs (dates...) : to_representation du champ.
+
+    Utiliser ValuesRowReader.for_serializer, qui renvoie None si un champ
+    n'est pas pris en charge (source calculée, SerializerMethodField...).
+
+    Attributes:
+        columns (list): Les colonnes à demander à values().
+    """
+
+    # champs dont to_representation renvoie la valeur de la colonne telle quelle
+    identity_fields = (
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.IntegerField,
+    )
+
+    def __init__(self, model, accessors, many_to_many):
+        self.model = model
+        self.accessors = accessors
+        self.many_to_many = many_to_many
+        self.columns = ["pk"] + [
+            column for _, column, _ in accessors if column is not None
+        ]
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """
+        Prépare le lecteur des champs d'un ModelSerializer.
+
+        Args:
+            serializer (ModelSerializer): Le serializer (ses champs éventuellement réduits).
+
+        Returns:
+            ValuesRowReader: Le lecteur, ou None si un champ n'est pas pris en charge.
+        """
+        model = serializer.Meta.model
+        column_names = {field.name for field in model._meta.concrete_fields}
+        many_to_many_names = {field.name for field in model._meta.many_to_many}
+
+        accessors = []
+        many_to_many = {}
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if "." in field.source or field.source == "*":
+                return None
+
+            if isinstance(field, serializers.ManyRelatedField):
+                if field.source not in many_to_many_names or not isinstance(
+                    field.child_relation, serializers.PrimaryKeyRelatedField
+                ):
+                    return None
+                many_to_many[name] = model._meta.get_field(field.source)
+                accessors.append((name, None, None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                if field.source not in column_names:
+                    return None
+                accessors.append((name, field.source, None))
+            elif isinstance(field, serializers.RelatedField) or isinstance(
+                field, serializers.SerializerMethodField
+            ):
+                return None
+            elif field.source not in column_names and field.source != "pk":
+                return None
+            elif isinstance(field, cls.identity_fields):
+                accessors.append((name, field.source, None))
+            else:
+                accessors.append((name, field.source, field.to_representation))
+
+        return cls(model, accessors, many_to_many)
+
+    def get_many_to_many(self, pks):
+        """
+        Charge les relations ManyToMany des objets, en une requête par relation.
+
+        Args:
+            pks (list): Les clés primaires des objets.
+
+        Returns:
+            dict: {champ: {pk: [pk des objets liés]}}.
+        """
+        related = {}
+        for name, rows in self.get_many_to_many_querysets(pks).items():
+            values = {pk: [] for pk in pks}
+            for pk, related_pk in rows:
+                values[pk].append(related_pk)
+            related[name] = values
+        return related
+
+    async def aget_many_to_many(self, pks):
+        """
+        Version asynchrone de get_many_to_many (ORM asynchrone).
+        """
+        related = {}
+        for name, rows in self.get_many_to_many_querysets(pks).items():
+            values = {pk: [] for pk in pks}
+            async for pk, related_pk in rows:
+                values[pk].append(related_pk)
+            related[name] = values
+        return related
+
+    def get_many_to_many_querysets(self, pks):
+        """
+        Retourne, par relation ManyToMany, la requête des couples (pk, pk lié).
+        """
+        querysets = {}
+        for name, model_field in self.many_to_many.items():
+            source = f"{model_field.m2m_field_name()}_id"
+            target = f"{model_field.m2m_reverse_field_name()}_id"
+            querysets[name] = (
+                model_field.remote_field.through.objects.filter(
+                    **{f"{source}__in": pks}
+                )
+                .order_by(source, target)
+                .values_list(source, target)
+            )
+        return querysets
+
+    def represent(self, rows):
+        """
+        Convertit des lignes values() (voir columns) en représentations.
+
+        Args:
+            rows (iterable): Les lignes.
+
+        Returns:
+            list: Les représentations, comme serializer.data.
+        """
+        rows = list(rows)
+        related = (
+            self.get_many_to_many([row["pk"] for row in rows])
+            if self.many_to_many
+            else {}
+        )
+        return self.convert(rows, related)
+
+    async def arepresent(self, rows):
+        """
+        Version asynchrone de represent (ORM asynchrone).
+
+        Args:
+            rows (list): Les lignes, déjà lues.
+
+        Returns:
+            list: Les représentations, comme serializer.data.
+        """
+        related = (
+            await self.aget_many_to_many([row["pk"] for row in rows])
+            if self.many_to_many
+            else {}
+        )
+        return self.convert(rows, related)
+
+    def convert(self, rows, related):
+        results = []
+        for row in rows:
+            data = {}
+            for name, column, convert in self.accessors:
+                if column is None:
+                    data[name] = related[name][row["pk"]]
+                    continue
+                value = row[column]
+                data[name] = (
+                    value if convert is None or value is None else convert(value)
+                )
+            results.append(data)
+        return results
@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
+from .database import database_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +48,7 @@ INSTALLED_APPS = [
     "project",
     "issue",
     "comment",
+    "search",
 ]
 
 MIDDLEWARE = [
@@ -80,13 +84,67 @@ WSGI_APPLICATION = "Softdesk_API.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+# Fichier SQLite db.sqlite3 par défaut, voir database_from_env pour les variables
+# DATABASE_URL, DATABASE_CONN_MAX_AGE, DATABASE_POOL_SIZE...
+
+DATABASES = {"default": database_from_env(os.environ, BASE_DIR)}
+
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Mémoire locale par défaut, Redis si la variable REDIS_URL est définie.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        },
+        # taille bornée par la politique maxmemory du serveur Redis
+        "responses": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+            "KEY_PREFIX": "responses",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "softdesk",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        },
+        "responses": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "softdesk-responses",
+            "OPTIONS": {"MAX_ENTRIES": 1000},
+        },
     }
-}
+
+# Durée de vie (secondes) de la liste des contributeurs d'un projet en cache
+CONTRIBUTORS_CACHE_TIMEOUT = 300
+
+# Durée de vie (secondes) des réponses list / retrieve en cache
+RESPONSE_CACHE_TIMEOUT = 60
+
+# Durée de vie (secondes) des statistiques d'un projet en cache
+PROJECT_STATS_CACHE_TIMEOUT = 600
+
+# Nombre de threads du pool de hachage des mots de passe (hachages simultanés)
+PASSWORD_HASHING_WORKERS = min(4, os.cpu_count() or 1)
+
+# Durée de vie (secondes) de la version des jetons JWT d'un utilisateur en cache
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Liste des jetons de rafraîchissement révoqués : intervalle (secondes) entre deux
+# synchronisations du filtre de Bloom de chaque processus, capacité et taux de faux positifs
+TOKEN_REVOCATION_SYNC_INTERVAL = 5
+TOKEN_REVOCATION_BLOOM_CAPACITY = 100_000
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = 0.001
+
+# Moteur de recherche plein texte (chemin d'une classe search.backends.BaseSearchBackend) ;
+# None : FTS5 sur SQLite, recherche sans index sur les autres bases
+SEARCH_BACKEND = None
 
 
 # Password validation
@@ -135,16 +193,31 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "authentication.CustomUser"
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "Softdesk_API.pagination.SoftdeskPagination",
     "PAGE_SIZE": 4,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.authentication.StatelessJWTAuthentication",
+    ),
+    # JSON encodé et décodé avec orjson s'il est installé (sinon json de la bibliothèque standard)
+    "DEFAULT_RENDERER_CLASSES": (
+        "Softdesk_API.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "Softdesk_API.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # ajoute username et token_version aux revendications des jetons
+    "TOKEN_OBTAIN_SERIALIZER": "authentication.serializers.CustomTokenObtainPairSerializer",
+    # un jeton de rafraîchissement n'est échangé qu'une fois (voir authentication.revocation)
+    "ROTATE_REFRESH_TOKENS": True,
+    "TOKEN_REFRESH_SERIALIZER": "authentication.serializers.CustomTokenRefreshSerializer",
 }
 
 SWAGGER_SETTINGS = {
@@ -0,0 +1,105 @@
+from datetime import date
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import CustomUser
+from comment.models import Comment
+from issue.models import Issue
+from project.models import Project
+
+API = "/softdesk/api/"
+
+
+def create_user(username):
+    """
+    Crée un utilisateur sans mot de passe (pas de hachage).
+    """
+    return CustomUser.objects.create(username=username, date_of_birth=date(1990, 1, 1))
+
+
+def create_project(title, author, *contributors):
+    """
+    Crée un projet dont l'auteur et les contributeurs sont contributeurs.
+    """
+    project = Project.objects.create(
+        title=title, description="d", type="backend", author=author
+    )
+    project.contributors.add(author, *contributors)
+    return project
+
+
+def create_issue(title, project, author, **fields):
+    """
+    Crée une issue (BUG, LOW, To Do par défaut).
+    """
+    fields = {"type": "BUG", "priority": "LOW", "progress": "To Do", **fields}
+    return Issue.objects.create(
+        title=title, description="d", project_assigned=project, author=author, **fields
+    )
+
+
+def create_comment(title, issue, author):
+    """
+    Crée un comment.
+    """
+    return Comment.objects.create(
+        title=title, description="d", issue_assigned=issue, author=author
+    )
+
+
+class QueryPlanMixin:
+    """
+    Mixin de TestCase : plans d'exécution SQLite (EXPLAIN QUERY PLAN) des
+    requêtes d'un point d'entrée de l'API.
+    """
+
+    def get_query_plans(self, url):
+        """
+        Exécute une requête GET et retourne le plan de chacune de ses requêtes SELECT.
+
+        Le cache des réponses est vidé avant la requête : la réponse est
+        toujours calculée.
+
+        Args:
+            url (str): L'URL, relative à API.
+
+        Returns:
+            list: [(sql, [lignes du plan])].
+        """
+        caches["responses"].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(API + url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if query["sql"].startswith("SELECT"):
+                    cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                    plans.append((query["sql"], [row[-1] for row in cursor.fetchall()]))
+        return plans
+
+    def assertUsesIndexes(self, url, sort=True):
+        """
+        Vérifie qu'aucune requête d'un point d'entrée ne parcourt une table
+        entière : chaque table est lue par une recherche dans un index
+        (SEARCH), jamais par un parcours (SCAN).
+
+        Args:
+            url (str): L'URL, relative à API.
+            sort (bool): False pour vérifier aussi que les lignes sont lues
+                dans l'ordre d'un index, sans tri (USE TEMP B-TREE).
+
+        Returns:
+            list: Les plans (voir get_query_plans).
+        """
+        plans = self.get_query_plans(url)
+        self.assertTrue(plans)
+        for sql, plan in plans:
+            for detail in plan:
+                self.assertFalse(detail.startswith("SCAN"), f"{detail}\n{sql}")
+                if not sort:
+                    self.assertNotIn("TEMP B-TREE", detail, sql)
+        return plans
@@ -40,9 +40,12 @@ urlpatterns = [
                 path("", include("project.urls")),
                 path("", include("issue.urls")),
                 path("", include("comment.urls")),
+                path("", include("search.urls")),
             ]
         ),
     ),
+    # lectures asynchrones (ASGI) des projets, issues et comments
+    path("softdesk/api/async/", include("Softdesk_API.async_urls")),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import CustomUser
+from .models import CustomUser, RevokedToken
 
 
 @admin.register(CustomUser)
@@ -69,3 +69,19 @@ class CustomUserAdmin(UserAdmin):
         "can_data_be_shared",
         "id",
     )
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    """
+    Administration des jetons de rafraîchissement révoqués (lecture seule).
+    """
+
+    list_display = ("jti", "user_id", "revoked_at", "expires_at")
+    search_fields = ("jti",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
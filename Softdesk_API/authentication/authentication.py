@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from Softdesk_API.cache import CacheStats
+
+from .models import CustomUser
+
+# revendication du jeton contenant la version des jetons de l'utilisateur
+TOKEN_VERSION_CLAIM = "token_version"
+
+TOKEN_VERSION_CACHE_KEY = "user:{}:token_version"
+
+# version mise en cache pour un utilisateur supprimé ou désactivé
+REVOKED = -1
+
+
+cache_stats = CacheStats()
+
+
+def get_token_version(user_id, refresh=False):
+    """
+    Retourne la version courante des jetons d'un utilisateur.
+
+    La version est lue dans le cache Django (durée de vie
+    TOKEN_VERSION_CACHE_TIMEOUT), sinon en base puis mise en cache.
+    L'entrée est invalidée par les signaux de authentication.signals lorsque
+    l'utilisateur est modifié ou supprimé.
+
+    Args:
+        user_id (int): L'identifiant de l'utilisateur.
+        refresh (bool): Ignore le cache et relit la version en base.
+
+    Returns:
+        int: La version des jetons, REVOKED si l'utilisateur n'existe pas ou
+        est inactif.
+    """
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = None
+    if not refresh:
+        version = cache.get(key)
+        cache_stats.record(hits=int(version is not None), misses=int(version is None))
+
+    if version is None:
+        version = (
+            CustomUser.objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is None:
+            version = REVOKED
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+    return version
+
+
+def check_token_version(user_id, token_version):
+    """
+    Vérifie que l'utilisateur d'un jeton existe, est actif et que la version
+    du jeton est la version courante (voir get_token_version).
+
+    La base n'est lue que si la version n'est pas en cache ou si le cache est
+    en retard sur le jeton.
+
+    Args:
+        user_id (int): L'identifiant de l'utilisateur du jeton.
+        token_version (int): La version du jeton, ou None pour un jeton émis
+            sans version (seule l'existence de l'utilisateur est vérifiée).
+
+    Raises:
+        AuthenticationFailed: L'utilisateur n'existe pas, est inactif, ou le
+            jeton a été révoqué.
+    """
+    version = get_token_version(user_id)
+    if version != REVOKED and token_version is not None and token_version > version:
+        # version émise après la mise en cache : le cache est en retard
+        version = get_token_version(user_id, refresh=True)
+
+    if version == REVOKED:
+        raise AuthenticationFailed(
+            "Utilisateur introuvable ou inactif.", code="user_inactive"
+        )
+    if token_version is not None and token_version != version:
+        raise AuthenticationFailed("Ce jeton a été révoqué.", code="token_revoked")
+
+
+def invalidate_token_versions(*user_ids):
+    """
+    Supprime du cache la version des jetons des utilisateurs donnés.
+    """
+    cache.delete_many([TOKEN_VERSION_CACHE_KEY.format(pk) for pk in user_ids])
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans lecture de l'utilisateur en base.
+
+    L'utilisateur de la requête est un TokenUser construit à partir des
+    revendications signées du jeton (identifiant, nom d'utilisateur, version
+    des jetons) : request.user.id et request.user.pk sont disponibles, les
+    autres champs du modèle CustomUser doivent être lus en base.
+
+    Le jeton est refusé si l'utilisateur a été supprimé ou désactivé, ou si
+    sa version des jetons a changé depuis l'émission du jeton (voir
+    check_token_version). Les jetons émis sans version sont vérifiés en base,
+    comme avec JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Le jeton ne contient pas d'identifiant d'utilisateur.")
+
+        token_version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if token_version is None:
+            return super().get_user(validated_token)
+
+        check_token_version(user_id, token_version)
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+@cache
+def get_executor():
+    """
+    Retourne le pool de threads du hachage des mots de passe.
+
+    Le pool compte PASSWORD_HASHING_WORKERS threads : le nombre de hachages
+    simultanés (coûteux en CPU, PBKDF2 par défaut) est borné quel que soit le
+    nombre de requêtes en cours, et le GIL est relâché pendant le calcul.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_WORKERS,
+        thread_name_prefix="password-hashing",
+    )
+
+
+def hash_password(password):
+    """
+    Hache un mot de passe dans le pool de hachage (voir get_executor).
+
+    Args:
+        password (str): Le mot de passe en clair, ou None pour un mot de passe inutilisable.
+
+    Returns:
+        str: Le mot de passe haché.
+    """
+    return get_executor().submit(make_password, password).result()
+
+
+def check_password(password, encoded):
+    """
+    Vérifie un mot de passe dans le pool de hachage (voir get_executor).
+
+    Args:
+        password (str): Le mot de passe en clair.
+        encoded (str): Le mot de passe haché enregistré.
+
+    Returns:
+        tuple: (correct, à re-hacher) ; le second indique que le hachage
+        enregistré n'utilise pas l'algorithme ou le facteur de travail actuels.
+    """
+    return get_executor().submit(verify_password, password, encoded).result()
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from authentication.models import RevokedToken
+
+
+class Command(BaseCommand):
+    """
+    Supprime les jetons révoqués expirés (table RevokedToken).
+
+    Un jeton expiré est refusé par sa date d'expiration : sa ligne est
+    inutile. Les lignes sont supprimées par lots de --batch-size, une
+    requête DELETE par lot, pour ne pas verrouiller la table longtemps.
+    """
+
+    help = "Supprime les jetons de rafraîchissement révoqués expirés."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Nombre de lignes supprimées par lot (défaut : 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            batch_size = 1000
+
+        expired = RevokedToken.objects.filter(expires_at__lte=timezone.now())
+        deleted = 0
+        while True:
+            pks = list(expired.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            deleted += RevokedToken.objects.filter(pk__in=pks).delete()[0]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} jeton(s) révoqué(s) supprimé(s).")
+        )
@@ -4,6 +4,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.db.models import CheckConstraint, Q
 
+from . import hashing
+
 
 class CustomUser(AbstractUser):
     """
@@ -25,16 +27,53 @@ class CustomUser(AbstractUser):
         date_of_birth: Date de naissance de l'utilisateur.
         can_be_contacted: Booléen indiquant si l'utilisateur peut être contacté ou non.
         can_data_be_shared: Booléen indiquant si les données de l'utilisateur peuvent être partagées ou non.
+        token_version: Version des jetons JWT de l'utilisateur ; l'incrémenter révoque
+            les jetons déjà émis (voir authentication.authentication).
     """
 
     date_of_birth = models.DateField()
     can_be_contacted = models.BooleanField(default=True)
     can_data_be_shared = models.BooleanField(default=True)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     REQUIRED_FIELDS = [
         "date_of_birth",
     ]
 
+    def set_password(self, raw_password):
+        """
+        Hache le mot de passe dans le pool de hachage (voir authentication.hashing).
+
+        Tout changement de mot de passe (API, administration, changepassword)
+        incrémente token_version : les jetons JWT déjà émis sont révoqués à
+        l'enregistrement de l'utilisateur.
+        """
+        self.password = hashing.hash_password(raw_password)
+        self._password = raw_password
+        self.token_version += 1
+
+    def check_password(self, raw_password):
+        """
+        Vérifie le mot de passe dans le pool de hachage (voir authentication.hashing).
+
+        Si le mot de passe est correct mais haché avec un ancien algorithme ou
+        facteur de travail, il est re-haché et enregistré. Ce n'est pas un
+        changement de mot de passe : token_version est inchangé et les jetons
+        déjà émis restent valides.
+
+        Args:
+            raw_password (str): Le mot de passe en clair.
+
+        Returns:
+            bool: True si le mot de passe est correct.
+        """
+        is_correct, must_update = hashing.check_password(raw_password, self.password)
+        if is_correct and must_update:
+            # pas de set_password : token_version ne doit pas changer
+            self.password = hashing.hash_password(raw_password)
+            self.save(update_fields=["password"])
+        return is_correct
+
     class Meta:
 
         constraints = [
@@ -48,3 +87,29 @@ class CustomUser(AbstractUser):
                 name="Vous devez avoir plus de 15 ans !!!",
             ),
         ]
+
+
+class RevokedToken(models.Model):
+    """
+    Jeton de rafraîchissement révoqué (voir authentication.revocation).
+
+    Un jeton est révoqué lorsqu'il est échangé contre une nouvelle paire de
+    jetons (rotation) : l'unicité de jti garantit qu'un jeton ne peut être
+    échangé qu'une seule fois. Les lignes dont le jeton a expiré sont
+    supprimées par la commande prune_revoked_tokens.
+
+    Attributes:
+        jti: Identifiant unique du jeton.
+        user_id: Identifiant de l'utilisateur du jeton (sans clé étrangère :
+            la révocation survit à la suppression de l'utilisateur).
+        expires_at: Date d'expiration du jeton.
+        revoked_at: Date de la révocation.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    user_id = models.BigIntegerField(null=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,172 @@
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from functools import cache
+from threading import Lock
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom : ensemble probabiliste de chaînes.
+
+    Un élément ajouté est toujours reconnu ; un élément absent peut être
+    reconnu à tort avec une probabilité proche de error_rate tant que le
+    filtre contient au plus capacity éléments.
+
+    Args:
+        capacity (int): Nombre d'éléments prévu.
+        error_rate (float): Taux de faux positifs visé.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        # double hachage : les k positions sont dérivées de deux empreintes de 64 bits
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class RevocationList:
+    """
+    Liste des jetons de rafraîchissement révoqués, propre au processus.
+
+    Les jti révoqués (table RevokedToken) sont chargés dans un filtre de
+    Bloom : un jti absent du filtre n'est pas révoqué, sans requête ; la base
+    n'est interrogée que si le jti est présent dans le filtre (révoqué, ou
+    faux positif). Le filtre est complété au plus toutes les
+    TOKEN_REVOCATION_SYNC_INTERVAL secondes avec les lignes ajoutées depuis
+    la dernière synchronisation, et reconstruit (lignes non expirées) lorsqu'il
+    dépasse sa capacité.
+
+    Les révocations d'un autre processus peuvent donc n'être vues qu'après
+    l'intervalle de synchronisation ; revoke() reste sûr car l'unicité de jti
+    est garantie par la base.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._filter = None
+        self._last_id = 0
+        self._synced_at = None
+
+    def _rebuild(self):
+        """
+        Reconstruit le filtre à partir des jetons révoqués non expirés.
+        """
+        now = datetime.now(timezone.utc)
+        last_id = RevokedToken.objects.aggregate(last_id=Max("pk"))["last_id"] or 0
+        jtis = RevokedToken.objects.filter(pk__lte=last_id, expires_at__gt=now)
+        count = jtis.count()
+        bloom = BloomFilter(
+            max(settings.TOKEN_REVOCATION_BLOOM_CAPACITY, 2 * count),
+            settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for jti in jtis.values_list("jti", flat=True).iterator(chunk_size=2000):
+            bloom.add(jti)
+        self._filter = bloom
+        self._last_id = last_id
+
+    def sync(self, force=False):
+        """
+        Ajoute au filtre les jetons révoqués depuis la dernière synchronisation.
+
+        Args:
+            force (bool): Synchronise même si l'intervalle n'est pas écoulé.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._synced_at is not None
+                and now - self._synced_at < settings.TOKEN_REVOCATION_SYNC_INTERVAL
+            ):
+                return
+            self._synced_at = now
+
+            if self._filter is None or self._filter.count > self._filter.capacity:
+                self._rebuild()
+                return
+
+            for pk, jti in RevokedToken.objects.filter(
+                pk__gt=self._last_id
+            ).values_list("pk", "jti"):
+                self._filter.add(jti)
+                self._last_id = max(self._last_id, pk)
+
+    def is_revoked(self, jti):
+        """
+        Indique si le jeton a été révoqué.
+
+        Args:
+            jti (str): L'identifiant du jeton.
+
+        Returns:
+            bool: True si le jeton a été révoqué.
+        """
+        self.sync()
+        if jti not in self._filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, token):
+        """
+        Révoque un jeton.
+
+        Args:
+            token (Token): Le jeton validé (jti, exp et identifiant d'utilisateur).
+
+        Returns:
+            bool: False si le jeton était déjà révoqué.
+        """
+        jti = token["jti"]
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(
+                    jti=jti,
+                    user_id=token.get(api_settings.USER_ID_CLAIM),
+                    expires_at=datetime.fromtimestamp(token["exp"], timezone.utc),
+                )
+        except IntegrityError:
+            return False
+
+        transaction.on_commit(lambda: self._add(jti))
+        return True
+
+    def _add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+
+@cache
+def get_revocation_list():
+    """
+    Retourne la liste des jetons révoqués du processus (voir RevocationList).
+    """
+    return RevocationList()
@@ -1,8 +1,14 @@
 from datetime import date
 
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer)
+from rest_framework_simplejwt.settings import api_settings
 
+from .authentication import TOKEN_VERSION_CLAIM, check_token_version
 from .models import CustomUser
+from .revocation import get_revocation_list
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -98,3 +104,47 @@ class CustomUserPostSerializer(serializers.ModelSerializer):
             "can_be_contacted",
             "can_data_be_shared",
         )
+
+
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Serializer d'obtention d'une paire de jetons JWT.
+
+    Ajoute aux revendications le nom d'utilisateur et la version des jetons
+    de l'utilisateur, lues par StatelessJWTAuthentication sans requête en base.
+    Les jetons d'accès obtenus par rafraîchissement reprennent ces revendications.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Serializer de rafraîchissement des jetons JWT, avec rotation.
+
+    Le jeton de rafraîchissement est refusé s'il a déjà été échangé (voir
+    authentication.revocation), si l'utilisateur a été supprimé ou désactivé,
+    ou si sa version des jetons a changé (changement de mot de passe). Avec
+    ROTATE_REFRESH_TOKENS, il est révoqué et remplacé par un nouveau jeton.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        revocation_list = get_revocation_list()
+        if revocation_list.is_revoked(refresh["jti"]):
+            raise InvalidToken("Ce jeton a été révoqué.")
+        check_token_version(
+            refresh.get(api_settings.USER_ID_CLAIM), refresh.get(TOKEN_VERSION_CLAIM)
+        )
+
+        # la révocation échoue si le jeton vient d'être échangé par une autre requête
+        if api_settings.ROTATE_REFRESH_TOKENS and not revocation_list.revoke(refresh):
+            raise InvalidToken("Ce jeton a été révoqué.")
+
+        return super().validate(attrs)
@@ -0,0 +1,18 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_token_versions
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def user_changed(sender, instance, **kwargs):
+    """
+    Invalide la version des jetons en cache d'un utilisateur modifié
+    (mot de passe, activation) ou supprimé, après la validation de la transaction.
+    """
+    transaction.on_commit(partial(invalidate_token_versions, instance.pk))
@@ -0,0 +1,345 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from Softdesk_API.testing import API, create_project
+
+from .authentication import TOKEN_VERSION_CACHE_KEY
+from .models import CustomUser, RevokedToken
+from .revocation import BloomFilter, RevocationList, get_revocation_list
+
+TOKEN_URL = "/softdesk/api/auth/token/"
+REFRESH_URL = "/softdesk/api/auth/token/refresh/"
+USERS_URL = "/softdesk/api/auth/users/"
+
+
+class TokenVersionTests(APITestCase):
+    """
+    Révocation des jetons JWT au changement de mot de passe.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_revocation_list.cache_clear()
+        self.user = CustomUser.objects.create_user(
+            "alice", password="Ancien-mot-2-passe", date_of_birth=date(1990, 1, 1)
+        )
+
+    def obtain_tokens(self, password="Ancien-mot-2-passe"):
+        response = self.client.post(
+            TOKEN_URL, {"username": "alice", "password": password}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["access"], response.data["refresh"]
+
+    def assertTokensAccepted(self, access, refresh, accepted):
+        expected = 200 if accepted else 401
+        response = self.client.get(USERS_URL, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, expected)
+        response = self.client.post(REFRESH_URL, {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, expected)
+
+    def test_set_password_revokes_tokens(self):
+        access, refresh = self.obtain_tokens()
+        version = self.user.token_version
+
+        # administration, changepassword : set_password puis save
+        self.user.set_password("Nouveau-mot-2-passe")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_version, version + 1)
+        self.assertTokensAccepted(access, refresh, accepted=False)
+        self.assertTokensAccepted(*self.obtain_tokens("Nouveau-mot-2-passe"), True)
+
+    def test_update_password_revokes_tokens(self):
+        access, refresh = self.obtain_tokens()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"{USERS_URL}{self.user.pk}/",
+                {"password": "Nouveau-mot-2-passe"},
+                format="json",
+                HTTP_AUTHORIZATION=f"Bearer {access}",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertTokensAccepted(access, refresh, accepted=False)
+
+    def test_update_without_password_keeps_tokens(self):
+        access, refresh = self.obtain_tokens()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"{USERS_URL}{self.user.pk}/",
+                {"can_be_contacted": False},
+                format="json",
+                HTTP_AUTHORIZATION=f"Bearer {access}",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertTokensAccepted(access, refresh, accepted=True)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+    )
+    def test_hasher_upgrade_keeps_tokens(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(
+            password=make_password("Ancien-mot-2-passe", hasher="md5")
+        )
+        version = self.user.token_version
+
+        # la connexion re-hache le mot de passe avec PBKDF2
+        with self.captureOnCommitCallbacks(execute=True):
+            access, refresh = self.obtain_tokens()
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.assertEqual(self.user.token_version, version)
+        self.assertTokensAccepted(access, refresh, accepted=True)
+
+
+class StatelessAuthenticationTests(APITestCase):
+    """
+    StatelessJWTAuthentication : l'utilisateur n'est pas lu en base, seule sa
+    version des jetons est vérifiée (en cache).
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_revocation_list.cache_clear()
+        self.user = CustomUser.objects.create_user(
+            "alice", password="Ancien-mot-2-passe", date_of_birth=date(1990, 1, 1)
+        )
+        create_project("P", self.user)
+        response = self.client.post(
+            TOKEN_URL,
+            {"username": "alice", "password": "Ancien-mot-2-passe"},
+            format="json",
+        )
+        self.access = response.data["access"]
+        self.user_table = CustomUser._meta.db_table
+
+    def get_list(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"{API}project/", HTTP_AUTHORIZATION=f"Bearer {self.access}"
+            )
+        user_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if f'FROM "{self.user_table}"' in query["sql"]
+        ]
+        return response, user_queries
+
+    def test_no_user_lookup(self):
+        cache.set(TOKEN_VERSION_CACHE_KEY.format(self.user.pk), self.user.token_version)
+        response, user_queries = self.get_list()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_queries, [])
+
+    def test_cold_cache_reads_token_version_only(self):
+        cache.clear()
+        response, user_queries = self.get_list()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(user_queries), 1)
+        self.assertIn('"token_version"', user_queries[0])
+        self.assertNotIn('"password"', user_queries[0])
+
+        # version en cache : plus aucune lecture de l'utilisateur
+        self.assertEqual(self.get_list()[1], [])
+
+    def test_stale_token_version_rejected(self):
+        # version en cache avant le changement de mot de passe
+        self.assertEqual(self.get_list()[0].status_code, 200)
+
+        self.user.set_password("Nouveau-mot-2-passe")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response, _ = self.get_list()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "token_revoked")
+
+    def test_token_issued_after_cached_version(self):
+        # cache en retard sur le jeton : la version est relue en base
+        CustomUser.objects.filter(pk=self.user.pk).update(token_version=5)
+        cache.set(TOKEN_VERSION_CACHE_KEY.format(self.user.pk), self.user.token_version)
+        self.user.refresh_from_db()
+        response = self.client.post(
+            TOKEN_URL,
+            {"username": "alice", "password": "Ancien-mot-2-passe"},
+            format="json",
+        )
+        self.access = response.data["access"]
+
+        response, user_queries = self.get_list()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(user_queries), 1)
+
+
+class RefreshRotationTests(APITestCase):
+    """
+    Rotation des jetons de rafraîchissement : un jeton échangé est révoqué.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_revocation_list.cache_clear()
+        self.addCleanup(get_revocation_list.cache_clear)
+        CustomUser.objects.create_user(
+            "alice", password="Ancien-mot-2-passe", date_of_birth=date(1990, 1, 1)
+        )
+        response = self.client.post(
+            TOKEN_URL,
+            {"username": "alice", "password": "Ancien-mot-2-passe"},
+            format="json",
+        )
+        self.refresh = response.data["refresh"]
+
+    def post_refresh(self, refresh):
+        return self.client.post(REFRESH_URL, {"refresh": refresh}, format="json")
+
+    def test_reuse_rejected(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post_refresh(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data["refresh"]
+        self.assertNotEqual(rotated, self.refresh)
+
+        # jeton échangé : dans le filtre, refusé après une lecture en base
+        self.assertEqual(self.post_refresh(self.refresh).status_code, 401)
+        self.assertEqual(self.post_refresh(rotated).status_code, 200)
+
+    def test_reuse_rejected_before_sync(self):
+        # révocation d'un autre processus, pas encore dans le filtre : le
+        # second échange échoue sur l'unicité de jti
+        self.assertEqual(self.post_refresh(self.refresh).status_code, 200)
+        self.assertEqual(self.post_refresh(self.refresh).status_code, 401)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+    def test_reuse_rejected_by_new_process(self):
+        self.assertEqual(self.post_refresh(self.refresh).status_code, 200)
+        get_revocation_list.cache_clear()
+        self.assertEqual(self.post_refresh(self.refresh).status_code, 401)
+
+
+class RevocationListTests(TestCase):
+    """
+    Liste des jetons révoqués : révocation idempotente, filtre de Bloom sans
+    faux négatif après synchronisation.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            "alice", password="Ancien-mot-2-passe", date_of_birth=date(1990, 1, 1)
+        )
+
+    def create_revoked(self, count, prefix):
+        expires_at = timezone.now() + timedelta(days=1)
+        return [
+            token.jti
+            for token in RevokedToken.objects.bulk_create(
+                RevokedToken(jti=f"{prefix}{index}", expires_at=expires_at)
+                for index in range(count)
+            )
+        ]
+
+    def test_revoke_idempotent(self):
+        revocation_list = RevocationList()
+        revocation_list.sync(force=True)
+        token = RefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(revocation_list.revoke(token))
+            self.assertFalse(revocation_list.revoke(token))
+        self.assertEqual(RevokedToken.objects.filter(jti=token["jti"]).count(), 1)
+        self.assertTrue(revocation_list.is_revoked(token["jti"]))
+
+    def test_no_false_negative_after_sync(self):
+        revocation_list = RevocationList()
+        jtis = self.create_revoked(500, "a")
+        revocation_list.sync(force=True)
+        # lignes ajoutées depuis : ajout incrémental
+        jtis += self.create_revoked(500, "b")
+        revocation_list.sync(force=True)
+        self.assertTrue(all(revocation_list.is_revoked(jti) for jti in jtis))
+        self.assertFalse(revocation_list.is_revoked("absent"))
+
+    @override_settings(TOKEN_REVOCATION_BLOOM_CAPACITY=100)
+    def test_no_false_negative_after_rebuild(self):
+        revocation_list = RevocationList()
+        jtis = self.create_revoked(50, "a")
+        revocation_list.sync(force=True)
+        jtis += self.create_revoked(200, "b")
+        revocation_list.sync(force=True)
+        self.assertGreater(
+            revocation_list._filter.count, revocation_list._filter.capacity
+        )
+
+        # capacité dépassée : le filtre est reconstruit, plus grand
+        jtis += self.create_revoked(10, "c")
+        revocation_list.sync(force=True)
+        self.assertEqual(revocation_list._filter.count, len(jtis))
+        self.assertGreaterEqual(revocation_list._filter.capacity, 2 * len(jtis))
+        with self.assertNumQueries(len(jtis)):
+            self.assertTrue(all(revocation_list.is_revoked(jti) for jti in jtis))
+
+
+class BloomFilterTests(SimpleTestCase):
+    """
+    Filtre de Bloom : pas de faux négatif, faux positifs proches du taux visé.
+    """
+
+    def test_membership(self):
+        bloom = BloomFilter(10000, 0.01)
+        keys = [f"jti-{index}" for index in range(10000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+
+        false_positives = sum(f"absent-{index}" in bloom for index in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+
+
+class PruneRevokedTokensTests(TestCase):
+    """
+    Commande prune_revoked_tokens : seules les lignes expirées sont supprimées.
+    """
+
+    def test_prune(self):
+        now = timezone.now()
+        RevokedToken.objects.bulk_create(
+            [
+                RevokedToken(
+                    jti=f"expired{index}", expires_at=now - timedelta(hours=index + 1)
+                )
+                for index in range(5)
+            ]
+            + [
+                RevokedToken(
+                    jti=f"valid{index}", expires_at=now + timedelta(hours=index + 1)
+                )
+                for index in range(3)
+            ]
+        )
+        out = StringIO()
+        call_command("prune_revoked_tokens", batch_size=2, stdout=out)
+
+        self.assertIn("5 jeton(s)", out.getvalue())
+        self.assertEqual(
+            sorted(RevokedToken.objects.values_list("jti", flat=True)),
+            ["valid0", "valid1", "valid2"],
+        )
@@ -1,4 +1,3 @@
-from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import IntegrityError
@@ -6,6 +5,7 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
 from rest_framework.response import Response
 
+from .hashing import hash_password
 from .models import CustomUser
 from .permissions import IsCreationOrIsAuthenticated
 from .serializers import (CustomUserDetailSerializer, CustomUserPostSerializer,
@@ -38,7 +38,8 @@ class CustomUserViewSet(viewsets.ViewSet):
         Returns:
             Response: Réponse HTTP contenant les données de l'utilisateur authentifié.
         """
-        user = request.user
+        # request.user est construit à partir du jeton : les données sont lues en base
+        user = CustomUser.objects.get(pk=request.user.id)
         serializer = CustomUserDetailSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -80,7 +81,7 @@ class CustomUserViewSet(viewsets.ViewSet):
                     )
 
                 # Hashage du mot de passe
-                serializer.validated_data["password"] = make_password(password)
+                serializer.validated_data["password"] = hash_password(password)
                 serializer.save()
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -106,6 +107,8 @@ class CustomUserViewSet(viewsets.ViewSet):
         Modification des donneés de l'utilisateur.
 
         L'utilisateur doit etre authentifié et il ne peut modifier que ses propres données.
+        Le mot de passe est facultatif ; sa modification révoque les jetons JWT
+        déjà émis.
 
         Args:
             request (HttpRequest): Requête HTTP PATCH ou PUT contenant les données à mettre à jour.
@@ -116,23 +119,26 @@ class CustomUserViewSet(viewsets.ViewSet):
         """
         try:
             user = CustomUser.objects.get(pk=pk)
-            if request.user == user:
+            if request.user.id == user.id:
                 serializer = CustomUserSerializer(user, data=request.data, partial=True)
                 if serializer.is_valid():
+                    # le mot de passe n'est validé et haché que s'il est modifié
                     password = serializer.validated_data.get("password")
-                    try:
-                        validate_password(password)
-                    except ValidationError as e:
-                        return Response(
-                            {"error": f"Mot de passe invalide: {e} "},
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
-
-                    # Hashage du mot de passe
-                    serializer.validated_data["password"] = make_password(password)
+                    if password is not None:
+                        try:
+                            validate_password(password)
+                        except ValidationError as e:
+                            return Response(
+                                {"error": f"Mot de passe invalide: {e} "},
+                                status=status.HTTP_400_BAD_REQUEST,
+                            )
+
+                        # Hashage du mot de passe, les jetons déjà émis sont
+                        # révoqués (voir CustomUser.set_password)
+                        user.set_password(serializer.validated_data.pop("password"))
                     serializer.save()
                     return Response(serializer.data, status=status.HTTP_200_OK)
-                
+
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             else:
                 return Response(
@@ -160,6 +166,7 @@ class CustomUserViewSet(viewsets.ViewSet):
         Suppression des données de l'utilisateur.
 
         L'utilisateur doit etre authentifié et il ne peut supprimer que ses propres données.
+        Ses jetons d'accès et de rafraîchissement sont ensuite refusés.
 
         Args:
             request (HttpRequest): Requête HTTP DELETE.
@@ -170,7 +177,7 @@ class CustomUserViewSet(viewsets.ViewSet):
         """
         try:
             user = CustomUser.objects.get(pk=pk)
-            if request.user == user:
+            if request.user.id == user.id:
                 user.delete()
                 return Response(status=status.HTTP_204_NO_CONTENT)
             else:
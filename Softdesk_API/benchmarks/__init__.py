@@ -0,0 +1,6 @@
+"""
+Mesures de performance de l'API.
+
+Chaque module s'exécute depuis le dossier Softdesk_API, par exemple :
+    python -m benchmarks.json_codec
+"""
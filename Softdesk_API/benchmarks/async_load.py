@@ -0,0 +1,149 @@
+"""
+Test de charge des lectures : vues asynchrones servies par le gestionnaire
+ASGI de Django (boucle d'événements, comme sous uvicorn) face aux ViewSets
+synchrones servis par le gestionnaire WSGI (un thread par requête, comme
+sous un serveur WSGI à threads), pour plusieurs niveaux de concurrence.
+
+Les requêtes GET /issue/ et GET /async/issue/ sont authentifiées par un
+jeton JWT, sans cache des réponses. --db-latency ajoute une attente à
+chaque requête SQL pour simuler une base distante : les requêtes de l'ORM
+asynchrone de Django sont exécutées par sync_to_async dans un seul thread.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.async_load [--requests 400] [--concurrency 1,8,32]
+        [--issues 500] [--db-latency 0]
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from .common import (print_table, setup, temporary_database,
+                     without_response_cache)
+
+API = "/softdesk/api/"
+
+
+def populate(issues):
+    """
+    Crée un projet de issues issues et retourne l'en-tête d'authentification
+    de son auteur.
+    """
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from authentication.models import CustomUser
+    from issue.models import Issue
+    from project.models import Project
+
+    user = CustomUser.objects.create(username="member", date_of_birth=date(1990, 1, 1))
+    project = Project.objects.create(
+        title="Projet", description="d", type="backend", author=user
+    )
+    project.contributors.add(user)
+    Issue.objects.bulk_create(
+        Issue(
+            title=f"Issue {index}",
+            description="Le bouton « Valider » ne répond pas. " * 4,
+            type="BUG",
+            priority="LOW",
+            progress="To Do",
+            author=user,
+            project_assigned=project,
+        )
+        for index in range(issues)
+    )
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+def add_db_latency(seconds):
+    """
+    Ajoute une attente de seconds secondes à chaque requête SQL, sur toutes
+    les connexions ouvertes ensuite.
+    """
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def wait(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(connection, **kwargs):
+        connection.execute_wrappers.append(wait)
+
+    connection_created.connect(install, weak=False)
+    connections.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--db-latency", type=float, default=0, help="millisecondes")
+    options = parser.parse_args()
+    count = options.requests
+
+    setup()
+    from django.test import AsyncClient, Client
+
+    with temporary_database(), without_response_cache():
+        authorization = populate(options.issues)
+        if options.db_latency:
+            add_db_latency(options.db_latency / 1000)
+
+        def wsgi(concurrency):
+            def get(_):
+                return (
+                    Client()
+                    .get(
+                        f"{API}issue/?limit=50",
+                        headers={"Authorization": authorization},
+                    )
+                    .status_code
+                )
+
+            with ThreadPoolExecutor(concurrency) as executor:
+                return list(executor.map(get, range(count)))
+
+        async def asgi(concurrency):
+            semaphore = asyncio.Semaphore(concurrency)
+            client = AsyncClient()
+
+            async def get():
+                async with semaphore:
+                    response = await client.get(
+                        f"{API}async/issue/?limit=50",
+                        headers={"Authorization": authorization},
+                    )
+                    return response.status_code
+
+            return await asyncio.gather(*(get() for _ in range(count)))
+
+        def throughput(run):
+            start = time.perf_counter()
+            statuses = run()
+            elapsed = time.perf_counter() - start
+            assert set(statuses) == {200}, set(statuses)
+            return count / elapsed
+
+        rows = []
+        for concurrency in (int(value) for value in options.concurrency.split(",")):
+            sync = throughput(lambda: wsgi(concurrency))
+            asynchronous = throughput(lambda: asyncio.run(asgi(concurrency)))
+            rows.append(
+                [
+                    concurrency,
+                    f"{sync:.1f}",
+                    f"{asynchronous:.1f}",
+                    f"x{asynchronous / sync:.2f}",
+                ]
+            )
+
+    print(f"{count} requêtes, latence SQL simulée : {options.db_latency} ms")
+    print_table(["concurrence", "WSGI (req/s)", "ASGI (req/s)", "ASGI / WSGI"], rows)
+
+
+if __name__ == "__main__":
+    main()
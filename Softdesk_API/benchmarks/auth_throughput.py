@@ -0,0 +1,124 @@
+"""
+Débit (opérations par seconde) des écritures et de la connexion des
+utilisateurs, avec les hacheurs de mots de passe du projet :
+    - inscription (POST /auth/users/) : un hachage ;
+    - connexion (POST /auth/token/) : une vérification, séquentielle puis
+      depuis plusieurs threads (hachage dans le pool de
+      PASSWORD_HASHING_WORKERS threads) ;
+    - modification du profil sans mot de passe (PUT /auth/users/<id>/) :
+      aucun hachage ;
+    - modification du mot de passe : un hachage.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.auth_throughput [--requests 20] [--threads 4]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import print_table, setup, temporary_database
+
+PASSWORD = "Xy7!long-Passw0rd"
+USERS = "/softdesk/api/auth/users/"
+TOKEN = "/softdesk/api/auth/token/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    options = parser.parse_args()
+    count = options.requests
+
+    setup()
+    from django.conf import settings
+    from rest_framework.test import APIClient
+
+    from authentication.models import CustomUser
+
+    with temporary_database():
+        anonymous = APIClient()
+
+        def throughput(request, threads=1):
+            """
+            Exécute request(0..count-1) et retourne le nombre de requêtes par seconde.
+            """
+            start = time.perf_counter()
+            if threads == 1:
+                statuses = [request(index) for index in range(count)]
+            else:
+                with ThreadPoolExecutor(threads) as executor:
+                    statuses = list(executor.map(request, range(count)))
+            elapsed = time.perf_counter() - start
+            assert set(statuses) == {200} or set(statuses) == {201}, statuses
+            return count / elapsed
+
+        def signup(index):
+            return anonymous.post(
+                USERS,
+                {
+                    "username": f"user{index}",
+                    "password": PASSWORD,
+                    "date_of_birth": "1990-01-01",
+                },
+                format="json",
+            ).status_code
+
+        def login(index):
+            return (
+                APIClient()
+                .post(
+                    TOKEN,
+                    {"username": f"user{index}", "password": PASSWORD},
+                    format="json",
+                )
+                .status_code
+            )
+
+        rows = [["inscription", 1, f"{throughput(signup):.1f}"]]
+        rows.append(["connexion", 1, f"{throughput(login):.1f}"])
+        rows.append(
+            [
+                "connexion",
+                options.threads,
+                f"{throughput(login, options.threads):.1f}",
+            ]
+        )
+
+        access = anonymous.post(
+            TOKEN, {"username": "user0", "password": PASSWORD}, format="json"
+        ).data["access"]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        user = CustomUser.objects.get(username="user0")
+        url = f"{USERS}{user.pk}/"
+
+        def update_profile(index):
+            return client.put(
+                url, {"can_be_contacted": bool(index % 2)}, format="json"
+            ).status_code
+
+        def update_password(index):
+            # chaque changement révoque le jeton : authentification sans jeton
+            client.force_authenticate(user)
+            return client.put(
+                url, {"password": f"{PASSWORD}{index}"}, format="json"
+            ).status_code
+
+        rows.append(
+            ["profil sans mot de passe", 1, f"{throughput(update_profile):.1f}"]
+        )
+        rows.append(
+            ["changement de mot de passe", 1, f"{throughput(update_password):.1f}"]
+        )
+
+    print(
+        f"hacheur : {settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]}, "
+        f"PASSWORD_HASHING_WORKERS = {settings.PASSWORD_HASHING_WORKERS}"
+    )
+    print_table(["opération", "threads", "requêtes/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
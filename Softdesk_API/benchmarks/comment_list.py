@@ -0,0 +1,178 @@
+"""
+Latence de la liste des comments lorsque le nombre de comments croît, pour
+un contributeur de nombreux projets :
+    - requête d'une page de la liste : visibilité exprimée par une jointure
+      sur les contributeurs (Comment.objects.visible_to), et par les
+      sous-requêtes IN imbriquées qu'elle remplace ;
+    - GET /comment/ et GET /comment/issue-comments/ complets. GET /comment/
+      compte aussi les comments visibles (pagination) : ce comptage,
+      proportionnel au nombre de comments visibles, ne dépend pas de la
+      page. Le cache des réponses est désactivé pendant les mesures, donc
+      aussi les validateurs ETag / Last-Modified des listes (dérivés des
+      versions de ce cache, sans requête).
+
+Les comments sont ajoutés par paliers dans une base de test temporaire ;
+le palier d'un million de lignes demande quelques minutes.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.comment_list [--sizes 10000,100000,1000000]
+        [--projects 200] [--issues-per-project 50]
+"""
+
+import argparse
+import random
+from datetime import date
+
+from .common import (best_of, print_table, setup, temporary_database,
+                     without_response_cache)
+
+
+def populate(projects, issues_per_project):
+    """
+    Crée l'utilisateur mesuré, contributeur de projects projets, et autant de
+    projets d'un autre utilisateur, dont les comments ne lui sont pas visibles.
+
+    Returns:
+        tuple: L'utilisateur et la liste des identifiants des issues.
+    """
+    from authentication.models import CustomUser
+    from issue.models import Issue
+    from project.models import Project
+
+    user = CustomUser.objects.create(username="member", date_of_birth=date(1990, 1, 1))
+    other = CustomUser.objects.create(username="other", date_of_birth=date(1990, 1, 1))
+    Project.objects.bulk_create(
+        Project(
+            title=f"Projet {index}",
+            description="d",
+            type="backend",
+            author=user if index % 2 else other,
+        )
+        for index in range(2 * projects)
+    )
+    through = Project.contributors.through
+    through.objects.bulk_create(
+        through(project_id=project.pk, customuser_id=project.author_id)
+        for project in Project.objects.all()
+    )
+    Issue.objects.bulk_create(
+        (
+            Issue(
+                title=f"Issue {project.pk}-{index}",
+                description="d",
+                type="BUG",
+                priority="LOW",
+                progress="To Do",
+                author_id=project.author_id,
+                project_assigned=project,
+            )
+            for project in Project.objects.all()
+            for index in range(issues_per_project)
+        ),
+        batch_size=5000,
+    )
+    return user, list(Issue.objects.values_list("pk", "author_id"))
+
+
+def add_comments(issues, start, stop):
+    """
+    Ajoute les comments start à stop, répartis au hasard sur les issues.
+    """
+    from comment.models import Comment
+
+    rng = random.Random(start)
+    batch_size = 10000
+    for first in range(start, stop, batch_size):
+        comments = []
+        for index in range(first, min(first + batch_size, stop)):
+            issue_id, author_id = rng.choice(issues)
+            comments.append(
+                Comment(
+                    title=f"Comment {index}",
+                    description="Le bouton « Valider » ne répond pas.",
+                    issue_assigned_id=issue_id,
+                    author_id=author_id,
+                )
+            )
+        Comment.objects.bulk_create(comments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--issues-per-project", type=int, default=50)
+    options = parser.parse_args()
+    sizes = sorted(int(size) for size in options.sizes.split(","))
+
+    setup()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from comment.models import Comment
+    from issue.models import Issue
+    from project.models import Project
+
+    with temporary_database(), without_response_cache():
+        user, issues = populate(options.projects, options.issues_per_project)
+        visible = [pk for pk, author_id in issues if author_id == user.pk]
+        client = APIClient()
+        client.force_authenticate(user)
+        pages = {
+            "jointure": Comment.objects.visible_to(user),
+            "IN imbriqués": Comment.objects.filter(
+                issue_assigned__id__in=Issue.objects.filter(
+                    project_assigned__id__in=Project.objects.filter(
+                        contributors=user
+                    ).values_list("id")
+                ).values_list("id")
+            ),
+        }
+        urls = [
+            ("comment/", "/softdesk/api/comment/"),
+            (
+                "issue-comments",
+                f"/softdesk/api/comment/issue-comments/?issue_id={visible[0]}",
+            ),
+        ]
+
+        def get(url):
+            response = client.get(url)
+            assert response.status_code == 200, response.content[:200]
+
+        rows = []
+        count = 0
+        for size in sizes:
+            add_comments(issues, count, size)
+            count = size
+            row = [f"{size:,}".replace(",", " ")]
+            for queryset in pages.values():
+                # première page, comme GET /comment/ (pagination par défaut)
+                page = queryset[:100]
+                row.append(f"{best_of(lambda: list(page.all()), number=10) * 1000:.1f}")
+            for _, url in urls:
+                get(url)
+                row.append(f"{best_of(lambda: get(url), number=10) * 1000:.1f}")
+            with CaptureQueriesContext(connection) as queries:
+                get(urls[0][1])
+            row.append(len(queries))
+            rows.append(row)
+
+    print(
+        f"{options.projects} projets visibles sur {2 * options.projects}, "
+        f"{len(issues)} issues"
+    )
+    print_table(
+        [
+            "comments",
+            *(f"page {label} (ms)" for label in pages),
+            *(f"{label} (ms)" for label, _ in urls),
+            "requêtes",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup():
+    """
+    Configure Django avec les réglages du projet (DJANGO_SETTINGS_MODULE
+    s'il est défini).
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Softdesk_API.settings")
+    django.setup()
+
+
+@contextmanager
+def temporary_database():
+    """
+    Crée une base de test temporaire (migrations appliquées), détruite à la
+    sortie du bloc : les mesures ne modifient pas la base du projet. Le
+    client de test de Django peut être utilisé dans le bloc.
+    """
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def without_response_cache():
+    """
+    Désactive le cache des réponses (CachedResponseMixin) : chaque requête
+    mesurée est traitée entièrement.
+
+    Returns:
+        override_settings: À utiliser comme gestionnaire de contexte.
+    """
+    from django.conf import settings
+    from django.test import override_settings
+
+    caches = {
+        **settings.CACHES,
+        "responses": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+    return override_settings(CACHES=caches)
+
+
+def best_of(func, repeat=5, number=1):
+    """
+    Mesure la meilleure durée de func sur repeat séries de number appels.
+
+    Args:
+        func (callable): La fonction mesurée, sans argument.
+        repeat (int): Nombre de séries.
+        number (int): Nombre d'appels par série.
+
+    Returns:
+        float: La durée (secondes) d'un appel, pour la meilleure série.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def print_table(headers, rows):
+    """
+    Affiche un tableau aligné.
+
+    Args:
+        headers (list): Les titres des colonnes.
+        rows (list): Les lignes (listes de valeurs).
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [
+        max(len(str(header)), *(len(row[index]) for row in rows))
+        for index, header in enumerate(headers)
+    ]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(value.rjust(w) for value, w in zip(row, widths)))
@@ -0,0 +1,145 @@
+"""
+Requêtes par seconde avec et sans connexions persistantes à la base
+(DATABASE_CONN_MAX_AGE = 0 : une connexion par requête ; 60 : connexion
+réutilisée), pour GET /project/ authentifié par un jeton JWT.
+
+Chaque réglage est mesuré dans un processus séparé, les variables
+d'environnement étant lues au chargement des réglages. Les requêtes sont
+passées directement à l'application WSGI, avec les signaux request_started
+et request_finished qui ouvrent et ferment les connexions comme sous un
+serveur. La base est un fichier SQLite temporaire, ou la base de
+--database-url (base vide dédiée aux mesures : les migrations y sont
+appliquées et des données y sont ajoutées).
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.conn_max_age [--requests 1500] [--repeat 2]
+        [--database-url postgres://...]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+from .common import print_table, setup
+
+
+def run(requests):
+    """
+    Mesure le débit avec les réglages de l'environnement (processus enfant).
+
+    Returns:
+        dict: CONN_MAX_AGE, requêtes par seconde et connexions ouvertes.
+    """
+    setup()
+    from wsgiref.util import setup_testing_defaults
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from django.test import override_settings
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from authentication.models import CustomUser
+    from project.models import Project
+
+    call_command("migrate", verbosity=0)
+    user, created = CustomUser.objects.get_or_create(
+        username="benchmark", defaults={"date_of_birth": date(1990, 1, 1)}
+    )
+    if created:
+        for index in range(10):
+            project = Project.objects.create(
+                title=f"Projet {index}", description="d", type="backend", author=user
+            )
+            project.contributors.add(user)
+    authorization = f"Bearer {RefreshToken.for_user(user).access_token}"
+    connections.close_all()
+
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+    application = get_wsgi_application()
+
+    def get(index):
+        # URL différente à chaque requête : pas de réponse en cache
+        environ = {
+            "PATH_INFO": "/softdesk/api/project/",
+            "QUERY_STRING": f"request={index}",
+            "HTTP_AUTHORIZATION": authorization,
+            "wsgi.input": io.BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        response = application(environ, lambda status, *args: statuses.append(status))
+        b"".join(response)
+        response.close()
+        assert statuses[0].startswith("200"), statuses
+
+    with override_settings(DEBUG=False, ALLOWED_HOSTS=["127.0.0.1"]):
+        for index in range(50):
+            get(-index - 1)
+        opened.clear()
+        start = time.perf_counter()
+        for index in range(requests):
+            get(index)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "conn_max_age": settings.DATABASES["default"]["CONN_MAX_AGE"],
+        "rate": requests / elapsed,
+        "opened": len(opened),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--database-url")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.run:
+        print(json.dumps(run(options.requests)))
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        url = options.database_url or f"sqlite:///{directory}/benchmark.sqlite3"
+        for _ in range(options.repeat):
+            for conn_max_age in ("0", "60"):
+                env = dict(
+                    os.environ, DATABASE_URL=url, DATABASE_CONN_MAX_AGE=conn_max_age
+                )
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        __spec__.name,
+                        "--run",
+                        "--requests",
+                        str(options.requests),
+                    ],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output.splitlines()[-1])
+                rows.append(
+                    [result["conn_max_age"], f"{result['rate']:.0f}", result["opened"]]
+                )
+
+    print(f"{options.requests} requêtes GET /project/ par mesure")
+    print_table(["CONN_MAX_AGE", "requêtes/s", "connexions ouvertes"], rows)
+
+
+if __name__ == "__main__":
+    main()
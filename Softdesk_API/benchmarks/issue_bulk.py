@@ -0,0 +1,95 @@
+"""
+Débit de création d'issues (lignes par seconde) : POST /issue/bulk/ (une
+requête pour plusieurs milliers d'issues, validation des appartenances en
+une requête, bulk_create) face à POST /issue/ appelé pour chaque issue.
+
+Les issues sont créées dans une base de test temporaire, dans un projet
+dont l'auteur et les personnes assignées sont contributeurs.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.issue_bulk [--sizes 100,1000,5000] [--single-rows 200]
+"""
+
+import argparse
+import time
+from datetime import date
+from itertools import count
+
+from .common import print_table, setup, temporary_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,1000,5000")
+    parser.add_argument("--single-rows", type=int, default=200)
+    options = parser.parse_args()
+    sizes = [int(size) for size in options.sizes.split(",")]
+
+    setup()
+    from rest_framework.test import APIClient
+
+    from authentication.models import CustomUser
+    from project.models import Project
+
+    with temporary_database():
+        author = CustomUser.objects.create(
+            username="author", date_of_birth=date(1990, 1, 1)
+        )
+        assignees = [
+            CustomUser.objects.create(
+                username=f"assignee{index}", date_of_birth=date(1990, 1, 1)
+            )
+            for index in range(10)
+        ]
+        project = Project.objects.create(
+            title="Projet", description="d", type="backend", author=author
+        )
+        project.contributors.add(author, *assignees)
+        client = APIClient()
+        client.force_authenticate(author)
+        numbers = count()
+
+        def make_rows(size):
+            return [
+                {
+                    "title": f"Issue {next(numbers)}",
+                    "description": "Le bouton « Valider » ne répond pas.",
+                    "type": "BUG",
+                    "priority": "LOW",
+                    "progress": "To Do",
+                    "project_assigned": project.pk,
+                    "contributor_assigned": assignees[index % len(assignees)].pk,
+                }
+                for index in range(size)
+            ]
+
+        def rate(rows, post):
+            start = time.perf_counter()
+            post(rows)
+            return len(rows) / (time.perf_counter() - start)
+
+        def post_single(rows):
+            for row in rows:
+                response = client.post("/softdesk/api/issue/", row, format="json")
+                assert response.status_code == 201, response.data
+
+        def post_bulk(rows):
+            response = client.post("/softdesk/api/issue/bulk/", rows, format="json")
+            assert response.status_code == 201, response.data
+
+        post_single(make_rows(10))
+        single = max(
+            rate(make_rows(options.single_rows), post_single) for _ in range(3)
+        )
+        rows = [["POST /issue/ (x1)", options.single_rows, f"{single:.0f}", "x1.0"]]
+        for size in sizes:
+            bulk = max(rate(make_rows(size), post_bulk) for _ in range(3))
+            rows.append(
+                ["POST /issue/bulk/", size, f"{bulk:.0f}", f"x{bulk / single:.1f}"]
+            )
+
+    print_table(["point d'entrée", "issues", "issues/s", "gain"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Micro-benchmark de FastJSONRenderer et FastJSONParser face à JSONRenderer
+et JSONParser de DRF, sur des données d'Issues réalistes :
+    - rendu d'une page de la liste des issues (représentation de
+      IssueSerializer : dates en texte ISO 8601) ;
+    - rendu des mêmes issues avec des datetime Python (encodeur de DRF) ;
+    - lecture d'un corps de POST /issue/bulk/.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.json_codec [--rows 500] [--bulk-rows 5000]
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+
+from .common import best_of, print_table, setup
+
+
+def make_issues(count, as_text=True):
+    """
+    Construit des issues comme les renvoie IssueSerializer.
+
+    Args:
+        count (int): Nombre d'issues.
+        as_text (bool): Dates en texte ISO 8601 (sinon datetime).
+
+    Returns:
+        list: Les issues (dictionnaires).
+    """
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    issues = []
+    for index in range(count):
+        created = start + timedelta(seconds=rng.randrange(10**7), microseconds=index)
+        updated = created + timedelta(hours=rng.randrange(100))
+        issues.append(
+            {
+                "id": index + 1,
+                "title": f"Issue {index} : écran de connexion",
+                "description": "Le bouton « Valider » ne répond pas. " * 4,
+                "type": rng.choice(["BUG", "FEATURE", "TASK"]),
+                "priority": rng.choice(["LOW", "MEDIUM", "HIGH"]),
+                "progress": rng.choice(["To Do", "In Progress", "Finished"]),
+                "time_created": (
+                    created.isoformat().replace("+00:00", "Z") if as_text else created
+                ),
+                "updated_at": (
+                    updated.isoformat().replace("+00:00", "Z") if as_text else updated
+                ),
+                "comment_count": rng.randrange(50),
+                "author": rng.randrange(1, 100),
+                "project_assigned": rng.randrange(1, 20),
+                "contributor_assigned": rng.choice([None, rng.randrange(1, 100)]),
+            }
+        )
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--bulk-rows", type=int, default=5000)
+    options = parser.parse_args()
+
+    setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from Softdesk_API.parsers import FastJSONParser
+    from Softdesk_API.renderers import FastJSONRenderer, orjson
+
+    page = {
+        "count": 10 * options.rows,
+        "next": "http://testserver/softdesk/api/issue/?limit=500&offset=500",
+        "previous": None,
+        "results": make_issues(options.rows),
+    }
+    raw = make_issues(options.rows, as_text=False)
+    body = JSONRenderer().render(
+        [
+            {key: issue[key] for key in ("title", "description", "type", "priority")}
+            for issue in make_issues(options.bulk_rows)
+        ]
+    )
+
+    rows = []
+    for label, data in (
+        (f"rendu page ({options.rows})", page),
+        ("rendu datetime", raw),
+    ):
+        drf = best_of(lambda: JSONRenderer().render(data), number=20)
+        fast = best_of(lambda: FastJSONRenderer().render(data), number=20)
+        rows.append(
+            [label, f"{drf * 1000:.2f}", f"{fast * 1000:.2f}", f"x{drf / fast:.1f}"]
+        )
+
+    drf = best_of(lambda: JSONParser().parse(BytesIO(body)), number=10)
+    fast = best_of(lambda: FastJSONParser().parse(BytesIO(body)), number=10)
+    rows.append(
+        [
+            f"lecture bulk ({options.bulk_rows})",
+            f"{drf * 1000:.2f}",
+            f"{fast * 1000:.2f}",
+            f"x{drf / fast:.1f}",
+        ]
+    )
+
+    print(f"orjson : {orjson.__version__ if orjson else 'non installé'}")
+    print_table(["mesure", "DRF (ms)", "rapide (ms)", "gain"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Requêtes SQL et durée par requête de GET /project/ authentifié par un jeton
+JWT : StatelessJWTAuthentication (utilisateur construit à partir du jeton,
+version des jetons en cache) face à JWTAuthentication de simplejwt (lecture
+de l'utilisateur en base à chaque requête).
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.jwt_auth [--requests 500]
+"""
+
+import argparse
+from datetime import date
+from unittest import mock
+
+from .common import (best_of, print_table, setup, temporary_database,
+                     without_response_cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    options = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from authentication.authentication import StatelessJWTAuthentication
+    from authentication.models import CustomUser
+    from authentication.serializers import CustomTokenObtainPairSerializer
+    from project.models import Project
+    from project.views import ProjectViewSet
+
+    rows = []
+    with temporary_database(), without_response_cache():
+        user = CustomUser.objects.create(
+            username="member", date_of_birth=date(1990, 1, 1)
+        )
+        for index in range(10):
+            project = Project.objects.create(
+                title=f"Projet {index}", description="d", type="backend", author=user
+            )
+            project.contributors.add(user)
+        access = CustomTokenObtainPairSerializer.get_token(user).access_token
+        client = Client(headers={"Authorization": f"Bearer {access}"})
+
+        def get():
+            response = client.get("/softdesk/api/project/")
+            assert response.status_code == 200, response.content[:200]
+
+        for authentication_class in (JWTAuthentication, StatelessJWTAuthentication):
+            with mock.patch.object(
+                ProjectViewSet, "authentication_classes", [authentication_class]
+            ):
+                get()
+                with CaptureQueriesContext(connection) as queries:
+                    get()
+                captured = queries.captured_queries
+                user_queries = sum(
+                    f'FROM "{CustomUser._meta.db_table}"' in query["sql"]
+                    for query in captured
+                )
+                duration = best_of(get, number=options.requests // 5)
+                rows.append(
+                    [
+                        authentication_class.__name__,
+                        len(captured),
+                        user_queries,
+                        f"{duration * 1000:.2f}",
+                    ]
+                )
+
+    print_table(
+        ["authentification", "requêtes SQL", "dont utilisateur", "durée (ms)"], rows
+    )
+    saved = rows[0][1] - rows[1][1]
+    print(f"requêtes économisées par requête : {saved}")
+
+
+if __name__ == "__main__":
+    main()
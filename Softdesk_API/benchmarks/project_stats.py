@@ -0,0 +1,140 @@
+"""
+Durée des statistiques d'un projet : compute_project_stats (une requête
+d'agrégat par dimension) face au décompte en Python des issues du projet,
+et GET /project/<pk>/stats/ sans et avec le cache des statistiques.
+
+Le projet et ses issues (types, priorités, avancements, personnes assignées
+et jours de création variés) sont créés dans une base de test temporaire.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.project_stats [--issues 100000] [--days 365]
+"""
+
+import argparse
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+from .common import (best_of, print_table, setup, temporary_database,
+                     without_response_cache)
+
+
+def populate(issues, days):
+    """
+    Crée un projet contenant issues issues, réparties sur days jours.
+
+    Returns:
+        tuple: Le projet et son auteur.
+    """
+    from authentication.models import CustomUser
+    from issue.models import Issue
+    from project.models import Project
+
+    users = [
+        CustomUser.objects.create(
+            username=f"user{index}", date_of_birth=date(1990, 1, 1)
+        )
+        for index in range(10)
+    ]
+    project = Project.objects.create(
+        title="Projet", description="d", type="backend", author=users[0]
+    )
+    project.contributors.add(*users)
+    types = [choice for choice, _ in Issue.TYPE_CHOICES]
+    priorities = [choice for choice, _ in Issue.TYPE_PRIORITY]
+    progresses = [choice for choice, _ in Issue.TYPE_PROGRESS]
+    Issue.objects.bulk_create(
+        (
+            Issue(
+                title=f"Issue {index}",
+                description="Le bouton « Valider » ne répond pas.",
+                type=types[index % len(types)],
+                priority=priorities[index // len(types) % len(priorities)],
+                progress=progresses[index // 9 % len(progresses)],
+                author=users[index % len(users)],
+                contributor_assigned=users[index % 11] if index % 11 < 10 else None,
+                project_assigned=project,
+            )
+            for index in range(issues)
+        ),
+        batch_size=5000,
+    )
+
+    # time_created est rempli par auto_now_add : les jours de création sont
+    # répartis ensuite, par tranches d'identifiants
+    ids = list(Issue.objects.order_by("pk").values_list("pk", flat=True))
+    start = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    size = -(-len(ids) // days)
+    for day in range(days):
+        chunk = ids[day * size : (day + 1) * size]
+        if chunk:
+            Issue.objects.filter(pk__range=(chunk[0], chunk[-1])).update(
+                time_created=start + timedelta(days=day)
+            )
+    return project, users[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--issues", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365)
+    options = parser.parse_args()
+
+    setup()
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from issue.models import Issue
+    from project.stats import compute_project_stats
+
+    with temporary_database(), without_response_cache():
+        project, author = populate(options.issues, options.days)
+        client = APIClient()
+        client.force_authenticate(author)
+        url = f"/softdesk/api/project/{project.pk}/stats/"
+
+        def python_stats():
+            # décompte des mêmes dimensions en parcourant les issues
+            matrix, by_assignee, per_day = Counter(), Counter(), Counter()
+            for issue in Issue.objects.filter(project_assigned=project):
+                matrix[issue.type, issue.priority, issue.progress] += 1
+                by_assignee[issue.contributor_assigned_id] += 1
+                per_day[issue.time_created.date()] += 1
+            return matrix, by_assignee, per_day
+
+        def get_stats(clear):
+            if clear:
+                cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200, response.content
+
+        def measure(func, repeat):
+            with CaptureQueriesContext(connection) as context:
+                func()
+            queries = len(context.captured_queries)
+            return best_of(func, repeat=repeat), queries
+
+        python, python_queries = measure(python_stats, 3)
+        rows = [["décompte en Python", python_queries, f"{python * 1000:.1f}", "x1.0"]]
+        for label, func, repeat in [
+            ("compute_project_stats", lambda: compute_project_stats(project.pk), 5),
+            ("GET /stats/ (cache vide)", lambda: get_stats(True), 5),
+            ("GET /stats/ (cache)", lambda: get_stats(False), 50),
+        ]:
+            duration, queries = measure(func, repeat)
+            rows.append(
+                [
+                    label,
+                    queries,
+                    f"{duration * 1000:.1f}",
+                    f"x{python / duration:.1f}",
+                ]
+            )
+
+    print(f"{options.issues} issues sur {options.days} jours")
+    print_table(["calcul", "requêtes", "ms", "gain"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Débit de sérialisation des listes (lignes par seconde) : lecture values() et
+ValuesRowReader (chemin rapide de ValuesListMixin) face à
+IssueSerializer(many=True) et CommentSerializer(many=True) sur des
+instances de modèles, pour toutes les colonnes et pour la représentation
+compacte des listes (sans description).
+
+Les issues et comments sont créés dans une base de test temporaire ; la
+lecture en base est comprise dans chaque mesure.
+
+Usage (depuis le dossier Softdesk_API) :
+    python -m benchmarks.values_rows [--issues 10000] [--comments 50000]
+"""
+
+import argparse
+from datetime import date
+
+from .common import best_of, print_table, setup, temporary_database
+
+
+def populate(issues, comments):
+    """
+    Crée un projet contenant issues issues et comments comments.
+    """
+    from authentication.models import CustomUser
+    from comment.models import Comment
+    from issue.models import Issue
+    from project.models import Project
+
+    users = [
+        CustomUser.objects.create(
+            username=f"user{index}", date_of_birth=date(1990, 1, 1)
+        )
+        for index in range(10)
+    ]
+    project = Project.objects.create(
+        title="Projet", description="d", type="backend", author=users[0]
+    )
+    project.contributors.add(*users)
+    Issue.objects.bulk_create(
+        (
+            Issue(
+                title=f"Issue {index}",
+                description="Le bouton « Valider » ne répond pas. " * 4,
+                type="BUG",
+                priority="LOW",
+                progress="To Do",
+                author=users[index % len(users)],
+                contributor_assigned=users[(index + 1) % len(users)],
+                project_assigned=project,
+            )
+            for index in range(issues)
+        ),
+        batch_size=5000,
+    )
+    issue_ids = list(Issue.objects.values_list("pk", flat=True))
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                title=f"Comment {index}",
+                description="Reproduit sur la version 2.3.",
+                issue_assigned_id=issue_ids[index % len(issue_ids)],
+                author=users[index % len(users)],
+            )
+            for index in range(comments)
+        ),
+        batch_size=5000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--comments", type=int, default=50000)
+    options = parser.parse_args()
+
+    setup()
+    from comment.models import Comment
+    from comment.serializers import CommentSerializer
+    from issue.models import Issue
+    from issue.serializers import IssueSerializer
+    from Softdesk_API.serializers import ValuesRowReader
+
+    def make_serializer(serializer_class, compact, *args, **kwargs):
+        serializer = serializer_class(*args, **kwargs)
+        if compact:
+            getattr(serializer, "child", serializer).fields.pop("description")
+        return serializer
+
+    rows = []
+    with temporary_database():
+        populate(options.issues, options.comments)
+        for serializer_class, model in (
+            (IssueSerializer, Issue),
+            (CommentSerializer, Comment),
+        ):
+            queryset = model.objects.order_by("pk")
+            total = queryset.count()
+            for compact in (False, True):
+                reader = ValuesRowReader.for_serializer(
+                    make_serializer(serializer_class, compact)
+                )
+                serializer = best_of(
+                    lambda: make_serializer(
+                        serializer_class, compact, queryset.all(), many=True
+                    ).data,
+                    repeat=3,
+                )
+                fast = best_of(
+                    lambda: reader.represent(queryset.values(*reader.columns)),
+                    repeat=3,
+                )
+                rows.append(
+                    [
+                        serializer_class.__name__,
+                        "compacte" if compact else "complète",
+                        total,
+                        f"{total / serializer:.0f}",
+                        f"{total / fast:.0f}",
+                        f"x{serializer / fast:.1f}",
+                    ]
+                )
+
+    print_table(
+        [
+            "serializer",
+            "représentation",
+            "lignes",
+            "serializer (lignes/s)",
+            "values() (lignes/s)",
+            "gain",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from Softdesk_API.pagination import EstimatedCountPaginator
+
 from .models import Comment
 
 
@@ -10,6 +12,10 @@ class CommentAdmin(admin.ModelAdmin):
 
     Attributes:
         list_display (tuple): Liste des champs à afficher dans la liste des utilisateurs de l'interface admin.
+        list_select_related (tuple): Relations chargées par jointure avec la liste (pas de requête par ligne).
+        autocomplete_fields (tuple): Clés étrangères saisies par autocomplétion au lieu d'un <select> complet.
+        show_full_result_count (bool): Pas de second comptage de la table entière lors d'un filtrage.
+        paginator (class): Paginator utilisant un nombre de lignes estimé pour les grandes tables.
     """
 
     list_display = (
@@ -19,3 +25,7 @@ class CommentAdmin(admin.ModelAdmin):
         "time_created",
         "id",
     )
+    list_select_related = ("author", "issue_assigned")
+    autocomplete_fields = ("author", "issue_assigned")
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CommentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "comment"
+
+    def ready(self):
+        # Connexion des signaux d'invalidation des réponses en cache
+        from . import signals  # noqa: F401
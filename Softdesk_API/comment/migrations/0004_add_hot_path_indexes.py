@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0003_alter_comment_title"),
+        ("issue", "0005_alter_issue_title"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["issue_assigned", "time_created"],
+                name="comment_issue_created_idx",
+            ),
+        ),
+    ]
@@ -4,6 +4,28 @@ from django.db import models
 from issue.models import Issue
 
 
+class CommentQuerySet(models.QuerySet):
+    """
+    QuerySet personnalisé pour le modèle Comment.
+    """
+
+    def visible_to(self, user):
+        """
+        Retourne les comments des issues dont l'utilisateur est contributeur
+        du projet concerné.
+
+        L'appartenance est exprimée par une jointure
+        comment -> issue -> table des contributeurs du projet.
+
+        Args:
+            user (CustomUser | TokenUser): L'utilisateur connecté.
+
+        Returns:
+            QuerySet: Les comments visibles par l'utilisateur.
+        """
+        return self.filter(issue_assigned__project_assigned__contributors=user.pk)
+
+
 class Comment(models.Model):
     """
     Modèle représentant un commentaire sur un problème (issue).
@@ -13,6 +35,7 @@ class Comment(models.Model):
         description (str): Description détaillée du commentaire.
         issue_assigned (ForeignKey): Problème associé auquel le commentaire est lié.
         time_created (DateTimeField): Date et heure de création du commentaire.
+        updated_at (DateTimeField): Date et heure de dernière modification.
     """
 
     author = models.ForeignKey(
@@ -35,5 +58,18 @@ class Comment(models.Model):
 
     time_created = models.DateTimeField(auto_now_add=True)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # liste des comments d'une issue triés par date de création
+            models.Index(
+                fields=["issue_assigned", "time_created"],
+                name="comment_issue_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
@@ -1,12 +1,15 @@
 from rest_framework import serializers
 
+from Softdesk_API.serializers import SparseFieldsetSerializerMixin
+
 from .models import Comment
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour le modèle Comment.
 
+    Les champs renvoyés peuvent être limités par la vue (sparse fieldsets).
     """
 
     class Meta:
@@ -43,3 +46,39 @@ class CommentPostSerializer(serializers.ModelSerializer):
 
         model = Comment
         exclude = ("author",)
+
+
+class CommentBulkSerializer(serializers.ModelSerializer):
+    """
+    Serializer d'une ligne de création de Comments en masse.
+
+    L'Issue est validée comme un simple identifiant : l'existence des Issues,
+    l'appartenance aux contributeurs et l'unicité des titres sont vérifiées
+    pour toutes les lignes à la fois par la vue.
+    """
+
+    issue_assigned = serializers.IntegerField()
+
+    class Meta:
+        """
+        Métadonnées du serializer CommentBulkSerializer.
+
+        Attributes:
+            model (class): Classe du modèle à sérialiser (Comment).
+            exclude (tuple): Liste des champs du modèle à exclure dans la sérialisation.
+            extra_kwargs (dict): Options supplémentaires pour les champs spécifiques.
+        """
+
+        model = Comment
+        exclude = ("author",)
+        extra_kwargs = {
+            "title": {"validators": []}
+        }  # unicité vérifiée en une seule requête par la vue
+
+
+class CommentBulkDeleteSerializer(serializers.Serializer):
+    """
+    Serializer de la requête de suppression de Comments en masse.
+    """
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
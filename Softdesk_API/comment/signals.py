@@ -0,0 +1,46 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from issue.models import Issue
+from Softdesk_API.cache import bump_versions
+
+from .models import Comment
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    """
+    Invalide les réponses en cache dépendant des comments.
+
+    L'invalidation a lieu après la validation de la transaction, qui met
+    aussi à jour les compteurs dénormalisés.
+    """
+    transaction.on_commit(partial(bump_versions, "comment"))
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleting(sender, instance, **kwargs):
+    """
+    Met à jour les compteurs des issues après la suppression d'un
+    utilisateur : ses comments sont supprimés en cascade, sans passer par
+    CommentViewSet.perform_destroy.
+
+    Les compteurs sont mis à jour après la validation de la transaction ; ceux
+    des issues supprimées avec l'utilisateur ne sont plus modifiés.
+    """
+    comments = {
+        row["issue_assigned"]: -row["comments"]
+        for row in Comment.objects.filter(author=instance.pk)
+        .order_by()
+        .values("issue_assigned")
+        .annotate(comments=Count("pk"))
+    }
+
+    if comments:
+        transaction.on_commit(partial(Issue.objects.add_comment_counts, comments))
@@ -0,0 +1,276 @@
+import json
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from rest_framework.test import APITestCase
+
+from issue.models import Issue
+from Softdesk_API.testing import (API, QueryPlanMixin, create_comment,
+                                  create_issue, create_project, create_user)
+
+from .models import Comment
+
+
+class CommentCounterTests(APITestCase):
+    """
+    Compteurs de comments des issues.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.owner = create_user("owner")
+        self.member = create_user("member")
+        project = create_project("P", self.owner, self.member)
+        self.issue = create_issue("I", project, self.owner)
+        for index, author in enumerate([self.owner, self.member, self.member]):
+            create_comment(f"C{index}", self.issue, author)
+        call_command("recompute_counters", stdout=StringIO())
+
+    def test_user_delete_updates_issue_counters(self):
+        self.client.force_authenticate(self.member)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"{API}auth/users/{self.member.pk}/")
+        self.assertEqual(response.status_code, 204)
+
+        self.issue.refresh_from_db()
+        self.assertEqual(Comment.objects.filter(issue_assigned=self.issue).count(), 1)
+        self.assertEqual(self.issue.comment_count, 1)
+
+
+class CommentBulkTests(APITestCase):
+    """
+    Création et suppression de comments en masse (POST et DELETE /comment/bulk/).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        self.other = create_user("other")
+        self.project = create_project("P", self.user, self.other)
+        self.issue = create_issue("I", self.project, self.user)
+        self.client.force_authenticate(self.user)
+
+    def row(self, title, **fields):
+        return {
+            "title": title,
+            "description": "serveur",
+            "issue_assigned": self.issue.pk,
+            **fields,
+        }
+
+    def search_comments(self):
+        response = self.client.get(f"{API}search/?q=serveur")
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(
+            result["id"]
+            for result in response.json()["results"]
+            if result["kind"] == "comment"
+        )
+
+    def test_create(self):
+        rows = [self.row(f"C{index}") for index in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{API}comment/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            [comment["title"] for comment in response.data], ["C0", "C1", "C2"]
+        )
+
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 3)
+        self.assertEqual(
+            self.search_comments(), sorted(comment["id"] for comment in response.data)
+        )
+
+    def test_row_errors(self):
+        create_comment("Pris", self.issue, self.user)
+        hidden = create_issue("H", create_project("H", self.other), self.other)
+        rows = [
+            self.row("C0"),
+            self.row("C1", issue_assigned="x"),
+            "pas un comment",
+            {"description": "d"},
+            self.row("C0"),
+            self.row("Pris"),
+            self.row("C2", issue_assigned=0),
+            self.row("C3", issue_assigned=hidden.pk),
+        ]
+        response = self.client.post(f"{API}comment/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = {row["index"]: row["errors"] for row in response.json()["errors"]}
+        self.assertEqual(list(errors), [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(list(errors[1]), ["issue_assigned"])
+        self.assertEqual(list(errors[2]), ["non_field_errors"])
+        self.assertEqual(set(errors[3]), {"title", "issue_assigned"})
+        self.assertEqual(list(errors[4]), ["title"])
+        self.assertEqual(list(errors[5]), ["title"])
+        self.assertEqual(list(errors[6]), ["issue_assigned"])
+        self.assertEqual(list(errors[7]), ["author"])
+
+        # aucune ligne n'est créée, pas même la première, valide
+        self.assertEqual(
+            list(Comment.objects.values_list("title", flat=True)), ["Pris"]
+        )
+
+    def test_create_rollback(self):
+        backend = mock.Mock()
+        backend.index.side_effect = IntegrityError("index")
+        rows = [self.row(f"C{index}") for index in range(3)]
+        with mock.patch("comment.views.get_search_backend", return_value=backend):
+            response = self.client.post(f"{API}comment/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        self.issue.refresh_from_db()
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(self.issue.comment_count, 0)
+
+    def test_delete_statuses(self):
+        mine = [
+            create_comment(f"M{index}", self.issue, self.user) for index in range(2)
+        ]
+        theirs = create_comment("T", self.issue, self.other)
+        stranger = create_user("stranger")
+        hidden = create_comment(
+            "H", create_issue("H", create_project("H", stranger), stranger), stranger
+        )
+        for comment in Comment.objects.all():
+            comment.description = "serveur"
+            comment.save()
+        call_command("recompute_counters", stdout=StringIO())
+        ids = [mine[0].pk, theirs.pk, hidden.pk, 0, mine[1].pk]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                f"{API}comment/bulk/", {"ids": ids}, format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": mine[0].pk, "status": "deleted"},
+                {"id": theirs.pk, "status": "forbidden"},
+                {"id": hidden.pk, "status": "not_found"},
+                {"id": 0, "status": "not_found"},
+                {"id": mine[1].pk, "status": "deleted"},
+            ],
+        )
+
+        self.assertEqual(
+            set(Comment.objects.values_list("pk", flat=True)), {theirs.pk, hidden.pk}
+        )
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 1)
+        self.assertEqual(self.search_comments(), [theirs.pk])
+
+    def test_delete_rollback(self):
+        comments = [
+            create_comment(f"M{index}", self.issue, self.user) for index in range(2)
+        ]
+        call_command("recompute_counters", stdout=StringIO())
+        with mock.patch.object(
+            type(Issue.objects), "add_comment_counts", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                self.client.delete(
+                    f"{API}comment/bulk/",
+                    {"ids": [comment.pk for comment in comments]},
+                    format="json",
+                )
+
+        self.issue.refresh_from_db()
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertEqual(self.issue.comment_count, 2)
+
+
+class CommentSchemaTests(APITestCase):
+    """
+    Documentation Swagger des actions de CommentViewSet.
+    """
+
+    def test_bulk_responses(self):
+        response = self.client.get("/swagger/?format=openapi")
+        self.assertEqual(response.status_code, 200)
+
+        bulk = json.loads(response.content)["paths"]["/comment/bulk/"]["post"]
+        self.assertEqual(set(bulk["responses"]), {"201", "400", "401"})
+        self.assertEqual(bulk["parameters"][0]["schema"]["type"], "array")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN de SQLite")
+class CommentQueryPlanTests(QueryPlanMixin, APITestCase):
+    """
+    Plans d'exécution des listes de comments.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        other = create_user("other")
+        project = create_project("P", self.user)
+        self.issue = create_issue("I", project, self.user)
+        other_issue = create_issue("O", create_project("O", other), other)
+        for index in range(3):
+            create_comment(f"C{index}", self.issue, self.user)
+            create_comment(f"O{index}", other_issue, other)
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        plans = self.assertUsesIndexes("comment/")
+        self.assertIn("comment_issue_created_idx", str(plans))
+
+    def test_issue_comments(self):
+        plans = self.assertUsesIndexes(
+            f"comment/issue-comments/?issue_id={self.issue.pk}"
+        )
+        self.assertIn("comment_issue_created_idx", str(plans))
+
+
+class CommentWriteQueryCountTests(APITestCase):
+    """
+    Nombre de requêtes des écritures de CommentViewSet : l'objet n'est chargé
+    qu'une fois, pour la permission et pour l'écriture (voir
+    Softdesk_API.permissions).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user("author")
+        self.other = create_user("other")
+        self.project = create_project("P", self.author, self.other)
+        self.issue = create_issue("I", self.project, self.author)
+        self.comment = create_comment("C", self.issue, self.author)
+        self.url = f"{API}comment/{self.comment.pk}/"
+        self.client.force_authenticate(self.author)
+
+    def test_update(self):
+        # comment, unicité du titre, issue, modification (savepoint, comment, document de recherche)
+        with self.assertNumQueries(7):
+            response = self.client.put(
+                self.url,
+                {"title": "C", "description": "x", "issue_assigned": self.issue.pk},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_partial_update(self):
+        # comment, modification (savepoint, comment, document de recherche)
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, {"description": "y"}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_destroy(self):
+        # comment, compteur de l'issue, suppression (savepoint, comment, document de recherche)
+        with self.assertNumQueries(6):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    def test_not_author(self):
+        # comment seulement, sans écriture
+        self.client.force_authenticate(self.other)
+        for method in ("put", "patch", "delete"):
+            with self.subTest(method=method), self.assertNumQueries(1):
+                response = getattr(self.client, method)(self.url, {}, format="json")
+            self.assertEqual(response.status_code, 403)
@@ -1,18 +1,39 @@
+from collections import Counter
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
 
 from issue.models import Issue
-from project.models import Project
+from project.membership import get_membership
+from search.backends import get_search_backend
+from search.documents import comment_document
+from Softdesk_API.async_views import AsyncReadView
+from Softdesk_API.cache import CachedResponseMixin, bump_versions
+from Softdesk_API.mixins import (ConditionalGetMixin, SparseFieldsetsMixin,
+                                 StreamingListMixin, ValuesListMixin)
 
 from .models import Comment
 from .permissions import IsAuthenticatedAndIsAuthor
-from .serializers import CommentPostSerializer, CommentSerializer
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+from .serializers import (CommentBulkDeleteSerializer, CommentBulkSerializer,
+                          CommentPostSerializer, CommentSerializer)
+
+
+class CommentViewSet(
+    SparseFieldsetsMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    ValuesListMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet,
+):
     """
     Gestion des Objets Comment
 
@@ -21,19 +42,22 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     """
 
+    # actions acceptant ?fields=, et actions de liste en représentation compacte
+    sparse_actions = ("list", "retrieve", "issue_comments")
+    list_actions = ("list", "issue_comments")
+    # groupes de données dont dépendent les réponses en cache
+    cache_dependencies = ("project", "issue", "comment")
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedAndIsAuthor]
 
+    # nombre maximal de comments par requête de création ou suppression en masse
+    bulk_max_size = 5000
+
     # Liste des Comments dont l'utilisateur est contributeur du projet concerné
     def get_queryset(self):
 
         if self.request.user.is_authenticated:
-            user = self.request.user
-            projects = Project.objects.filter(contributors=user)
-            project_ids = projects.values_list("id", flat=True)
-            issues = Issue.objects.filter(project_assigned__id__in=project_ids)
-            issues_ids = issues.values_list("id", flat=True)
-            return Comment.objects.filter(issue_assigned__id__in=issues_ids)
+            return Comment.objects.visible_to(self.request.user)
         else:
             return Comment.objects.none()
 
@@ -63,15 +87,13 @@ class CommentViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.validated_data["author"] = request.user
+        serializer.validated_data["author_id"] = request.user.id
 
         # Vérifie si l'auteur est dans la liste des contributeurs du projet concerné
         issue = serializer.validated_data["issue_assigned"]
-        project = issue.project_assigned
-        contributors_project_list = project.contributors.all()
-
-        comment_author = serializer.validated_data["author"]
-        if comment_author not in contributors_project_list:
+        if not get_membership(request).is_contributor(
+            issue.project_assigned_id, serializer.validated_data["author_id"]
+        ):
             return Response(
                 {
                     "error": "L'auteur du Comment doit etre dans les contributeurs du projet concerné."
@@ -79,7 +101,9 @@ class CommentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            Issue.objects.add_comment_counts({issue.id: 1})
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -165,11 +189,38 @@ class CommentViewSet(viewsets.ModelViewSet):
 
         return super().destroy(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        """
+        Enregistre la modification et met à jour le compteur des Issues
+        lorsque le Comment change d'Issue.
+        """
+        previous_issue_id = serializer.instance.issue_assigned_id
+        with transaction.atomic():
+            comment = serializer.save()
+            comments = Counter()
+            comments[previous_issue_id] -= 1
+            comments[comment.issue_assigned_id] += 1
+            Issue.objects.add_comment_counts(comments)
+
+    def perform_destroy(self, instance):
+        """
+        Supprime le Comment et met à jour le compteur de son Issue.
+        """
+        with transaction.atomic():
+            Issue.objects.add_comment_counts({instance.issue_assigned_id: -1})
+            instance.delete()
+
     @swagger_auto_schema(
         manual_parameters=[
             openapi.Parameter(
                 "issue_id", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
-            )
+            ),
+            openapi.Parameter(
+                "stream",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description="Renvoie toute la liste en flux continu, sans pagination.",
+            ),
         ],
         responses={
             status.HTTP_200_OK: CommentSerializer(many=True),
@@ -188,9 +239,32 @@ class CommentViewSet(viewsets.ModelViewSet):
 
         Args:
             issue_id (int): L'identifiant de l' Issue.
+            stream (bool): Si true, tous les comments sont envoyés en flux continu.
 
         Returns:
-            QuerySet: Le queryset des comments de l'issue spécifiée.
+            Response: La page des comments de l'issue spécifiée, ou le flux complet.
+        """
+        issue_id, error = self.check_issue_access(request)
+        if error is not None:
+            return error
+
+        # Récupère les Comments de l'Issue spécifié, page par page
+        issues_comments = self.filter_queryset(
+            Comment.objects.filter(issue_assigned_id=issue_id)
+        )
+        return self.get_conditional_list_response(
+            partial(self.get_list_response, issues_comments)
+        )
+
+    def check_issue_access(self, request):
+        """
+        Vérifie le paramètre issue_id et l'accès de l'utilisateur à l'Issue.
+
+        Args:
+            request (Request): La requête en cours.
+
+        Returns:
+            tuple: (issue_id, None), ou (None, Response d'erreur 400, 403 ou 404).
         """
         issue_id = request.query_params.get("issue_id")
 
@@ -198,27 +272,240 @@ class CommentViewSet(viewsets.ModelViewSet):
         try:
             issue_id = int(issue_id)
         except (TypeError, ValueError):
-            return Response(
+            return None, Response(
                 {"error": "L'identifiant de l'Issue doit être un entier."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not Issue.objects.filter(id=issue_id).exists():
-            return Response(
+        project_id = (
+            Issue.objects.filter(id=issue_id)
+            .values_list("project_assigned_id", flat=True)
+            .first()
+        )
+        if project_id is None:
+            return None, Response(
                 {"error": "Issue non trouvé."}, status=status.HTTP_404_NOT_FOUND
             )
 
         # Vérifie si l'utilisateur est contributeur du projet concerné
-        issue_project = Issue.objects.get(id=issue_id).project_assigned
-        if not issue_project.contributors.filter(id=request.user.id).exists():
-            return Response(
+        if not get_membership(request).is_contributor(project_id, request.user.id):
+            return None, Response(
                 {
                     "error": "Vous n'êtes pas autorisé à accéder aux Comments de ce projet."
                 },
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Récupère les Comments de l'Issue spécifié
-        issues_comments = Comment.objects.filter(issue_assigned_id=issue_id)
-        serializer = self.get_serializer(issues_comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return issue_id, None
+
+    @swagger_auto_schema(
+        request_body=CommentBulkSerializer(many=True),
+        responses={
+            status.HTTP_201_CREATED: CommentSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: "Erreurs de validation, par ligne",
+            status.HTTP_401_UNAUTHORIZED: "Authentification non trouvée",
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Création de Comments en masse.
+
+        Le corps de la requête est une liste de Comments. Les règles de create
+        s'appliquent à chaque ligne, mais sont vérifiées pour toutes les lignes
+        à la fois : une requête pour les Issues et leur projet, une pour les
+        contributeurs et une pour l'unicité des titres.
+        Les Comments sont insérés avec bulk_create dans une seule transaction :
+        si une ligne est invalide, aucun Comment n'est créé et les erreurs sont
+        renvoyées ligne par ligne.
+
+        Args:
+            request (HttpRequest): La requête HTTP contenant la liste des Comments.
+
+        Returns:
+            Response: Réponse HTTP contenant les Comments créés ou les erreurs par ligne.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"error": "Le corps de la requête doit être une liste de comments."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > self.bulk_max_size:
+            return Response(
+                {"error": f"Au plus {self.bulk_max_size} comments par requête."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # validation des champs ligne par ligne, sans requête, par un seul
+        # serializer : ses champs ne sont construits qu'une fois
+        row_serializer = CommentBulkSerializer()
+        valid = []
+        errors = []
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, row_serializer.run_validation(row)))
+                errors.append({})
+            except ValidationError as exc:
+                errors.append(dict(as_serializer_error(exc)))
+
+        # vérifications ensemblistes : issues et projets, contributeurs, titres
+        issue_projects = dict(
+            Issue.objects.filter(
+                id__in={data["issue_assigned"] for _, data in valid}
+            ).values_list("id", "project_assigned_id")
+        )
+        membership = get_membership(request)
+        membership.prefetch(issue_projects.values())
+        titles = [data["title"] for _, data in valid]
+        taken_titles = set(
+            Comment.objects.filter(title__in=titles).values_list("title", flat=True)
+        )
+
+        seen_titles = set()
+        for index, data in valid:
+            project_id = issue_projects.get(data["issue_assigned"])
+            if project_id is None:
+                errors[index]["issue_assigned"] = ["Issue non trouvé."]
+            elif not membership.is_contributor(project_id, request.user.id):
+                errors[index]["author"] = [
+                    "L'auteur du Comment doit etre dans les contributeurs du projet concerné."
+                ]
+            if data["title"] in taken_titles or data["title"] in seen_titles:
+                errors[index]["title"] = ["Un comment avec ce titre existe déjà."]
+            seen_titles.add(data["title"])
+
+        if any(errors):
+            return Response(
+                {
+                    "errors": [
+                        {"index": index, "errors": row_errors}
+                        for index, row_errors in enumerate(errors)
+                        if row_errors
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        comments = []
+        for _, data in valid:
+            data = dict(data)
+            data["issue_assigned_id"] = data.pop("issue_assigned")
+            comments.append(Comment(author_id=request.user.id, **data))
+
+        try:
+            with transaction.atomic():
+                comments = Comment.objects.bulk_create(comments, batch_size=500)
+                Issue.objects.add_comment_counts(
+                    Counter(comment.issue_assigned_id for comment in comments)
+                )
+                # index de recherche, dans la même transaction
+                get_search_backend().index(map(comment_document, comments))
+            # bulk_create n'envoie pas de signal post_save
+            bump_versions("comment")
+        except IntegrityError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = CommentSerializer(comments, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        request_body=CommentBulkDeleteSerializer,
+        responses={
+            status.HTTP_200_OK: "Statut de suppression de chaque Comment",
+            status.HTTP_400_BAD_REQUEST: "Erreur de validation",
+            status.HTTP_401_UNAUTHORIZED: "Authentification non trouvée",
+        },
+    )
+    @bulk.mapping.delete
+    def bulk_delete(self, request):
+        """
+        Suppression de Comments en masse.
+
+        Le corps de la requête contient la liste des identifiants à supprimer.
+        Les Comments et leur projet sont lus en une seule requête ; seuls ceux
+        dont l'utilisateur connecté est l'auteur, dans un projet dont il est
+        contributeur, sont supprimés, dans une seule transaction.
+
+        Chaque identifiant reçoit un statut : "deleted", "forbidden"
+        (l'utilisateur n'est pas l'auteur) ou "not_found".
+
+        Args:
+            request (HttpRequest): La requête HTTP contenant les identifiants.
+
+        Returns:
+            Response: Réponse HTTP contenant le statut de chaque Comment.
+        """
+        serializer = CommentBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        if len(ids) > self.bulk_max_size:
+            return Response(
+                {"error": f"Au plus {self.bulk_max_size} comments par requête."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = Comment.objects.filter(id__in=ids).values_list(
+            "id",
+            "author_id",
+            "issue_assigned_id",
+            "issue_assigned__project_assigned_id",
+        )
+        rows = {
+            comment_id: (author_id, issue_id, project_id)
+            for comment_id, author_id, issue_id, project_id in rows
+        }
+        membership = get_membership(request)
+        membership.prefetch(project_id for _, _, project_id in rows.values())
+
+        statuses = {}
+        for comment_id in ids:
+            if comment_id not in rows:
+                statuses[comment_id] = "not_found"
+                continue
+            author_id, _, project_id = rows[comment_id]
+            if not membership.is_contributor(project_id, request.user.id):
+                statuses[comment_id] = "not_found"
+            elif author_id != request.user.id:
+                statuses[comment_id] = "forbidden"
+            else:
+                statuses[comment_id] = "deleted"
+
+        deletable = [
+            pk for pk, comment_status in statuses.items() if comment_status == "deleted"
+        ]
+        if deletable:
+            with transaction.atomic():
+                Comment.objects.filter(id__in=deletable).delete()
+                deleted = Counter(rows[comment_id][1] for comment_id in deletable)
+                Issue.objects.add_comment_counts(
+                    {issue_id: -count for issue_id, count in deleted.items()}
+                )
+
+        return Response(
+            {
+                "results": [
+                    {"id": comment_id, "status": comment_status}
+                    for comment_id, comment_status in statuses.items()
+                ]
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class CommentAsyncView(AsyncReadView):
+    """
+    Lectures asynchrones des Comments (voir AsyncReadView) : list, retrieve et
+    issue_comments.
+    """
+
+    viewset_class = CommentViewSet
+
+    async def issue_comments(self, viewset, request, *args, **kwargs):
+        issue_id, error = await sync_to_async(viewset.check_issue_access)(request)
+        if error is not None:
+            return error
+        return await self.get_page_response(
+            viewset,
+            viewset.filter_queryset(Comment.objects.filter(issue_assigned_id=issue_id)),
+        )
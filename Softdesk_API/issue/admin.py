@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from Softdesk_API.pagination import EstimatedCountPaginator
+
 from .models import Issue
 
 
@@ -10,6 +12,12 @@ class IssueAdmin(admin.ModelAdmin):
 
     Attributes:
         list_display (tuple): Liste des champs à afficher dans la liste des utilisateurs de l'interface admin.
+        list_select_related (tuple): Relations chargées par jointure avec la liste (pas de requête par ligne).
+        list_filter (tuple): Filtres de la liste, sur des champs indexés.
+        search_fields (tuple): Champs de recherche, utilisés aussi par l'autocomplétion des Comments.
+        autocomplete_fields (tuple): Clés étrangères saisies par autocomplétion au lieu d'un <select> complet.
+        show_full_result_count (bool): Pas de second comptage de la table entière lors d'un filtrage.
+        paginator (class): Paginator utilisant un nombre de lignes estimé pour les grandes tables.
     """
 
     list_display = (
@@ -19,6 +27,13 @@ class IssueAdmin(admin.ModelAdmin):
         "project_assigned",
         "priority",
         "progress",
+        "comment_count",
         "time_created",
         "id",
     )
+    list_select_related = ("author", "project_assigned")
+    list_filter = ("type", "priority", "progress")
+    search_fields = ("title",)
+    autocomplete_fields = ("author", "project_assigned", "contributor_assigned")
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
@@ -0,0 +1,79 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .serializers import IssueFilterSerializer
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """
+    Filtres et tri de la liste des Issues (voir IssueFilterSerializer).
+
+    Les paramètres sont validés par IssueFilterSerializer : une valeur
+    invalide ou un tri non indexé renvoie une erreur 400.
+    Avec la pagination keyset, le tri (time_created, id) de la pagination
+    remplace le paramètre ordering.
+    """
+
+    # paramètre -> lookup du queryset
+    lookups = {
+        "type": "type",
+        "priority": "priority",
+        "progress": "progress",
+        "contributor_assigned": "contributor_assigned_id",
+        "author": "author_id",
+        "time_created_after": "time_created__gte",
+        "time_created_before": "time_created__lt",
+    }
+
+    descriptions = {
+        "type": "Type de l'issue.",
+        "priority": "Priorité de l'issue.",
+        "progress": "Avancement de l'issue.",
+        "contributor_assigned": "Identifiant du contributeur assigné.",
+        "author": "Identifiant de l'auteur.",
+        "time_created_after": "Issues créées à partir de cette date (ISO 8601).",
+        "time_created_before": "Issues créées avant cette date (ISO 8601).",
+        "ordering": "Tri : time_created, -time_created, id ou -id.",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = IssueFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        queryset = queryset.filter(
+            **{
+                lookup: params[name]
+                for name, lookup in self.lookups.items()
+                if name in params
+            }
+        )
+        if "ordering" in params:
+            queryset = queryset.order_by(
+                *IssueFilterSerializer.ORDERINGS[params["ordering"]]
+            )
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        parameters = []
+        for name, field in IssueFilterSerializer().fields.items():
+            schema = {
+                "type": (
+                    "integer"
+                    if name in ("author", "contributor_assigned")
+                    else "string"
+                )
+            }
+            if hasattr(field, "choices"):
+                schema["enum"] = list(field.choices)
+            elif name.startswith("time_created"):
+                schema["format"] = "date-time"
+            parameters.append(
+                {
+                    "name": name,
+                    "in": "query",
+                    "required": False,
+                    "description": self.descriptions[name],
+                    "schema": schema,
+                }
+            )
+        return parameters
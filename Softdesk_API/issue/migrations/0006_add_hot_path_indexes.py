@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issue", "0005_alter_issue_title"),
+        ("project", "0005_alter_project_description_alter_project_title"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project_assigned", "time_created"],
+                name="issue_project_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issue", "0006_add_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="issue",
+            name="priority",
+            field=models.CharField(
+                choices=[("LOW", "LOW"), ("MEDIUM", "MEDIUM"), ("HIGH", "HIGH")],
+                db_index=True,
+                max_length=20,
+                verbose_name="Priority",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issue",
+            name="progress",
+            field=models.CharField(
+                choices=[
+                    ("To Do", "To Do"),
+                    ("In Progress", "In Progress"),
+                    ("Finished", "Finished"),
+                ],
+                db_index=True,
+                max_length=20,
+                verbose_name="Progress",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issue",
+            name="type",
+            field=models.CharField(
+                choices=[("BUG", "BUG"), ("FEATURE", "FEATURE"), ("TASK", "TASK")],
+                db_index=True,
+                max_length=20,
+            ),
+        ),
+    ]
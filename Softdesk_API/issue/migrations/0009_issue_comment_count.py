@@ -0,0 +1,41 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:45
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_counts(apps, schema_editor):
+    """
+    Initialise le compteur de comments des issues existantes.
+    """
+    Issue = apps.get_model("issue", "Issue")
+    Comment = apps.get_model("comment", "Comment")
+
+    comments = (
+        Comment.objects.filter(issue_assigned=OuterRef("pk"))
+        .order_by()
+        .values("issue_assigned")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Issue.objects.update(
+        comment_count=Coalesce(Subquery(comments, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issue", "0008_issue_updated_at"),
+        ("comment", "0005_comment_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,43 @@
 from django.conf import settings
 from django.db import models
 
-from project.models import Project
+from project.models import CounterFieldsMixin, Project, add_to_counters
 
 
-class Issue(models.Model):
+class IssueQuerySet(models.QuerySet):
+    """
+    QuerySet personnalisé pour le modèle Issue.
+    """
+
+    def visible_to(self, user):
+        """
+        Retourne les issues des projets dont l'utilisateur est contributeur.
+
+        L'appartenance est exprimée par une jointure
+        issue -> table des contributeurs du projet.
+
+        Args:
+            user (CustomUser | TokenUser): L'utilisateur connecté.
+
+        Returns:
+            QuerySet: Les issues visibles par l'utilisateur.
+        """
+        return self.filter(project_assigned__contributors=user.pk)
+
+    def add_comment_counts(self, comments):
+        """
+        Met à jour le compteur de comments de plusieurs issues (voir add_to_counters).
+
+        Args:
+            comments (dict): {issue_id: variation du nombre de comments}.
+
+        Returns:
+            int: Le nombre d'issues modifiées.
+        """
+        return add_to_counters(self, {"comment_count": comments})
+
+
+class Issue(CounterFieldsMixin, models.Model):
     """
     Modèle représentant un problème (issue) dans un projet.
     Attributes:
@@ -20,6 +53,8 @@ class Issue(models.Model):
         priority (str): Priorité du problème (LOW, MEDIUM, HIGH).
         progress (str): État d'avancement du problème (To Do, In Progress, Finished).
         time_created (DateTimeField): Date et heure de création du problème.
+        updated_at (DateTimeField): Date et heure de dernière modification.
+        comment_count (int): Nombre de comments de l'issue (compteur dénormalisé).
     """
 
     TYPE_CHOICES = [
@@ -37,6 +72,8 @@ class Issue(models.Model):
         ("In Progress", "In Progress"),
         ("Finished", "Finished"),
     ]
+    # une issue est ouverte tant que son avancement n'est pas celui-ci
+    CLOSED_PROGRESS = "Finished"
     title = models.CharField(max_length=128, unique=True)
     description = models.TextField(max_length=2048, blank=True)
     author = models.ForeignKey(
@@ -58,14 +95,46 @@ class Issue(models.Model):
         null=True,
         on_delete=models.SET_NULL,
     )
-    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, db_index=True)
     priority = models.CharField(
-        max_length=20, choices=TYPE_PRIORITY, verbose_name="Priority"
+        max_length=20, choices=TYPE_PRIORITY, verbose_name="Priority", db_index=True
     )
     progress = models.CharField(
-        max_length=20, choices=TYPE_PROGRESS, verbose_name="Progress"
+        max_length=20, choices=TYPE_PROGRESS, verbose_name="Progress", db_index=True
     )
     time_created = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("comment_count",)
+
+    objects = IssueQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # liste des issues d'un projet triées par date de création
+            models.Index(
+                fields=["project_assigned", "time_created"],
+                name="issue_project_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # projet lu en base, pour invalider aussi ses statistiques
+        # si l'issue change de projet
+        instance._loaded_project_assigned_id = instance.__dict__.get(
+            "project_assigned_id"
+        )
+        return instance
+
+    @property
+    def is_open(self):
+        """
+        Indique si l'issue n'est pas terminée.
+        """
+        return self.progress != self.CLOSED_PROGRESS
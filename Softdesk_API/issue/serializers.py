@@ -1,12 +1,15 @@
 from rest_framework import serializers
 
+from Softdesk_API.serializers import SparseFieldsetSerializerMixin
+
 from .models import Issue
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour le modèle Issue.
 
+    Les champs renvoyés peuvent être limités par la vue (sparse fieldsets).
     """
 
     class Meta:
@@ -47,3 +50,63 @@ class IssuePostSerializer(serializers.ModelSerializer):
 
         model = Issue
         exclude = ("author",)
+
+
+class IssueBulkSerializer(serializers.ModelSerializer):
+    """
+    Serializer d'une ligne de création d'Issues en masse.
+
+    Les relations sont validées comme de simples identifiants : l'existence
+    des projets, l'appartenance aux contributeurs et l'unicité des titres sont
+    vérifiées pour toutes les lignes à la fois par la vue.
+    """
+
+    project_assigned = serializers.IntegerField()
+    contributor_assigned = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        """
+        Métadonnées du serializer IssueBulkSerializer.
+
+        Attributes:
+            model (class): Classe du modèle à sérialiser (Issue).
+            exclude (tuple): Liste des champs du modèle à exclure dans la sérialisation.
+            extra_kwargs (dict): Options supplémentaires pour les champs spécifiques.
+        """
+
+        model = Issue
+        exclude = ("author",)
+        extra_kwargs = {
+            "title": {"validators": []}
+        }  # unicité vérifiée en une seule requête par la vue
+
+
+class IssueFilterSerializer(serializers.Serializer):
+    """
+    Serializer des paramètres de filtre et de tri de la liste des Issues.
+
+    Chaque filtre porte sur une colonne indexée :
+        - type, priority, progress : index sur chaque colonne ;
+        - contributor_assigned, author : index des clés étrangères ;
+        - time_created_after / time_created_before : index
+          (project_assigned, time_created), les Issues étant toujours limitées
+          aux projets de l'utilisateur.
+    Seuls les tris servis par un index sont acceptés : time_created (index
+    (project_assigned, time_created)) et id (clé primaire).
+    """
+
+    ORDERINGS = {
+        "time_created": ("time_created", "id"),
+        "-time_created": ("-time_created", "-id"),
+        "id": ("id",),
+        "-id": ("-id",),
+    }
+
+    type = serializers.ChoiceField(choices=Issue.TYPE_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Issue.TYPE_PRIORITY, required=False)
+    progress = serializers.ChoiceField(choices=Issue.TYPE_PROGRESS, required=False)
+    contributor_assigned = serializers.IntegerField(required=False)
+    author = serializers.IntegerField(required=False)
+    time_created_after = serializers.DateTimeField(required=False)
+    time_created_before = serializers.DateTimeField(required=False)
+    ordering = serializers.ChoiceField(choices=list(ORDERINGS), required=False)
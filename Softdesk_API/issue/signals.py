@@ -0,0 +1,66 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from project.models import Project
+from project.stats import invalidate_project_stats
+from Softdesk_API.cache import bump_versions
+
+from .models import Issue
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def issue_changed(sender, instance, **kwargs):
+    """
+    Invalide les réponses en cache dépendant des issues et les statistiques
+    du projet de l'issue (et de son projet précédent si elle en a changé).
+
+    L'invalidation a lieu après la validation de la transaction, qui met
+    aussi à jour les compteurs dénormalisés.
+    """
+    transaction.on_commit(partial(bump_versions, "issue"))
+    transaction.on_commit(
+        partial(
+            invalidate_project_stats,
+            instance.project_assigned_id,
+            getattr(instance, "_loaded_project_assigned_id", None),
+        )
+    )
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleting(sender, instance, **kwargs):
+    """
+    Met à jour les compteurs des projets après la suppression d'un
+    utilisateur : ses issues sont supprimées en cascade, sans passer par
+    IssueViewSet.perform_destroy.
+
+    Les compteurs sont mis à jour après la validation de la transaction ; ceux
+    des projets supprimés avec l'utilisateur ne sont plus modifiés.
+    """
+    issues, open_issues = {}, {}
+    for row in (
+        Issue.objects.filter(author=instance.pk)
+        .order_by()
+        .values("project_assigned")
+        .annotate(
+            issues=Count("pk"),
+            open_issues=Count("pk", filter=~Q(progress=Issue.CLOSED_PROGRESS)),
+        )
+    ):
+        issues[row["project_assigned"]] = -row["issues"]
+        open_issues[row["project_assigned"]] = -row["open_issues"]
+
+    if issues:
+        transaction.on_commit(
+            partial(
+                Project.objects.add_issue_counts,
+                issues=issues,
+                open_issues=open_issues,
+            )
+        )
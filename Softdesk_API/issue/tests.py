@@ -0,0 +1,290 @@
+import json
+from io import StringIO
+from itertools import combinations
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from project.models import Project
+from Softdesk_API.testing import (API, QueryPlanMixin, create_comment,
+                                  create_issue, create_project, create_user)
+
+from .models import Issue
+from .serializers import IssueFilterSerializer
+
+
+class IssueCounterTests(APITestCase):
+    """
+    Compteurs d'issues des projets.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.owner = create_user("owner")
+        self.member = create_user("member")
+        self.project = create_project("P", self.owner, self.member)
+        create_issue("owner", self.project, self.owner)
+        create_issue("member open", self.project, self.member)
+        create_issue("member closed", self.project, self.member, progress="Finished")
+        call_command("recompute_counters", stdout=StringIO())
+
+    def test_user_delete_updates_project_counters(self):
+        self.client.force_authenticate(self.member)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"{API}auth/users/{self.member.pk}/")
+        self.assertEqual(response.status_code, 204)
+
+        self.project.refresh_from_db()
+        self.assertEqual(Issue.objects.filter(project_assigned=self.project).count(), 1)
+        self.assertEqual(self.project.issue_count, 1)
+        self.assertEqual(self.project.open_issue_count, 1)
+
+    def test_author_delete_removes_project(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.delete()
+
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(Issue.objects.exists())
+
+
+class IssueBulkTests(APITestCase):
+    """
+    Création d'issues en masse (POST /issue/bulk/).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        self.project = create_project("P", self.user)
+        self.client.force_authenticate(self.user)
+
+    def row(self, title, **fields):
+        return {
+            "title": title,
+            "type": "BUG",
+            "priority": "LOW",
+            "progress": "To Do",
+            "project_assigned": self.project.pk,
+            **fields,
+        }
+
+    def test_create(self):
+        rows = [self.row(f"I{index}") for index in range(3)]
+        response = self.client.post(f"{API}issue/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            [issue["title"] for issue in response.data], ["I0", "I1", "I2"]
+        )
+        self.assertEqual(Issue.objects.count(), 3)
+
+    def test_row_errors(self):
+        rows = [
+            self.row("I0"),
+            self.row("I1", type="XX"),
+            "pas une issue",
+            {"type": "BUG"},
+            self.row("I0"),
+        ]
+        response = self.client.post(f"{API}issue/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = {row["index"]: row["errors"] for row in response.json()["errors"]}
+        self.assertEqual(list(errors), [1, 2, 3, 4])
+        self.assertEqual(list(errors[1]), ["type"])
+        self.assertEqual(list(errors[2]), ["non_field_errors"])
+        self.assertEqual(
+            set(errors[3]), {"title", "priority", "progress", "project_assigned"}
+        )
+        self.assertEqual(list(errors[4]), ["title"])
+        self.assertFalse(Issue.objects.exists())
+
+    def test_contributors_loaded_once(self):
+        other = create_project("O", self.user)
+        rows = [
+            self.row(f"I{index}", project_assigned=project.pk)
+            for index, project in enumerate([self.project, other] * 3)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f"{API}issue/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        contributor_queries = [
+            query
+            for query in queries.captured_queries
+            if 'FROM "project_project_contributors"' in query["sql"]
+        ]
+        self.assertEqual(len(contributor_queries), 1)
+
+
+class IssueSchemaTests(APITestCase):
+    """
+    Documentation Swagger des actions de IssueViewSet.
+    """
+
+    def test_bulk_responses(self):
+        response = self.client.get("/swagger/?format=openapi")
+        self.assertEqual(response.status_code, 200)
+
+        bulk = json.loads(response.content)["paths"]["/issue/bulk/"]["post"]
+        self.assertEqual(set(bulk["responses"]), {"201", "400", "401"})
+        self.assertEqual(bulk["parameters"][0]["schema"]["type"], "array")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN de SQLite")
+class IssueQueryPlanTests(QueryPlanMixin, APITestCase):
+    """
+    Plans d'exécution des listes d'issues.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        other = create_user("other")
+        self.project = create_project("P", self.user)
+        for index in range(3):
+            issue = create_issue(f"I{index}", self.project, self.user)
+            create_comment(f"C{index}", issue, self.user)
+            create_issue(f"O{index}", create_project(f"O{index}", other), other)
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        self.assertUsesIndexes("issue/")
+
+    def test_project_issues(self):
+        self.assertUsesIndexes(f"issue/project-issues/?project_id={self.project.pk}")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN de SQLite")
+class IssueFilterQueryPlanTests(QueryPlanMixin, APITestCase):
+    """
+    Plans d'exécution des filtres et tris de IssueFilterBackend.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        other = create_user("other")
+        self.project = create_project("P", self.user, other)
+        for index, (type_, progress) in enumerate(
+            [("BUG", "To Do"), ("TASK", "Finished"), ("FEATURE", "In Progress")]
+        ):
+            create_issue(
+                f"I{index}",
+                self.project,
+                self.user,
+                type=type_,
+                progress=progress,
+                contributor_assigned=other,
+            )
+            create_issue(f"O{index}", create_project(f"O{index}", other), other)
+        self.client.force_authenticate(self.user)
+
+        self.filters = {
+            "type": "BUG",
+            "priority": "LOW",
+            "progress": "To Do",
+            "contributor_assigned": other.pk,
+            "author": self.user.pk,
+            "time_created_after": "2000-01-01T00:00:00Z",
+            "time_created_before": "2100-01-01T00:00:00Z",
+        }
+        self.endpoints = [
+            "issue/?",
+            f"issue/project-issues/?project_id={self.project.pk}&",
+        ]
+
+    def get_combinations(self):
+        """
+        Filtres seuls, par paires et tous ensemble, sans tri et avec chaque tri accepté.
+        """
+        names = list(self.filters)
+        groups = [()] + list(combinations(names, 1)) + list(combinations(names, 2))
+        groups.append(tuple(names))
+        for group in groups:
+            for ordering in [None, *IssueFilterSerializer.ORDERINGS]:
+                params = [f"{name}={self.filters[name]}" for name in group]
+                if ordering:
+                    params.append(f"ordering={ordering}")
+                yield "&".join(params)
+
+    def test_filter_combinations_use_indexes(self):
+        for endpoint in self.endpoints:
+            for query in self.get_combinations():
+                with self.subTest(url=endpoint + query):
+                    cache.clear()
+                    self.assertUsesIndexes(endpoint + query)
+
+    def test_project_issues_time_ordering_without_sort(self):
+        # les issues d'un projet sont lues dans l'ordre de l'index
+        # (project_assigned, time_created), sans tri
+        for ordering in ("time_created", "-time_created"):
+            with self.subTest(ordering=ordering):
+                plans = self.assertUsesIndexes(
+                    f"{self.endpoints[1]}ordering={ordering}", sort=False
+                )
+                self.assertIn("issue_project_created_idx", str(plans))
+
+    def test_unindexed_orderings_rejected(self):
+        for endpoint in self.endpoints:
+            for ordering in ("title", "-priority", "updated_at", "time_created,id"):
+                with self.subTest(url=endpoint, ordering=ordering):
+                    response = self.client.get(f"{API}{endpoint}ordering={ordering}")
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn("ordering", response.json())
+
+
+class IssueWriteQueryCountTests(APITestCase):
+    """
+    Nombre de requêtes des écritures de IssueViewSet : l'objet n'est chargé
+    qu'une fois, pour la permission et pour l'écriture (voir
+    Softdesk_API.permissions).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user("author")
+        self.other = create_user("other")
+        self.project = create_project("P", self.author, self.other)
+        self.issue = create_issue("I", self.project, self.author)
+        self.comment = create_comment("C", self.issue, self.author)
+        self.url = f"{API}issue/{self.issue.pk}/"
+        self.client.force_authenticate(self.author)
+
+    def test_update(self):
+        # issue, unicité du titre, projet, modification (savepoint, issue, document de recherche)
+        with self.assertNumQueries(7):
+            response = self.client.put(
+                self.url,
+                {
+                    "title": "I",
+                    "description": "x",
+                    "type": "BUG",
+                    "priority": "LOW",
+                    "progress": "To Do",
+                    "project_assigned": self.project.pk,
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_partial_update(self):
+        # issue, modification (savepoint, issue, document de recherche)
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, {"description": "y"}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_destroy(self):
+        # issue, compteurs du projet, comments (cascade), suppressions
+        with self.assertNumQueries(9):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    def test_not_author(self):
+        # issue seulement, sans écriture
+        self.client.force_authenticate(self.other)
+        for method in ("put", "patch", "delete"):
+            with self.subTest(method=method), self.assertNumQueries(1):
+                response = getattr(self.client, method)(self.url, {}, format="json")
+            self.assertEqual(response.status_code, 403)
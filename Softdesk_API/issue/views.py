@@ -1,35 +1,65 @@
+from collections import Counter
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
 
+from project.membership import get_membership
 from project.models import Project
-
+from project.stats import invalidate_project_stats
+from search.backends import get_search_backend
+from search.documents import issue_document
+from Softdesk_API.async_views import AsyncReadView
+from Softdesk_API.cache import CachedResponseMixin, bump_versions
+from Softdesk_API.mixins import (ConditionalGetMixin, SparseFieldsetsMixin,
+                                 StreamingListMixin, ValuesListMixin)
+
+from .filters import IssueFilterBackend
 from .models import Issue
 from .permissions import IsAuthenticatedAndIsAuthor
-from .serializers import IssuePostSerializer, IssueSerializer
-
-
-class IssueViewSet(viewsets.ModelViewSet):
+from .serializers import (IssueBulkSerializer, IssuePostSerializer,
+                          IssueSerializer)
+
+
+class IssueViewSet(
+    SparseFieldsetsMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    ValuesListMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet,
+):
     """
     Gestion des Objets Issue
 
     Un utilisateur doit etre connecté et authentifié
     Seuls les Issue dont l'utilisateur connecté est contributeur du projet, sont accessibles.
+    Les listes acceptent les filtres et tris de IssueFilterBackend.
     """
 
+    # actions acceptant ?fields=, et actions de liste en représentation compacte
+    sparse_actions = ("list", "retrieve", "project_issues")
+    list_actions = ("list", "project_issues")
+    # groupes de données dont dépendent les réponses en cache
+    cache_dependencies = ("project", "issue", "comment")
     serializer_class = IssueSerializer
     permission_classes = [IsAuthenticatedAndIsAuthor]
+    filter_backends = [IssueFilterBackend]
+
+    # nombre maximal d'issues par requête de création en masse
+    bulk_max_size = 5000
 
     # Liste des Issues dont l'utilisateur est contributeur du projet
     def get_queryset(self):
         if self.request.user.is_authenticated:
-            user = self.request.user
-            projects = Project.objects.filter(contributors=user)
-            project_ids = projects.values_list("id", flat=True)
-
-            return Issue.objects.filter(project_assigned__id__in=project_ids)
+            return Issue.objects.visible_to(self.request.user)
         else:
             return Issue.objects.none()
 
@@ -60,16 +90,20 @@ class IssueViewSet(viewsets.ModelViewSet):
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.validated_data["author"] = request.user
+        serializer.validated_data["author_id"] = request.user.id
 
-        # récupère la liste des contributors du projet assigné a l'issue
+        # récupère, en une requête, les contributeurs du projet parmi
+        # l'auteur et le contributeur assigné
         project = serializer.validated_data["project_assigned"]
-        contributors_project_list = project.contributors.all()
+        issue_author_id = serializer.validated_data["author_id"]
+        contributor_assigned = serializer.validated_data.get("contributor_assigned")
+        contributors = get_membership(request).contributors_among(
+            project.id, {issue_author_id, getattr(contributor_assigned, "id", None)}
+        )
 
         # Vérifie si le contributeur assigné est dans la liste des contributeurs
         if "contributor_assigned" in serializer.validated_data:
-            contributor_assigned = serializer.validated_data["contributor_assigned"]
-            if contributor_assigned not in contributors_project_list:
+            if getattr(contributor_assigned, "id", None) not in contributors:
                 return Response(
                     {
                         "error": "Le Contributeur assigné doit etre dans les contirbuteurs du projet."
@@ -78,8 +112,7 @@ class IssueViewSet(viewsets.ModelViewSet):
                 )
 
         # Vérifie si l'auteur est dans la liste des contributeurs
-        issue_author = serializer.validated_data["author"]
-        if issue_author not in contributors_project_list:
+        if issue_author_id not in contributors:
             return Response(
                 {
                     "error": "L'auteur de l'issue doit etre dans les contributeurs du projet."
@@ -87,7 +120,11 @@ class IssueViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer.save()
+        with transaction.atomic():
+            issue = serializer.save()
+            Project.objects.add_issue_counts(
+                issues={project.id: 1}, open_issues={project.id: int(issue.is_open)}
+            )
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -173,11 +210,45 @@ class IssueViewSet(viewsets.ModelViewSet):
 
         return super().destroy(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        """
+        Enregistre la modification et met à jour les compteurs des projets
+        lors d'un changement d'avancement ou de projet.
+        """
+        previous = serializer.instance
+        previous_project_id, was_open = previous.project_assigned_id, previous.is_open
+        with transaction.atomic():
+            issue = serializer.save()
+            issues, open_issues = Counter(), Counter()
+            issues[previous_project_id] -= 1
+            open_issues[previous_project_id] -= was_open
+            issues[issue.project_assigned_id] += 1
+            open_issues[issue.project_assigned_id] += issue.is_open
+            Project.objects.add_issue_counts(issues=issues, open_issues=open_issues)
+
+    def perform_destroy(self, instance):
+        """
+        Supprime l'Issue et met à jour les compteurs de son projet.
+        """
+        project_id = instance.project_assigned_id
+        with transaction.atomic():
+            Project.objects.add_issue_counts(
+                issues={project_id: -1},
+                open_issues={project_id: -int(instance.is_open)},
+            )
+            instance.delete()
+
     @swagger_auto_schema(
         manual_parameters=[
             openapi.Parameter(
                 "project_id", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
-            )
+            ),
+            openapi.Parameter(
+                "stream",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description="Renvoie toute la liste en flux continu, sans pagination.",
+            ),
         ],
         responses={
             status.HTTP_200_OK: IssueSerializer(many=True),
@@ -196,9 +267,34 @@ class IssueViewSet(viewsets.ModelViewSet):
 
         Args:
             project_id (int): L'identifiant du projet.
+            stream (bool): Si true, toutes les issues sont envoyées en flux continu.
+            type, priority, progress, contributor_assigned, author,
+            time_created_after, time_created_before, ordering: voir IssueFilterBackend.
 
         Returns:
-            QuerySet: Le queryset des issues du projet spécifié.
+            Response: La page des issues du projet spécifié, ou le flux complet.
+        """
+        project_id, error = self.check_project_access(request)
+        if error is not None:
+            return error
+
+        # Récupère les issues du projet spécifié (filtrées et triées), page par page
+        project_issues = self.filter_queryset(
+            Issue.objects.filter(project_assigned_id=project_id)
+        )
+        return self.get_conditional_list_response(
+            partial(self.get_list_response, project_issues)
+        )
+
+    def check_project_access(self, request):
+        """
+        Vérifie le paramètre project_id et l'accès de l'utilisateur au projet.
+
+        Args:
+            request (Request): La requête en cours.
+
+        Returns:
+            tuple: (project_id, None), ou (None, Response d'erreur 400, 403 ou 404).
         """
         project_id = request.query_params.get("project_id")
 
@@ -206,28 +302,167 @@ class IssueViewSet(viewsets.ModelViewSet):
         try:
             project_id = int(project_id)
         except (TypeError, ValueError):
-            return Response(
+            return None, Response(
                 {"error": "L'identifiant du projet doit être un entier."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not Project.objects.filter(id=project_id).exists():
+        # Vérifie si l'utilisateur est contributeur du projet,
+        # puis si le projet existe pour distinguer 404 et 403
+        if not get_membership(request).is_contributor(project_id, request.user.id):
+            if not Project.objects.filter(id=project_id).exists():
+                return None, Response(
+                    {"error": "Projet non trouvé."}, status=status.HTTP_404_NOT_FOUND
+                )
+            return None, Response(
+                {
+                    "error": "Vous n'êtes pas autorisé à accéder aux issues de ce projet."
+                },
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        return project_id, None
+
+    @swagger_auto_schema(
+        request_body=IssueBulkSerializer(many=True),
+        responses={
+            status.HTTP_201_CREATED: IssueSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: "Erreurs de validation, par ligne",
+            status.HTTP_401_UNAUTHORIZED: "Authentification non trouvée",
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Création d'Issues en masse.
+
+        Le corps de la requête est une liste d'Issues. Les règles de create
+        s'appliquent à chaque ligne, mais sont vérifiées pour toutes les lignes
+        à la fois : une requête pour les projets, une pour les contributeurs et
+        une pour l'unicité des titres.
+        Les Issues sont insérées avec bulk_create dans une seule transaction :
+        si une ligne est invalide, aucune Issue n'est créée et les erreurs sont
+        renvoyées ligne par ligne.
+
+        Args:
+            request (HttpRequest): La requête HTTP contenant la liste des Issues.
+
+        Returns:
+            Response: Réponse HTTP contenant les Issues créées ou les erreurs par ligne.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
             return Response(
-                {"error": "Projet non trouvé."}, status=status.HTTP_404_NOT_FOUND
+                {"error": "Le corps de la requête doit être une liste d'issues."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > self.bulk_max_size:
+            return Response(
+                {"error": f"Au plus {self.bulk_max_size} issues par requête."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Vérifie si l'utilisateur est contributeur du projet
-        if not Project.objects.filter(
-            id=project_id, contributors=self.request.user
-        ).exists():
+        # validation des champs ligne par ligne, sans requête, par un seul
+        # serializer : ses champs ne sont construits qu'une fois
+        row_serializer = IssueBulkSerializer()
+        valid = []
+        errors = []
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, row_serializer.run_validation(row)))
+                errors.append({})
+            except ValidationError as exc:
+                errors.append(dict(as_serializer_error(exc)))
+
+        # vérifications ensemblistes : projets, contributeurs, titres
+        project_ids = {data["project_assigned"] for _, data in valid}
+        existing_projects = set(
+            Project.objects.filter(id__in=project_ids).values_list("id", flat=True)
+        )
+        membership = get_membership(request)
+        membership.prefetch(existing_projects)
+        titles = [data["title"] for _, data in valid]
+        taken_titles = set(
+            Issue.objects.filter(title__in=titles).values_list("title", flat=True)
+        )
+
+        seen_titles = set()
+        for index, data in valid:
+            project_id = data["project_assigned"]
+            if project_id not in existing_projects:
+                errors[index]["project_assigned"] = ["Projet non trouvé."]
+            else:
+                if not membership.is_contributor(project_id, request.user.id):
+                    errors[index]["author"] = [
+                        "L'auteur de l'issue doit etre dans les contributeurs du projet."
+                    ]
+                contributor_assigned = data.get("contributor_assigned")
+                if "contributor_assigned" in data and not membership.is_contributor(
+                    project_id, contributor_assigned
+                ):
+                    errors[index]["contributor_assigned"] = [
+                        "Le Contributeur assigné doit etre dans les contributeurs du projet."
+                    ]
+            if data["title"] in taken_titles or data["title"] in seen_titles:
+                errors[index]["title"] = ["Une issue avec ce titre existe déjà."]
+            seen_titles.add(data["title"])
+
+        if any(errors):
             return Response(
                 {
-                    "error": "Vous n'êtes pas autorisé à accéder aux issues de ce projet."
+                    "errors": [
+                        {"index": index, "errors": row_errors}
+                        for index, row_errors in enumerate(errors)
+                        if row_errors
+                    ]
                 },
-                status=status.HTTP_403_FORBIDDEN,
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Récupère les issues du projet spécifié
-        project_issues = Issue.objects.filter(project_assigned_id=project_id)
-        serializer = self.get_serializer(project_issues, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        issues = []
+        for _, data in valid:
+            data = dict(data)
+            data["project_assigned_id"] = data.pop("project_assigned")
+            if "contributor_assigned" in data:
+                data["contributor_assigned_id"] = data.pop("contributor_assigned")
+            issues.append(Issue(author_id=request.user.id, **data))
+
+        try:
+            with transaction.atomic():
+                issues = Issue.objects.bulk_create(issues, batch_size=500)
+                Project.objects.add_issue_counts(
+                    issues=Counter(issue.project_assigned_id for issue in issues),
+                    open_issues=Counter(
+                        issue.project_assigned_id for issue in issues if issue.is_open
+                    ),
+                )
+                # index de recherche, dans la même transaction
+                get_search_backend().index(map(issue_document, issues))
+            # bulk_create n'envoie pas de signal post_save
+            bump_versions("issue")
+            invalidate_project_stats(*project_ids)
+        except IntegrityError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = IssueSerializer(issues, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class IssueAsyncView(AsyncReadView):
+    """
+    Lectures asynchrones des Issues (voir AsyncReadView) : list, retrieve et
+    project_issues.
+    """
+
+    viewset_class = IssueViewSet
+
+    async def project_issues(self, viewset, request, *args, **kwargs):
+        project_id, error = await sync_to_async(viewset.check_project_access)(request)
+        if error is not None:
+            return error
+        return await self.get_page_response(
+            viewset,
+            viewset.filter_queryset(
+                Issue.objects.filter(project_assigned_id=project_id)
+            ),
+        )
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from Softdesk_API.pagination import EstimatedCountPaginator
+
 from .models import Project
 
 
@@ -10,12 +12,26 @@ class ProjectAdmin(admin.ModelAdmin):
 
     Attributes:
         list_display (tuple): Liste des champs à afficher dans la liste des utilisateurs de l'interface admin.
+        list_select_related (tuple): Relations chargées par jointure avec la liste (pas de requête par ligne).
+        list_filter (tuple): Filtres de la liste.
+        search_fields (tuple): Champs de recherche, utilisés aussi par l'autocomplétion des Issues.
+        autocomplete_fields (tuple): Relations saisies par autocomplétion au lieu d'un <select> complet.
+        show_full_result_count (bool): Pas de second comptage de la table entière lors d'un filtrage.
+        paginator (class): Paginator utilisant un nombre de lignes estimé pour les grandes tables.
     """
 
     list_display = (
         "author",
         "title",
         "type",
+        "issue_count",
+        "open_issue_count",
         "time_created",
         "id",
     )
+    list_select_related = ("author",)
+    list_filter = ("type",)
+    search_fields = ("title",)
+    autocomplete_fields = ("author", "contributors")
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProjectConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "project"
+
+    def ready(self):
+        # Connexion des signaux d'invalidation du cache des contributeurs
+        from . import signals  # noqa: F401
@@ -0,0 +1,113 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Func, OuterRef, Subquery
+from django.utils import timezone
+
+from comment.models import Comment
+from issue.models import Issue
+from project.models import Project
+from Softdesk_API.cache import bump_versions
+
+
+def count_subquery(queryset):
+    """
+    Sous-requête corrélée comptant les lignes de queryset (sans GROUP BY :
+    une ligne, 0 si queryset est vide).
+
+    Args:
+        queryset (QuerySet): Les lignes à compter, filtrées par OuterRef("pk").
+
+    Returns:
+        Subquery: L'expression du nombre de lignes.
+    """
+    return Subquery(
+        queryset.order_by()
+        .annotate(count=Func(F("pk"), function="COUNT"))
+        .values("count")
+    )
+
+
+class Command(BaseCommand):
+    """
+    Recalcule les compteurs dénormalisés des projets (issue_count,
+    open_issue_count) et des issues (comment_count).
+
+    Les objets sont traités par lots de --batch-size (intervalles de clés
+    primaires) : pour chaque lot, une seule requête UPDATE ... SET compteur =
+    (SELECT COUNT(*) ...) écrit les valeurs exactes des objets dont un
+    compteur diffère. Les compteurs ne sont jamais lus puis réécrits par
+    Python : une incrémentation concurrente (F()) validée avant la requête
+    n'est pas écrasée par une valeur lue avant elle.
+    """
+
+    help = "Recalcule les compteurs d'issues des projets et de comments des issues."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Nombre d'objets traités par lot (défaut : 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            batch_size = 1000
+
+        project_issues = Issue.objects.filter(project_assigned=OuterRef("pk"))
+        projects = self.recompute(
+            Project,
+            {
+                "issue_count": count_subquery(project_issues),
+                "open_issue_count": count_subquery(
+                    project_issues.exclude(progress=Issue.CLOSED_PROGRESS)
+                ),
+            },
+            batch_size,
+        )
+        issues = self.recompute(
+            Issue,
+            {
+                "comment_count": count_subquery(
+                    Comment.objects.filter(issue_assigned=OuterRef("pk"))
+                )
+            },
+            batch_size,
+        )
+
+        if projects or issues:
+            bump_versions("project", "issue")
+        self.stdout.write(
+            self.style.SUCCESS(f"{projects} projet(s) et {issues} issue(s) corrigé(s).")
+        )
+
+    def recompute(self, model, counts, batch_size):
+        """
+        Recalcule les compteurs d'un modèle, lot par lot.
+
+        Args:
+            model (class): Le modèle portant les compteurs.
+            counts (dict): Pour chaque compteur, la sous-requête de sa valeur exacte.
+            batch_size (int): Nombre d'objets par lot.
+
+        Returns:
+            int: Le nombre d'objets corrigés.
+        """
+        fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                return fixed
+
+            # lecture et écriture des compteurs dans la même requête
+            fixed += (
+                model.objects.filter(pk__gt=last_pk, pk__lte=pks[-1])
+                .exclude(**counts)
+                .update(updated_at=timezone.now(), **counts)
+            )
+            last_pk = pks[-1]
@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from Softdesk_API.cache import CacheStats
+
+from .models import Project
+
+CONTRIBUTORS_CACHE_KEY = "project:{}:contributors"
+
+
+cache_stats = CacheStats()
+
+
+def get_contributor_ids_many(project_ids):
+    """
+    Retourne les identifiants des contributeurs de plusieurs projets.
+
+    Les listes sont lues dans le cache Django (une clé par projet, durée de vie
+    CONTRIBUTORS_CACHE_TIMEOUT) ; les projets absents du cache sont chargés
+    ensemble avec Project.get_contributors_map, puis mis en cache. Seuls les
+    projets ayant au moins un contributeur sont mis en cache : un identifiant
+    inexistant (ligne d'une requête en masse, par exemple) ne crée pas de clé.
+    Les entrées sont invalidées par les signaux de project.signals lorsque
+    les contributeurs changent ou que le projet est supprimé.
+
+    Args:
+        project_ids (iterable): Les identifiants des projets.
+
+    Returns:
+        dict: {project_id: frozenset(user_ids)}.
+    """
+    keys = {CONTRIBUTORS_CACHE_KEY.format(pk): pk for pk in set(project_ids)}
+    cached = cache.get_many(keys)
+    contributors = {keys[key]: user_ids for key, user_ids in cached.items()}
+
+    missing = [pk for key, pk in keys.items() if key not in cached]
+    cache_stats.record(hits=len(contributors), misses=len(missing))
+
+    if missing:
+        loaded = Project.get_contributors_map(missing)
+        cache.set_many(
+            {
+                CONTRIBUTORS_CACHE_KEY.format(pk): ids
+                for pk, ids in loaded.items()
+                if ids
+            },
+            settings.CONTRIBUTORS_CACHE_TIMEOUT,
+        )
+        contributors.update(loaded)
+
+    return contributors
+
+
+def get_contributor_ids(project_id):
+    """
+    Retourne les identifiants des contributeurs du projet (voir get_contributor_ids_many).
+
+    Args:
+        project_id (int): L'identifiant du projet.
+
+    Returns:
+        frozenset: Les identifiants des contributeurs (vide si le projet n'existe pas).
+    """
+    return get_contributor_ids_many([project_id])[project_id]
+
+
+def invalidate_contributors(*project_ids):
+    """
+    Supprime du cache la liste des contributeurs des projets donnés.
+    """
+    cache.delete_many([CONTRIBUTORS_CACHE_KEY.format(pk) for pk in project_ids])
+
+
+class Membership:
+    """
+    Service répondant à la question "l'utilisateur U est-il contributeur du projet P ?".
+
+    La liste des contributeurs de chaque projet est lue dans le cache partagé
+    (voir get_contributor_ids), puis mémorisée pour la durée de vie de l'objet,
+    c'est-à-dire de la requête HTTP (voir get_membership).
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def get_contributor_ids(self, project_id):
+        """
+        Retourne les identifiants des contributeurs du projet.
+
+        Args:
+            project_id (int): L'identifiant du projet.
+
+        Returns:
+            frozenset: Les identifiants des contributeurs du projet.
+        """
+        if project_id not in self._cache:
+            self._cache[project_id] = get_contributor_ids(project_id)
+        return self._cache[project_id]
+
+    def prefetch(self, project_ids):
+        """
+        Charge en une fois les contributeurs de plusieurs projets.
+
+        Args:
+            project_ids (iterable): Les identifiants des projets.
+        """
+        missing = set(project_ids) - self._cache.keys()
+        if missing:
+            self._cache.update(get_contributor_ids_many(missing))
+
+    def is_contributor(self, project_id, user_id):
+        """
+        Indique si l'utilisateur est contributeur du projet.
+
+        Args:
+            project_id (int): L'identifiant du projet.
+            user_id (int): L'identifiant de l'utilisateur.
+
+        Returns:
+            bool: True si l'utilisateur est contributeur du projet.
+        """
+        return user_id in self.get_contributor_ids(project_id)
+
+    def contributors_among(self, project_id, user_ids):
+        """
+        Retourne, parmi les utilisateurs donnés, ceux qui sont contributeurs du projet.
+
+        Args:
+            project_id (int): L'identifiant du projet.
+            user_ids (iterable): Les identifiants des utilisateurs à vérifier.
+
+        Returns:
+            set: Les identifiants des utilisateurs contributeurs du projet.
+        """
+        return set(user_ids) & self.get_contributor_ids(project_id)
+
+
+def get_membership(request):
+    """
+    Retourne le service Membership attaché à la requête, en le créant si besoin.
+
+    Args:
+        request (Request): La requête en cours.
+
+    Returns:
+        Membership: Le service de la requête.
+    """
+    membership = getattr(request, "_membership", None)
+    if membership is None:
+        membership = Membership()
+        request._membership = membership
+    return membership
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+# Index inverse (customuser_id, project_id) sur la table des contributeurs :
+# la contrainte unique existante couvre (project_id, customuser_id), celui-ci
+# sert les jointures "projets dont l'utilisateur est contributeur".
+# La table intermédiaire est créée automatiquement (pas de Meta.indexes) :
+# l'index est créé et supprimé par l'éditeur de schéma, avec le SQL propre
+# à chaque base.
+CONTRIBUTORS_INDEX = models.Index(
+    fields=["customuser", "project"], name="project_contributors_user_project_idx"
+)
+
+
+def contributors_through(apps):
+    return apps.get_model("project", "Project").contributors.through
+
+
+def add_index(apps, schema_editor):
+    schema_editor.add_index(contributors_through(apps), CONTRIBUTORS_INDEX)
+
+
+def remove_index(apps, schema_editor):
+    schema_editor.remove_index(contributors_through(apps), CONTRIBUTORS_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0005_alter_project_description_alter_project_title"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:45
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_issue_counts(apps, schema_editor):
+    """
+    Initialise les compteurs d'issues des projets existants.
+    """
+    Project = apps.get_model("project", "Project")
+    Issue = apps.get_model("issue", "Issue")
+
+    def count(condition=Q()):
+        issues = (
+            Issue.objects.filter(condition, project_assigned=OuterRef("pk"))
+            .order_by()
+            .values("project_assigned")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(issues, output_field=IntegerField()), 0)
+
+    Project.objects.update(
+        issue_count=count(), open_issue_count=count(~Q(progress="Finished"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0007_project_updated_at"),
+        ("issue", "0008_issue_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="open_issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_issue_counts, migrations.RunPython.noop),
+    ]
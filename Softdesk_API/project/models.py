@@ -1,10 +1,111 @@
 from django.conf import settings
 from django.db import models
-from rest_framework import status
-from rest_framework.response import Response
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
 
 
-class Project(models.Model):
+def add_to_counters(queryset, deltas):
+    """
+    Ajoute des variations aux compteurs dénormalisés de plusieurs objets,
+    en une seule requête UPDATE.
+
+    Les valeurs sont calculées par la base (F() + CASE), sans lecture
+    préalable : deux requêtes concurrentes ne peuvent pas perdre une mise à
+    jour. La date de modification des objets est mise à jour (ETag).
+    Un compteur ne descend jamais sous zéro : un écart dû à une écriture
+    hors API (administration, ORM) est corrigé par recompute_counters.
+
+    Args:
+        queryset (QuerySet): Le queryset du modèle portant les compteurs.
+        deltas (dict): {nom_du_compteur: {pk: variation}}.
+
+    Returns:
+        int: Le nombre de lignes modifiées.
+    """
+    deltas = {
+        field: {pk: delta for pk, delta in values.items() if delta}
+        for field, values in deltas.items()
+    }
+    pks = {pk for values in deltas.values() for pk in values}
+    if not pks:
+        return 0
+
+    updates = {
+        field: Greatest(
+            F(field)
+            + Case(
+                *[When(pk=pk, then=Value(delta)) for pk, delta in values.items()],
+                default=Value(0),
+            ),
+            Value(0),
+        )
+        for field, values in deltas.items()
+        if values
+    }
+    return queryset.filter(pk__in=pks).update(updated_at=timezone.now(), **updates)
+
+
+class CounterFieldsMixin:
+    """
+    Mixin de modèle pour les compteurs dénormalisés (counter_fields).
+
+    Les compteurs ne sont modifiés que par add_to_counters et la commande
+    recompute_counters : la sauvegarde d'un objet existant ne les réécrit
+    pas, pour ne pas écraser une mise à jour concurrente avec une valeur
+    lue plus tôt.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class ProjectQuerySet(models.QuerySet):
+    """
+    QuerySet personnalisé pour le modèle Project.
+    """
+
+    def visible_to(self, user):
+        """
+        Retourne les projets dont l'utilisateur est contributeur.
+
+        L'appartenance est exprimée par une simple jointure sur la table
+        des contributeurs (pas de sous-requête imbriquée).
+
+        Args:
+            user (CustomUser | TokenUser): L'utilisateur connecté.
+
+        Returns:
+            QuerySet: Les projets visibles par l'utilisateur.
+        """
+        return self.filter(contributors=user.pk)
+
+    def add_issue_counts(self, issues=None, open_issues=None):
+        """
+        Met à jour les compteurs d'issues de plusieurs projets (voir add_to_counters).
+
+        Args:
+            issues (dict): {project_id: variation du nombre d'issues}.
+            open_issues (dict): {project_id: variation du nombre d'issues non terminées}.
+
+        Returns:
+            int: Le nombre de projets modifiés.
+        """
+        return add_to_counters(
+            self,
+            {"issue_count": issues or {}, "open_issue_count": open_issues or {}},
+        )
+
+
+class Project(CounterFieldsMixin, models.Model):
     """
     Modèle représentant un projet.
 
@@ -15,6 +116,9 @@ class Project(models.Model):
         contributors (ManyToManyField): Les contributeurs du projet.
         type (str): Type du projet (frontend, backend, ios, android).
         time_created (DateTimeField): Date et heure de création du projet.
+        updated_at (DateTimeField): Date et heure de dernière modification.
+        issue_count (int): Nombre d'issues du projet (compteur dénormalisé).
+        open_issue_count (int): Nombre d'issues non terminées (compteur dénormalisé).
     """
 
     TYPE_CHOICES = [
@@ -43,18 +147,45 @@ class Project(models.Model):
 
     time_created = models.DateTimeField(auto_now_add=True)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    issue_count = models.PositiveIntegerField(default=0, editable=False)
+
+    open_issue_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("issue_count", "open_issue_count")
+
+    objects = ProjectQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
     @staticmethod
-    def get_contributors_list(project_id):
+    def get_contributors_map(project_ids, batch_size=500):
         """
-        Retourne la liste des contributeurs du projet identifié par project_id.
+        Retourne les contributeurs de plusieurs projets.
+
+        Une seule requête sur la table des contributeurs par lot de
+        batch_size projets.
+
+        Args:
+            project_ids (iterable): Les identifiants des projets.
+            batch_size (int): Nombre de projets par requête.
+
+        Returns:
+            dict: {project_id: frozenset(user_ids)}, avec un frozenset vide pour
+            un projet sans contributeur ou inexistant.
         """
-        try:
-            project = Project.objects.get(pk=project_id)
-            return project.contributors.all()
-        except Project.DoesNotExist:
-            return Response(
-                {"error": "Le projet n'existe pas"}, status=status.HTTP_400_BAD_REQUEST
-            )
+        project_ids = list(set(project_ids))
+        contributors = {project_id: set() for project_id in project_ids}
+        for start in range(0, len(project_ids), batch_size):
+            rows = Project.contributors.through.objects.filter(
+                project_id__in=project_ids[start : start + batch_size]
+            ).values_list("project_id", "customuser_id")
+            for project_id, user_id in rows:
+                contributors[project_id].add(user_id)
+
+        return {
+            project_id: frozenset(user_ids)
+            for project_id, user_ids in contributors.items()
+        }
@@ -1,8 +1,7 @@
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import BasePermission
+from Softdesk_API.permissions import IsAuthenticatedAndIsAuthorBase
 
 
-class IsAuthenticatedAndIsAuthor(BasePermission):
+class IsAuthenticatedAndIsAuthor(IsAuthenticatedAndIsAuthorBase):
     """
     Permission personnalisée :
 
@@ -11,28 +10,5 @@ class IsAuthenticatedAndIsAuthor(BasePermission):
     concernée.
     """
 
-    def has_permission(self, request, view):
-        """
-        Méthode pour vérifier si l'utilisateur a la permission d'accéder à la vue.
-
-        Args:
-            request (Request): L'objet de requête entrant.
-            view (APIView): La vue sur laquelle la permission est vérifiée.
-
-        Returns:
-            bool: True si l'utilisateur a la permission.
-        """
-
-        if request.user.is_authenticated:
-            if view.action in ["list", "create", "retrieve"]:
-                return True
-            elif view.action in ["update", "partial_update", "destroy"]:
-                project = view.get_object()
-                if project.author == request.user:
-                    return True
-                else:
-                    raise PermissionDenied(
-                        "Vous n'êtes pas autorisé à modifier ou à supprimer ce projet."
-                    )
-
-        return False
+    allowed_actions = ["list", "create", "retrieve", "stats"]
+    message = "Vous n'êtes pas autorisé à modifier ou à supprimer ce projet."
@@ -1,12 +1,15 @@
 from rest_framework import serializers
 
+from Softdesk_API.serializers import SparseFieldsetSerializerMixin
+
 from .models import Project
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour le modèle Project.
 
+    Les champs renvoyés peuvent être limités par la vue (sparse fieldsets).
     """
 
     class Meta:
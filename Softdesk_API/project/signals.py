@@ -0,0 +1,97 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from Softdesk_API.cache import bump_versions
+
+from .membership import invalidate_contributors
+from .models import Project
+from .stats import invalidate_project_stats
+
+
+def contributors_updated(*project_ids):
+    """
+    Met à jour la date de modification des projets (utilisée par les ETag),
+    puis invalide le cache de leurs contributeurs et les réponses en cache.
+
+    L'invalidation a lieu après la validation de la transaction : une lecture
+    concurrente faite avant ne peut pas remettre en cache l'ancienne liste.
+
+    Returns:
+        datetime: La nouvelle date de modification.
+    """
+    now = timezone.now()
+    Project.objects.filter(pk__in=project_ids).update(updated_at=now)
+    transaction.on_commit(partial(invalidate_contributors, *project_ids))
+    transaction.on_commit(partial(bump_versions, "project"))
+    return now
+
+
+@receiver(m2m_changed, sender=Project.contributors.through)
+def contributors_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalide le cache des contributeurs et met à jour la date de modification
+    des projets après un ajout, un retrait ou un vidage.
+
+    Dans le sens inverse (user.contributors), instance est l'utilisateur et
+    pk_set contient les identifiants des projets concernés.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            instance.updated_at = contributors_updated(instance.pk)
+        return
+
+    if action == "pre_clear":
+        # pk_set n'est pas fourni lors d'un vidage : on mémorise les projets
+        instance._cleared_project_ids = list(
+            instance.contributors.values_list("id", flat=True)
+        )
+    elif action == "post_clear":
+        contributors_updated(*getattr(instance, "_cleared_project_ids", []))
+    elif action in ("post_add", "post_remove"):
+        contributors_updated(*pk_set)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleting(sender, instance, **kwargs):
+    """
+    Mémorise les projets d'un utilisateur supprimé : ses lignes de contributeur
+    sont supprimées en cascade, sans signal m2m_changed.
+    """
+    instance._contributor_project_ids = list(
+        instance.contributors.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs):
+    """
+    Invalide le cache des contributeurs des projets d'un utilisateur supprimé.
+    """
+    contributors_updated(*getattr(instance, "_contributor_project_ids", []))
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    """
+    Invalide les réponses en cache dépendant des projets, après la
+    validation de la transaction.
+    """
+    transaction.on_commit(partial(bump_versions, "project"))
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    """
+    Invalide le cache des contributeurs et des statistiques d'un projet
+    supprimé, et les réponses en cache dépendant des projets, après la
+    validation de la transaction.
+    """
+    transaction.on_commit(partial(invalidate_contributors, instance.pk))
+    transaction.on_commit(partial(invalidate_project_stats, instance.pk))
+    transaction.on_commit(partial(bump_versions, "project"))
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+from issue.models import Issue
+from Softdesk_API.cache import CacheStats
+
+PROJECT_STATS_CACHE_KEY = "project:{}:stats"
+
+
+cache_stats = CacheStats()
+
+
+def compute_project_stats(project_id):
+    """
+    Calcule les statistiques des issues d'un projet.
+
+    Une requête d'agrégat (values().annotate()) par dimension, chacune
+    limitée aux issues du projet par l'index (project_assigned, time_created) :
+        - nombre d'issues par type x priorité x avancement ; les totaux par
+          type, par priorité et par avancement en sont déduits sans requête ;
+        - nombre d'issues, et d'issues non terminées, par contributeur assigné ;
+        - nombre d'issues créées par jour.
+
+    Args:
+        project_id (int): L'identifiant du projet.
+
+    Returns:
+        dict: Les statistiques du projet.
+    """
+    issues = Issue.objects.filter(project_assigned_id=project_id).order_by()
+
+    matrix = list(
+        issues.values("type", "priority", "progress")
+        .annotate(count=Count("pk"))
+        .order_by("type", "priority", "progress")
+    )
+    by_assignee = list(
+        issues.values("contributor_assigned")
+        .annotate(
+            count=Count("pk"),
+            open=Count("pk", filter=~Q(progress=Issue.CLOSED_PROGRESS)),
+        )
+        .order_by("contributor_assigned")
+    )
+    created_per_day = [
+        {"day": row["day"].isoformat(), "count": row["count"]}
+        for row in issues.annotate(day=TruncDate("time_created"))
+        .values("day")
+        .annotate(count=Count("pk"))
+        .order_by("day")
+    ]
+
+    totals = {"type": {}, "priority": {}, "progress": {}}
+    for row in matrix:
+        for dimension, counts in totals.items():
+            counts[row[dimension]] = counts.get(row[dimension], 0) + row["count"]
+
+    return {
+        "project": project_id,
+        "total": sum(row["count"] for row in matrix),
+        "open": sum(row["open"] for row in by_assignee),
+        "by_type": totals["type"],
+        "by_priority": totals["priority"],
+        "by_progress": totals["progress"],
+        "matrix": matrix,
+        "by_assignee": by_assignee,
+        "created_per_day": created_per_day,
+    }
+
+
+def get_project_stats(project_id):
+    """
+    Retourne les statistiques d'un projet (voir compute_project_stats).
+
+    Les statistiques sont lues dans le cache Django (une clé par projet, durée
+    de vie PROJECT_STATS_CACHE_TIMEOUT) ; elles sont invalidées par les signaux
+    de issue.signals à chaque écriture d'une issue du projet, et par la
+    création d'issues en masse.
+
+    Args:
+        project_id (int): L'identifiant du projet.
+
+    Returns:
+        dict: Les statistiques du projet.
+    """
+    key = PROJECT_STATS_CACHE_KEY.format(project_id)
+    stats = cache.get(key)
+    cache_stats.record(hits=stats is not None, misses=stats is None)
+    if stats is None:
+        stats = compute_project_stats(project_id)
+        cache.set(key, stats, settings.PROJECT_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_project_stats(*project_ids):
+    """
+    Supprime du cache les statistiques des projets donnés.
+    """
+    cache.delete_many(
+        [PROJECT_STATS_CACHE_KEY.format(pk) for pk in project_ids if pk is not None]
+    )
@@ -0,0 +1,540 @@
+from datetime import datetime, timezone
+from io import StringIO
+from itertools import count
+from unittest import skipUnless
+
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from issue.models import Issue
+from Softdesk_API.testing import (API, QueryPlanMixin, create_comment,
+                                  create_issue, create_project, create_user)
+
+from .membership import (CONTRIBUTORS_CACHE_KEY, cache_stats,
+                         get_contributor_ids, get_contributor_ids_many)
+from .models import Project
+from .stats import PROJECT_STATS_CACHE_KEY
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN de SQLite")
+class ProjectQueryPlanTests(QueryPlanMixin, APITestCase):
+    """
+    Plans d'exécution de la liste des projets.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        other = create_user("other")
+        for index in range(3):
+            create_project(f"P{index}", self.user)
+            create_project(f"O{index}", other)
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        plans = self.assertUsesIndexes("project/")
+        # projets de l'utilisateur : index (customuser_id, project_id) des contributeurs
+        self.assertIn("project_contributors_user_project_idx", str(plans))
+
+
+class MembershipQueryCountTests(APITestCase):
+    """
+    Nombre de requêtes des points d'entrée qui vérifient l'appartenance à un
+    projet (voir project.membership) : il ne dépend ni du nombre de
+    contributeurs, ni du nombre d'issues ou de comments.
+    """
+
+    def setUp(self):
+        self.titles = count()
+        self.user = create_user("member")
+        self.projects = []
+        for size in (1, 20):
+            users = [create_user(f"user-{size}-{index}") for index in range(size)]
+            project = create_project(f"P{size}", self.user, *users)
+            issues = [
+                create_issue(f"I{size}-{index}", project, users[index])
+                for index in range(size)
+            ]
+            for index in range(size):
+                create_comment(f"C{size}-{index}", issues[0], users[index])
+            self.projects.append((project, issues[0], users[0]))
+        self.client.force_authenticate(self.user)
+
+    def assertNumQueriesPerProject(self, cold, warm, request):
+        """
+        Vérifie le nombre de requêtes d'un point d'entrée pour chaque projet,
+        contributeurs absents du cache (cold) puis en cache (warm).
+
+        Args:
+            cold (int): Nombre de requêtes, contributeurs absents du cache.
+            warm (int): Nombre de requêtes, contributeurs en cache.
+            request (callable): (project, issue, contributor) -> Response.
+        """
+        for project, issue, contributor in self.projects:
+            for expected, in_cache in ((cold, False), (warm, True)):
+                with self.subTest(project=project.title, in_cache=in_cache):
+                    cache.clear()
+                    caches["responses"].clear()
+                    if in_cache:
+                        get_contributor_ids(project.pk)
+                    with self.assertNumQueries(expected):
+                        response = request(project, issue, contributor)
+                    self.assertIn(response.status_code, (200, 201), response.data)
+
+    def test_issue_create(self):
+        # unicité du titre, projet, contributeur assigné, [contributeurs],
+        # insertion (savepoint, issue, document de recherche, compteurs)
+        self.assertNumQueriesPerProject(
+            9,
+            8,
+            lambda project, issue, contributor: self.client.post(
+                f"{API}issue/",
+                {
+                    "title": f"new-{next(self.titles)}",
+                    "description": "d",
+                    "type": "BUG",
+                    "priority": "LOW",
+                    "progress": "To Do",
+                    "project_assigned": project.pk,
+                    "contributor_assigned": contributor.pk,
+                },
+                format="json",
+            ),
+        )
+
+    def test_comment_create(self):
+        # unicité du titre, issue, [contributeurs],
+        # insertion (savepoint, comment, document de recherche, compteur)
+        self.assertNumQueriesPerProject(
+            8,
+            7,
+            lambda project, issue, contributor: self.client.post(
+                f"{API}comment/",
+                {
+                    "title": f"new-{next(self.titles)}",
+                    "description": "d",
+                    "issue_assigned": issue.pk,
+                },
+                format="json",
+            ),
+        )
+
+    def test_project_issues(self):
+        # [contributeurs], comptage, page
+        self.assertNumQueriesPerProject(
+            3,
+            2,
+            lambda project, issue, contributor: self.client.get(
+                f"{API}issue/project-issues/?project_id={project.pk}"
+            ),
+        )
+
+    def test_issue_comments(self):
+        # projet de l'issue, [contributeurs], comptage, page
+        self.assertNumQueriesPerProject(
+            4,
+            3,
+            lambda project, issue, contributor: self.client.get(
+                f"{API}comment/issue-comments/?issue_id={issue.pk}"
+            ),
+        )
+
+
+class ProjectWriteQueryCountTests(APITestCase):
+    """
+    Nombre de requêtes des écritures de ProjectViewSet : l'objet n'est chargé
+    qu'une fois, pour la permission et pour l'écriture (voir
+    Softdesk_API.permissions).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user("author")
+        self.other = create_user("other")
+        self.project = create_project("P", self.author, self.other)
+        self.issue = create_issue("I", self.project, self.author)
+        self.comment = create_comment("C", self.issue, self.author)
+        self.url = f"{API}project/{self.project.pk}/"
+        self.client.force_authenticate(self.author)
+
+    def test_update(self):
+        # projet, unicité du titre, modification, contributeurs (réponse)
+        with self.assertNumQueries(4):
+            response = self.client.put(
+                self.url,
+                {"title": "P", "description": "x", "type": "backend"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_partial_update(self):
+        # projet, modification, contributeurs (réponse)
+        with self.assertNumQueries(3):
+            response = self.client.patch(self.url, {"description": "y"}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_destroy(self):
+        # projet, issues et comments (cascade), suppression des documents de
+        # recherche, des comments, des issues, des contributeurs et du projet
+        with self.assertNumQueries(9):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    def test_not_author(self):
+        # project seulement, sans écriture
+        self.client.force_authenticate(self.other)
+        for method in ("put", "patch", "delete"):
+            with self.subTest(method=method), self.assertNumQueries(1):
+                response = getattr(self.client, method)(self.url, {}, format="json")
+            self.assertEqual(response.status_code, 403)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "responses": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "responses",
+        },
+    }
+)
+class ContributorCacheTests(TestCase):
+    """
+    Cache des contributeurs des projets (voir project.membership) : succès,
+    échecs, et invalidation par les signaux de project.signals.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user("author")
+        self.member = create_user("member")
+        self.project = create_project("P", self.author, self.member)
+        self.other_project = create_project("O", self.member)
+
+    def cached(self, project_id):
+        return cache.get(CONTRIBUTORS_CACHE_KEY.format(project_id))
+
+    def assertInvalidated(self, change, *projects):
+        """
+        Vérifie qu'une modification invalide le cache des projets donnés
+        après la validation de la transaction, et pas avant.
+        """
+        project_ids = [project.pk for project in projects]
+        for project_id in project_ids:
+            get_contributor_ids(project_id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            change()
+            for project_id in project_ids:
+                self.assertIsNotNone(self.cached(project_id))
+        for callback in callbacks:
+            callback()
+        for project_id in project_ids:
+            self.assertIsNone(self.cached(project_id))
+
+    def test_miss_then_hit(self):
+        before = cache_stats.as_dict()
+        with self.assertNumQueries(1):
+            contributors = get_contributor_ids(self.project.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_contributor_ids(self.project.pk), contributors)
+        self.assertEqual(contributors, {self.author.pk, self.member.pk})
+
+        after = cache_stats.as_dict()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_unknown_project_not_cached(self):
+        contributors = get_contributor_ids_many([self.project.pk, 0])
+        self.assertEqual(contributors[0], frozenset())
+        self.assertIsNotNone(self.cached(self.project.pk))
+        self.assertIsNone(self.cached(0))
+
+    def test_bulk_unknown_project_not_cached(self):
+        client = APIClient()
+        client.force_authenticate(self.member)
+        rows = [
+            {
+                "title": f"I{project_id}",
+                "type": "BUG",
+                "priority": "LOW",
+                "progress": "To Do",
+                "project_assigned": project_id,
+            }
+            for project_id in (self.project.pk, 0, 123456)
+        ]
+        response = client.post(f"{API}issue/bulk/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNotNone(self.cached(self.project.pk))
+        self.assertIsNone(self.cached(0))
+        self.assertIsNone(self.cached(123456))
+
+    def test_add(self):
+        user = create_user("new")
+        self.assertInvalidated(
+            lambda: self.project.contributors.add(user), self.project
+        )
+        self.assertIn(user.pk, get_contributor_ids(self.project.pk))
+
+    def test_remove(self):
+        self.assertInvalidated(
+            lambda: self.project.contributors.remove(self.member), self.project
+        )
+        self.assertEqual(get_contributor_ids(self.project.pk), {self.author.pk})
+
+    def test_clear(self):
+        self.assertInvalidated(self.project.contributors.clear, self.project)
+        self.assertEqual(get_contributor_ids(self.project.pk), frozenset())
+
+    def test_reverse_add_and_remove(self):
+        user = create_user("new")
+        self.assertInvalidated(
+            lambda: user.contributors.add(self.project, self.other_project),
+            self.project,
+            self.other_project,
+        )
+        self.assertIn(user.pk, get_contributor_ids(self.other_project.pk))
+
+        self.assertInvalidated(
+            lambda: user.contributors.remove(self.other_project), self.other_project
+        )
+        self.assertNotIn(user.pk, get_contributor_ids(self.other_project.pk))
+
+    def test_reverse_clear(self):
+        self.assertInvalidated(
+            self.member.contributors.clear, self.project, self.other_project
+        )
+        self.assertEqual(get_contributor_ids(self.project.pk), {self.author.pk})
+        self.assertEqual(get_contributor_ids(self.other_project.pk), frozenset())
+
+    def test_user_delete(self):
+        self.assertInvalidated(self.member.delete, self.project, self.other_project)
+        self.assertEqual(get_contributor_ids(self.project.pk), {self.author.pk})
+
+    def test_project_delete(self):
+        project_id = self.project.pk
+        self.assertInvalidated(self.project.delete, self.project)
+        self.assertEqual(get_contributor_ids(project_id), frozenset())
+
+
+class ProjectStatsTests(APITestCase):
+    """
+    Statistiques des issues d'un projet (GET /project/<pk>/stats/) : contenu
+    par dimension, accès réservé aux contributeurs, et invalidation du cache
+    par les signaux de issue.signals et par la création en masse.
+    """
+
+    def setUp(self):
+        cache.clear()
+        caches["responses"].clear()
+        self.user = create_user("member")
+        self.assignee = create_user("assignee")
+        self.project = create_project("P", self.user, self.assignee)
+        self.other_project = create_project("O", self.user)
+        self.url = f"{API}project/{self.project.pk}/stats/"
+        issues = [
+            create_issue("I0", self.project, self.user),
+            create_issue("I1", self.project, self.user, type="FEATURE"),
+            create_issue(
+                "I2",
+                self.project,
+                self.user,
+                progress="Finished",
+                contributor_assigned=self.assignee,
+            ),
+            create_issue(
+                "I3",
+                self.project,
+                self.user,
+                priority="HIGH",
+                contributor_assigned=self.assignee,
+            ),
+        ]
+        create_issue("O0", self.other_project, self.user)
+        for index, issue in enumerate(issues):
+            Issue.objects.filter(pk=issue.pk).update(
+                time_created=datetime(2024, 1, 1 + index // 2, 12, tzinfo=timezone.utc)
+            )
+        self.client.force_authenticate(self.user)
+
+    def get_stats(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def cached(self):
+        return cache.get(PROJECT_STATS_CACHE_KEY.format(self.project.pk))
+
+    def test_dimensions(self):
+        stats = self.get_stats()
+        self.assertEqual(stats["project"], self.project.pk)
+        self.assertEqual(stats["total"], 4)
+        self.assertEqual(stats["open"], 3)
+        self.assertEqual(stats["by_type"], {"BUG": 3, "FEATURE": 1})
+        self.assertEqual(stats["by_priority"], {"HIGH": 1, "LOW": 3})
+        self.assertEqual(stats["by_progress"], {"Finished": 1, "To Do": 3})
+        self.assertEqual(
+            stats["matrix"],
+            [
+                {"type": "BUG", "priority": "HIGH", "progress": "To Do", "count": 1},
+                {"type": "BUG", "priority": "LOW", "progress": "Finished", "count": 1},
+                {"type": "BUG", "priority": "LOW", "progress": "To Do", "count": 1},
+                {"type": "FEATURE", "priority": "LOW", "progress": "To Do", "count": 1},
+            ],
+        )
+        self.assertEqual(
+            sorted(
+                stats["by_assignee"], key=lambda row: row["contributor_assigned"] or 0
+            ),
+            [
+                {"contributor_assigned": None, "count": 2, "open": 2},
+                {"contributor_assigned": self.assignee.pk, "count": 2, "open": 1},
+            ],
+        )
+        self.assertEqual(
+            stats["created_per_day"],
+            [{"day": "2024-01-01", "count": 2}, {"day": "2024-01-02", "count": 2}],
+        )
+
+    def test_empty_project(self):
+        project = create_project("E", self.user)
+        stats = self.get_stats(f"{API}project/{project.pk}/stats/")
+        self.assertEqual(stats["total"], 0)
+        self.assertEqual(stats["by_type"], {})
+        self.assertEqual(stats["matrix"], [])
+        self.assertEqual(stats["created_per_day"], [])
+
+    def test_not_contributor(self):
+        stranger = create_user("stranger")
+        self.client.force_authenticate(stranger)
+        for url in (self.url, f"{API}project/0/stats/", f"{API}project/x/stats/"):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+        self.assertIsNone(self.cached())
+
+    def assertInvalidated(self, change):
+        """
+        Vérifie qu'une modification des issues du projet invalide ses
+        statistiques après la validation de la transaction.
+        """
+        before = self.get_stats()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_stats(), before)
+        self.assertIsNotNone(self.cached())
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertIsNone(self.cached())
+        return self.get_stats()
+
+    def test_save(self):
+        stats = self.assertInvalidated(
+            lambda: create_issue("I4", self.project, self.user, type="TASK")
+        )
+        self.assertEqual(stats["total"], 5)
+        self.assertEqual(stats["by_type"]["TASK"], 1)
+
+    def test_update(self):
+        def close():
+            issue = Issue.objects.get(title="I0")
+            issue.progress = "Finished"
+            issue.save()
+
+        stats = self.assertInvalidated(close)
+        self.assertEqual(stats["open"], 2)
+
+    def test_move(self):
+        other_stats = self.get_stats(f"{API}project/{self.other_project.pk}/stats/")
+        self.assertEqual(other_stats["total"], 1)
+
+        def move():
+            issue = Issue.objects.get(title="I0")
+            issue.project_assigned = self.other_project
+            issue.save()
+
+        stats = self.assertInvalidated(move)
+        self.assertEqual(stats["total"], 3)
+        other_stats = self.get_stats(f"{API}project/{self.other_project.pk}/stats/")
+        self.assertEqual(other_stats["total"], 2)
+
+    def test_delete(self):
+        stats = self.assertInvalidated(Issue.objects.get(title="I0").delete)
+        self.assertEqual(stats["total"], 3)
+
+    def test_bulk(self):
+        rows = [
+            {
+                "title": f"B{index}",
+                "type": "TASK",
+                "priority": "LOW",
+                "progress": "To Do",
+                "project_assigned": self.project.pk,
+            }
+            for index in range(3)
+        ]
+
+        def post():
+            response = self.client.post(f"{API}issue/bulk/", rows, format="json")
+            self.assertEqual(response.status_code, 201, response.data)
+
+        stats = self.assertInvalidated(post)
+        self.assertEqual(stats["total"], 7)
+        self.assertEqual(stats["by_type"]["TASK"], 3)
+
+
+class RecomputeCountersTests(TestCase):
+    """
+    Commande recompute_counters : les compteurs faux sont corrigés, sans que
+    leur valeur soit lue puis réécrite par Python.
+    """
+
+    def setUp(self):
+        user = create_user("member")
+        self.project = create_project("P", user)
+        self.other_project = create_project("O", user)
+        issue = create_issue("I0", self.project, user)
+        create_issue("I1", self.project, user, progress="Finished")
+        create_issue("O0", self.other_project, user)
+        create_comment("C0", issue, user)
+        call_command("recompute_counters", stdout=StringIO())
+
+    def test_fix(self):
+        Project.objects.filter(pk=self.project.pk).update(
+            issue_count=7, open_issue_count=0
+        )
+        Issue.objects.filter(title="I0").update(comment_count=0)
+        Issue.objects.filter(title="I1").update(comment_count=3)
+        updated_at = Project.objects.get(pk=self.other_project.pk).updated_at
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command("recompute_counters", batch_size=1, stdout=out)
+        self.assertIn("1 projet(s) et 2 issue(s)", out.getvalue())
+
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.issue_count, self.project.open_issue_count), (2, 1)
+        )
+        self.assertEqual(
+            dict(Issue.objects.values_list("title", "comment_count")),
+            {"I0": 1, "I1": 0, "O0": 0},
+        )
+        self.assertEqual(
+            Project.objects.get(pk=self.other_project.pk).updated_at, updated_at
+        )
+
+        # compteurs calculés et écrits par la requête UPDATE de chaque lot
+        for query in queries.captured_queries:
+            sql = query["sql"]
+            if sql.startswith("UPDATE"):
+                self.assertIn("COUNT(", sql)
+            else:
+                self.assertNotIn("_count", sql)
+
+    def test_nothing_to_fix(self):
+        out = StringIO()
+        call_command("recompute_counters", stdout=out)
+        self.assertIn("0 projet(s) et 0 issue(s)", out.getvalue())
@@ -1,13 +1,27 @@
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from Softdesk_API.async_views import AsyncReadView
+from Softdesk_API.cache import CachedResponseMixin
+from Softdesk_API.mixins import (ConditionalGetMixin, SparseFieldsetsMixin,
+                                 ValuesListMixin)
+
+from .membership import get_membership
 from .models import Project
 from .permissions import IsAuthenticatedAndIsAuthor
 from .serializers import ProjectPostSerializer, ProjectSerializer
+from .stats import get_project_stats
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(
+    SparseFieldsetsMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """
     Gestion des objets Project.
 
@@ -17,13 +31,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
     accessibles.
     """
 
+    # groupes de données dont dépendent les réponses en cache
+    cache_dependencies = ("project", "issue")
     serializer_class = ProjectSerializer
 
     # Liste des projets dont l'utilisateur est contributeur
     def get_queryset(self):
         if self.request.user.is_authenticated:
-            user = self.request.user
-            return Project.objects.filter(contributors=user)
+            return Project.objects.visible_to(self.request.user)
         else:
             return Project.objects.none()
 
@@ -52,8 +67,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         # on sauvegarde l'utilisateur connecté comme auteur et contributor
-        serializer.save(author=request.user)
-        serializer.instance.contributors.add(request.user)
+        serializer.save(author_id=request.user.id)
+        serializer.instance.contributors.add(request.user.id)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -138,3 +153,52 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
 
         return super().destroy(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        responses={
+            status.HTTP_200_OK: "Statistiques des issues du projet",
+            status.HTTP_401_UNAUTHORIZED: "Authentification non trouvée",
+            status.HTTP_404_NOT_FOUND: "Projet non trouvé",
+        },
+    )
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Statistiques des issues d'un projet.
+
+        Un utilisateur doit etre connecté et authentifié
+        Seuls les projets dont l'utilisateur connecté est contributeur sont accessibles.
+
+        Renvoie le nombre d'issues par type x priorité x avancement (et les
+        totaux par dimension), par contributeur assigné, et le nombre d'issues
+        créées par jour. Les statistiques sont calculées par des requêtes
+        d'agrégat et mises en cache par projet jusqu'à la prochaine écriture
+        d'une issue du projet.
+
+        Args:
+            pk (int): L'identifiant du projet.
+
+        Returns:
+            Response: Les statistiques du projet.
+        """
+        try:
+            project_id = int(pk)
+        except (TypeError, ValueError):
+            project_id = None
+
+        if project_id is None or not get_membership(request).is_contributor(
+            project_id, request.user.id
+        ):
+            return Response(
+                {"error": "Projet non trouvé."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response(get_project_stats(project_id))
+
+
+class ProjectAsyncView(AsyncReadView):
+    """
+    Lectures asynchrones des Projects (voir AsyncReadView) : list et retrieve.
+    """
+
+    viewset_class = ProjectViewSet
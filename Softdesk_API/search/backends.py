@@ -0,0 +1,414 @@
+import re
+import unicodedata
+from functools import cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from comment.models import Comment
+
+from .documents import COMMENT, ISSUE, KINDS
+
+SQLITE_BACKEND = "search.backends.SQLiteFTS5Backend"
+DATABASE_BACKEND = "search.backends.DatabaseSearchBackend"
+
+# mot, éventuellement suivi de * pour une recherche par préfixe
+TERM_RE = re.compile(r"(\w+)(\*?)")
+# mot indexé (tokenizer unicode61 : lettres et chiffres)
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def parse_query(text):
+    """
+    Découpe le texte recherché en termes.
+
+    Args:
+        text (str): Le texte saisi ; un terme suivi de * est recherché par préfixe.
+
+    Returns:
+        list: Les couples (terme, préfixe), vide si le texte ne contient aucun mot.
+    """
+    return [(term.lower(), bool(star)) for term, star in TERM_RE.findall(text or "")]
+
+
+def fold(word):
+    """
+    Normalise un mot comme le tokenizer de l'index (unicode61
+    remove_diacritics 2) : minuscules, sans accents.
+    """
+    decomposed = unicodedata.normalize("NFKD", word.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def make_snippet(title, body, terms, size):
+    """
+    Construit l'extrait d'un document et la position des termes trouvés.
+
+    L'extrait est le passage de size mots de la description (ou du titre)
+    qui contient le plus de termes. Il
+    est renvoyé en texte brut, tel que saisi : les termes trouvés sont
+    repérés par leur position et non par des balises, le client se chargeant
+    de l'échappement et de la mise en forme.
+
+    Args:
+        title (str): Le titre du document.
+        body (str): La description du document.
+        terms (list): Les couples (terme, préfixe) retournés par parse_query.
+        size (int): Le nombre de mots de l'extrait.
+
+    Returns:
+        tuple: L'extrait (str), et les positions [début, fin] des termes
+        trouvés dans l'extrait (indices de caractères).
+    """
+    # un terme de plusieurs mots indexés (« a_b ») est cherché mot par mot ;
+    # seul son dernier mot est un préfixe
+    words = []
+    for term, prefix in terms:
+        parts = TOKEN_RE.findall(fold(term))
+        words += [
+            (part, prefix and index == len(parts) - 1)
+            for index, part in enumerate(parts)
+        ]
+
+    def matches(token):
+        token = fold(token)
+        return any(
+            token.startswith(word) if prefix else token == word
+            for word, prefix in words
+        )
+
+    def locate(text):
+        tokens = list(TOKEN_RE.finditer(text or ""))
+        found = [index for index, token in enumerate(tokens) if matches(token[0])]
+        return text or "", tokens, found
+
+    # la description, ou le titre s'il est seul à contenir un terme (sans
+    # index, les termes peuvent n'être trouvés que dans un mot plus long)
+    text, tokens, found = locate(body)
+    if not found:
+        in_title = locate(title)
+        if in_title[2]:
+            text, tokens, found = in_title
+
+    # premier mot du passage de size mots contenant le plus de termes
+    first = 0
+    if found:
+        first = max(
+            found,
+            key=lambda start: sum(start <= index < start + size for index in found),
+        )
+        first = max(0, min(first, len(tokens) - size))
+    window = tokens[first : first + size]
+    if not window:
+        return text, []
+
+    start = 0 if first == 0 else window[0].start()
+    end = len(text) if first + size >= len(tokens) else window[-1].end()
+    prefix = "" if start == 0 else "…"
+    suffix = "" if end == len(text) else "…"
+    highlights = [
+        [len(prefix) + token.start() - start, len(prefix) + token.end() - start]
+        for token in window
+        if matches(token[0])
+    ]
+    return prefix + text[start:end] + suffix, highlights
+
+
+class SearchResults:
+    """
+    Résultats d'une recherche, évalués à la demande.
+
+    Se comporte comme un queryset pour la pagination : count() exécute la
+    requête de comptage, une tranche [début:fin] la requête de la page.
+
+    Args:
+        fetch (callable): fetch(offset, limit) retourne la liste des résultats.
+        count (callable): count() retourne le nombre total de résultats.
+    """
+
+    def __init__(self, fetch, count):
+        self._fetch = fetch
+        self._count = count
+        self._total = None
+
+    def count(self):
+        if self._total is None:
+            self._total = self._count()
+        return self._total
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("Seules les tranches [début:fin] sont acceptées.")
+        start = key.start or 0
+        stop = self.count() if key.stop is None else key.stop
+        if stop <= start:
+            return []
+        return self._fetch(start, stop - start)
+
+
+class BaseSearchBackend:
+    """
+    Interface d'un moteur de recherche sur les Issues et les Comments.
+
+    Le moteur utilisé est défini par le réglage SEARCH_BACKEND (chemin de la
+    classe) ; par défaut SQLiteFTS5Backend sur SQLite, DatabaseSearchBackend
+    sur les autres bases.
+
+    Attributes:
+        snippet_tokens (int): Nombre de mots des extraits (voir make_snippet).
+    """
+
+    snippet_tokens = 12
+
+    def index(self, documents):
+        """
+        Ajoute ou remplace des documents dans l'index.
+
+        Args:
+            documents (iterable): Les documents (search.documents.Document).
+        """
+        raise NotImplementedError
+
+    def remove(self, kind, object_ids):
+        """
+        Retire des documents de l'index.
+
+        Args:
+            kind (str): "issue" ou "comment".
+            object_ids (iterable): Les identifiants des objets.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Vide l'index.
+        """
+        raise NotImplementedError
+
+    def search(self, terms, issues, kind=None):
+        """
+        Recherche les documents contenant tous les termes.
+
+        Args:
+            terms (list): Les couples (terme, préfixe) retournés par parse_query.
+            issues (QuerySet): Les Issues visibles : seuls ces Issues et leurs
+                Comments sont renvoyés.
+            kind (str): "issue" ou "comment" pour limiter la recherche, ou None.
+
+        Returns:
+            SearchResults: Les résultats (dict kind, id, issue, title, snippet,
+            highlights, score), du plus pertinent au moins pertinent.
+        """
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    Moteur de recherche utilisant une table virtuelle SQLite FTS5 (index inversé).
+
+    La table search_document est créée par la migration search.0001_initial.
+    Le rowid d'un document est calculé à partir de son type et de son
+    identifiant : la mise à jour et la suppression d'un document passent par
+    la clé primaire de la table. Les résultats sont classés par bm25, un
+    terme du titre pesant title_weight fois un terme de la description.
+    """
+
+    table = "search_document"
+    batch_size = 500
+    title_weight = 10.0
+    body_weight = 1.0
+
+    def rowid(self, kind, object_id):
+        return object_id * len(KINDS) + KINDS.index(kind)
+
+    def index(self, documents):
+        sql = (
+            f"INSERT OR REPLACE INTO {self.table} "
+            "(rowid, kind, object_id, issue_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s, %s)"
+        )
+        batch = []
+        with connection.cursor() as cursor:
+            for document in documents:
+                batch.append((self.rowid(document.kind, document.object_id), *document))
+                if len(batch) >= self.batch_size:
+                    cursor.executemany(sql, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+
+    def remove(self, kind, object_ids):
+        rowids = [self.rowid(kind, object_id) for object_id in object_ids]
+        with connection.cursor() as cursor:
+            for start in range(0, len(rowids), self.batch_size):
+                chunk = rowids[start : start + self.batch_size]
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN "
+                    f"({', '.join(['%s'] * len(chunk))})",
+                    chunk,
+                )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def match_expression(self, terms):
+        """
+        Construit l'expression MATCH : chaque terme entre guillemets (aucune
+        syntaxe FTS5 ne peut être injectée), suivi de * pour un préfixe.
+        """
+        return " ".join(f'"{term}"{"*" if prefix else ""}' for term, prefix in terms)
+
+    def search(self, terms, issues, kind=None):
+        scope_sql, scope_params = issues.order_by().values("id").query.sql_with_params()
+        where = f"{self.table} MATCH %s AND issue_id IN ({scope_sql})"
+        params = [self.match_expression(terms), *scope_params]
+        if kind is not None:
+            where += " AND kind = %s"
+            params.append(kind)
+
+        def fetch(offset, limit):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    # l'extrait est construit par make_snippet, et non par la
+                    # fonction snippet() de FTS5 qui mêle balises et texte saisi
+                    "SELECT kind, object_id, issue_id, title, body, "
+                    f"bm25({self.table}, 0, 0, 0, %s, %s) AS score "
+                    f"FROM {self.table} WHERE {where} "
+                    "ORDER BY score LIMIT %s OFFSET %s",
+                    [
+                        self.title_weight,
+                        self.body_weight,
+                        *params,
+                        limit,
+                        offset,
+                    ],
+                )
+                results = []
+                for (
+                    document_kind,
+                    object_id,
+                    issue_id,
+                    title,
+                    body,
+                    score,
+                ) in cursor.fetchall():
+                    snippet, highlights = make_snippet(
+                        title, body, terms, self.snippet_tokens
+                    )
+                    results.append(
+                        {
+                            "kind": document_kind,
+                            "id": object_id,
+                            "issue": issue_id,
+                            "title": title,
+                            "snippet": snippet,
+                            "highlights": highlights,
+                            # bm25 est négatif : plus petit = plus pertinent
+                            "score": -score,
+                        }
+                    )
+                return results
+
+        def count():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {self.table} WHERE {where}", params
+                )
+                return cursor.fetchone()[0]
+
+        return SearchResults(fetch, count)
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Moteur de recherche sans index, pour les bases autres que SQLite.
+
+    Les termes sont recherchés avec icontains dans les tables des Issues et
+    des Comments (parcours complet des tables) ; les résultats ne sont pas
+    classés par pertinence mais du plus récent au plus ancien. Un moteur
+    indexé (PostgreSQL, Elasticsearch...) peut être branché via
+    SEARCH_BACKEND en implémentant BaseSearchBackend.
+    """
+
+    def index(self, documents):
+        pass
+
+    def remove(self, kind, object_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, terms, issues, kind=None):
+        condition = Q()
+        for term, _ in terms:
+            condition &= Q(title__icontains=term) | Q(description__icontains=term)
+
+        querysets = []
+        if kind in (None, ISSUE):
+            querysets.append(
+                (ISSUE, "id", issues.filter(condition).order_by("-time_created"))
+            )
+        if kind in (None, COMMENT):
+            querysets.append(
+                (
+                    COMMENT,
+                    "issue_assigned_id",
+                    Comment.objects.filter(
+                        condition, issue_assigned__in=issues
+                    ).order_by("-time_created"),
+                )
+            )
+
+        def fetch(offset, limit):
+            results = []
+            for document_kind, issue_field, queryset in querysets:
+                if limit <= 0:
+                    break
+                total = queryset.count()
+                if offset >= total:
+                    offset -= total
+                    continue
+                rows = queryset.values_list("id", issue_field, "title", "description")[
+                    offset : offset + limit
+                ]
+                for object_id, issue_id, title, description in rows:
+                    snippet, highlights = make_snippet(
+                        title, description, terms, self.snippet_tokens
+                    )
+                    results.append(
+                        {
+                            "kind": document_kind,
+                            "id": object_id,
+                            "issue": issue_id,
+                            "title": title,
+                            "snippet": snippet,
+                            "highlights": highlights,
+                            "score": None,
+                        }
+                    )
+                limit -= len(rows)
+                offset = 0
+            return results
+
+        def count():
+            return sum(queryset.count() for _, _, queryset in querysets)
+
+        return SearchResults(fetch, count)
+
+
+@cache
+def get_search_backend():
+    """
+    Retourne le moteur de recherche configuré (voir BaseSearchBackend).
+    """
+    path = settings.SEARCH_BACKEND
+    if path is None:
+        path = SQLITE_BACKEND if connection.vendor == "sqlite" else DATABASE_BACKEND
+    return import_string(path)()
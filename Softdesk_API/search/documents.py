@@ -0,0 +1,30 @@
+from collections import namedtuple
+
+# Document indexé : une Issue (titre, description) ou un Comment (titre, description).
+# issue_id est l'Issue elle-même ou l'Issue du Comment : la recherche est limitée
+# aux projets de l'utilisateur par une jointure sur cette Issue.
+Document = namedtuple("Document", ["kind", "object_id", "issue_id", "title", "body"])
+
+ISSUE = "issue"
+COMMENT = "comment"
+KINDS = (ISSUE, COMMENT)
+
+
+def issue_document(issue):
+    """
+    Retourne le document indexé d'une Issue.
+    """
+    return Document(ISSUE, issue.id, issue.id, issue.title, issue.description)
+
+
+def comment_document(comment):
+    """
+    Retourne le document indexé d'un Comment.
+    """
+    return Document(
+        COMMENT,
+        comment.id,
+        comment.issue_assigned_id,
+        comment.title,
+        comment.description,
+    )
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from comment.models import Comment
+from issue.models import Issue
+from search.backends import get_search_backend
+from search.documents import comment_document, issue_document
+
+
+class Command(BaseCommand):
+    """
+    Reconstruit l'index de recherche des Issues et des Comments.
+
+    Les objets sont lus en flux continu (.iterator) avec les seuls champs
+    indexés, et envoyés au moteur de recherche par lots de --batch-size :
+    la mémoire utilisée ne dépend pas du nombre d'objets.
+    """
+
+    help = "Reconstruit l'index de recherche des issues et des comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Nombre d'objets indexés par lot (défaut : 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            batch_size = 1000
+        backend = get_search_backend()
+
+        with transaction.atomic():
+            backend.clear()
+            issues = self.index(
+                backend,
+                Issue.objects.only("id", "title", "description"),
+                issue_document,
+                batch_size,
+            )
+            comments = self.index(
+                backend,
+                Comment.objects.only("id", "issue_assigned_id", "title", "description"),
+                comment_document,
+                batch_size,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{issues} issue(s) et {comments} comment(s) indexé(s).")
+        )
+
+    def index(self, backend, queryset, to_document, batch_size):
+        """
+        Indexe les objets du queryset, lot par lot.
+
+        Args:
+            backend (BaseSearchBackend): Le moteur de recherche.
+            queryset (QuerySet): Les objets à indexer.
+            to_document (callable): Fonction construisant le document d'un objet.
+            batch_size (int): Nombre d'objets par lot.
+
+        Returns:
+            int: Le nombre d'objets indexés.
+        """
+        count = 0
+        batch = []
+        for instance in queryset.order_by("pk").iterator(chunk_size=batch_size):
+            batch.append(to_document(instance))
+            if len(batch) >= batch_size:
+                backend.index(batch)
+                count += len(batch)
+                batch = []
+        backend.index(batch)
+        return count + len(batch)
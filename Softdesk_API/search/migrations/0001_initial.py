@@ -0,0 +1,48 @@
+from django.db import migrations
+
+TABLE = "search_document"
+
+
+def create_index(apps, schema_editor):
+    """
+    Crée la table FTS5 de SQLiteFTS5Backend et y indexe les Issues et
+    Comments existants. Sur les autres bases, aucune table n'est créée.
+
+    Le rowid d'un document vaut id * 2 pour une Issue et id * 2 + 1 pour un
+    Comment (voir SQLiteFTS5Backend.rowid).
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, issue_id UNINDEXED, title, body, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} (rowid, kind, object_id, issue_id, title, body) "
+        "SELECT id * 2, 'issue', id, id, title, description FROM issue_issue"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} (rowid, kind, object_id, issue_id, title, body) "
+        "SELECT id * 2 + 1, 'comment', id, issue_assigned_id, title, description "
+        "FROM comment_comment"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("issue", "0009_issue_comment_count"),
+        ("comment", "0005_comment_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from .documents import KINDS
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """
+    Serializer d'un résultat de recherche.
+
+    Attributes:
+        kind (str): "issue" ou "comment".
+        id (int): L'identifiant de l'Issue ou du Comment.
+        issue (int): L'Issue concernée (l'Issue elle-même ou celle du Comment).
+        title (str): Le titre.
+        snippet (str): Extrait du texte, en texte brut (à échapper par le client).
+        highlights (list): Positions [début, fin] des termes trouvés dans snippet.
+        score (float): Pertinence (plus grand = plus pertinent), ou null.
+    """
+
+    kind = serializers.ChoiceField(choices=KINDS)
+    id = serializers.IntegerField()
+    issue = serializers.IntegerField()
+    title = serializers.CharField()
+    snippet = serializers.CharField()
+    highlights = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.IntegerField(), min_length=2, max_length=2
+        )
+    )
+    score = serializers.FloatField(allow_null=True)
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from comment.models import Comment
+from issue.models import Issue
+
+from .backends import get_search_backend
+from .documents import COMMENT, ISSUE, comment_document, issue_document
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, **kwargs):
+    """
+    Indexe une Issue créée ou modifiée.
+
+    L'index est écrit dans la même transaction que l'Issue.
+    """
+    get_search_backend().index([issue_document(instance)])
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted(sender, instance, **kwargs):
+    """
+    Retire une Issue supprimée de l'index (ses Comments, supprimés en
+    cascade, le sont par comment_deleted).
+    """
+    get_search_backend().remove(ISSUE, [instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, **kwargs):
+    """
+    Indexe un Comment créé ou modifié.
+    """
+    get_search_backend().index([comment_document(instance)])
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """
+    Retire un Comment supprimé de l'index.
+    """
+    get_search_backend().remove(COMMENT, [instance.pk])
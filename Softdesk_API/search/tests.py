@@ -0,0 +1,106 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from Softdesk_API.testing import (API, create_comment, create_issue,
+                                  create_project, create_user)
+
+from .backends import (DATABASE_BACKEND, SQLITE_BACKEND, get_search_backend,
+                       make_snippet, parse_query)
+
+XSS = '<img src=x onerror="alert(1)"> panne du <b>serveur</b>'
+
+
+class MakeSnippetTests(SimpleTestCase):
+    """
+    Extraits des résultats de recherche : texte brut et positions des termes.
+    """
+
+    def highlighted(self, snippet, highlights):
+        return [snippet[start:end] for start, end in highlights]
+
+    def test_raw_text(self):
+        snippet, highlights = make_snippet("T", XSS, parse_query("serveur"), 12)
+        self.assertEqual(snippet, XSS)
+        self.assertEqual(self.highlighted(snippet, highlights), ["serveur"])
+
+    def test_prefix_and_diacritics(self):
+        snippet, highlights = make_snippet(
+            "T", "Écran noir, l'ecran clignote", parse_query("ecran clign*"), 12
+        )
+        self.assertEqual(
+            self.highlighted(snippet, highlights), ["Écran", "ecran", "clignote"]
+        )
+
+    def test_window(self):
+        body = " ".join(f"mot{index}" for index in range(30)) + " panne fin."
+        snippet, highlights = make_snippet("T", body, parse_query("panne"), 4)
+        self.assertEqual(snippet, "…mot28 mot29 panne fin.")
+        self.assertEqual(self.highlighted(snippet, highlights), ["panne"])
+
+        snippet, highlights = make_snippet("T", body, parse_query("mot3"), 3)
+        self.assertEqual(snippet, "…mot3 mot4 mot5…")
+        self.assertEqual(highlights, [[1, 5]])
+
+    def test_title(self):
+        snippet, highlights = make_snippet(
+            "Panne <serveur>", "Rien ici", parse_query("serveur"), 12
+        )
+        self.assertEqual(snippet, "Panne <serveur>")
+        self.assertEqual(self.highlighted(snippet, highlights), ["serveur"])
+
+
+@skipUnless(connection.vendor == "sqlite", "index FTS5 de SQLite")
+class SearchBackendTests(APITestCase):
+    """
+    Résultats de GET /search/, identiques d'un moteur à l'autre.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("member")
+        project = create_project("P", self.user)
+        issue = create_issue("Issue serveur", project, self.user)
+        issue.description = XSS
+        issue.save()
+        create_comment("Comment serveur", issue, self.user)
+        self.client.force_authenticate(self.user)
+
+    def search(self, backend):
+        get_search_backend.cache_clear()
+        self.addCleanup(get_search_backend.cache_clear)
+        with override_settings(SEARCH_BACKEND=backend):
+            response = self.client.get(f"{API}search/?q=serveur")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["results"]
+
+    def test_snippet_is_raw_text(self):
+        for backend in (SQLITE_BACKEND, DATABASE_BACKEND):
+            with self.subTest(backend=backend):
+                [result] = [
+                    result
+                    for result in self.search(backend)
+                    if result["kind"] == "issue"
+                ]
+                self.assertEqual(result["snippet"], XSS)
+                start, end = result["highlights"][0]
+                self.assertEqual(result["snippet"][start:end], "serveur")
+
+    def test_backends_agree(self):
+        # seuls le score et l'ordre des résultats dépendent du moteur
+        def documents(results):
+            return sorted(
+                (
+                    {key: value for key, value in result.items() if key != "score"}
+                    for result in results
+                ),
+                key=lambda result: (result["kind"], result["id"]),
+            )
+
+        self.assertEqual(
+            documents(self.search(SQLITE_BACKEND)),
+            documents(self.search(DATABASE_BACKEND)),
+        )
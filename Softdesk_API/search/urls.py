@@ -0,0 +1,11 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from .views import SearchViewSet
+
+router = DefaultRouter()
+router.register("search", SearchViewSet, basename="search")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
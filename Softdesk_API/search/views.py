@@ -0,0 +1,92 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status, viewsets
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from issue.models import Issue
+
+from .backends import get_search_backend, parse_query
+from .documents import KINDS
+from .serializers import SearchResultSerializer
+
+
+class SearchViewSet(viewsets.GenericViewSet):
+    """
+    Recherche plein texte dans les Issues et les Comments.
+
+    Un utilisateur doit etre connecté et authentifié
+    Seuls les Issues et Comments des projets dont l'utilisateur connecté est
+    contributeur sont renvoyés.
+    """
+
+    serializer_class = SearchResultSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = LimitOffsetPagination
+
+    # nombre maximal de termes par recherche
+    max_terms = 16
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "q",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="Termes recherchés (tous requis) ; terme* pour un préfixe.",
+            ),
+            openapi.Parameter(
+                "type",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(KINDS),
+                description="Limite la recherche aux issues ou aux comments.",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: SearchResultSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: "Recherche invalide",
+            status.HTTP_401_UNAUTHORIZED: "Authentification non trouvée",
+        },
+    )
+    def list(self, request):
+        """
+        Recherche les Issues (titre, description) et les Comments (titre,
+        description) contenant tous les termes donnés.
+
+        Les résultats sont classés par pertinence et paginés (limit / offset).
+
+        Args:
+            q (str): Les termes recherchés ; un terme suivi de * est recherché par préfixe.
+            type (str): "issue" ou "comment" pour limiter la recherche.
+
+        Returns:
+            Response: La page des résultats.
+        """
+        terms = parse_query(request.query_params.get("q"))
+        if not terms:
+            return Response(
+                {"error": "Le paramètre q doit contenir au moins un mot."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(terms) > self.max_terms:
+            return Response(
+                {"error": f"Au plus {self.max_terms} termes par recherche."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        kind = request.query_params.get("type")
+        if kind is not None and kind not in KINDS:
+            return Response(
+                {"error": f"Le paramètre type doit valoir {' ou '.join(KINDS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = get_search_backend().search(
+            terms, Issue.objects.visible_to(request.user), kind
+        )
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)